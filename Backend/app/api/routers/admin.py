@@ -1,21 +1,26 @@
 # app/api/routers/admin.py
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from sqlalchemy import select, func
+from datetime import date, timedelta
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
+from app.core.responses import ORJSONResponse
 from app.services.product_service import (
     create_product,
     update_product,
     delete_product,
 )
-from app.models.models import Order, GlobalInventory, Product
-from app.services.store_service import update_global_stock
+from app.services.store_service import update_global_stock, admin_catalog
+from app.services.product_import_service import import_products, detect_format
 from app.schema.schemas import ProductCreate, ProductUpdate, GlobalStockUpdate
 from app.utils.api_error import forbidden
+from app.llm import response_cache
+from app.services import kpi_service
+from app.services.job_service import enqueue_job, PRIORITY_HIGH
+from app.schema.enums import JobType
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -31,30 +36,12 @@ def admin_only(user):
 
 @router.get("/inventory/stats")
 async def inventory_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     admin_only(user)
-
-    stmt_value = select(
-        func.sum(GlobalInventory.total_stock * Product.price)
-    ).join(Product, Product.id == GlobalInventory.product_id)
-
-    stmt_low = select(
-        func.count(GlobalInventory.product_id)
-    ).where(GlobalInventory.total_stock < 10)
-
-    stmt_count = select(func.sum(GlobalInventory.total_stock))
-
-    value = (await db.execute(stmt_value)).scalar() or 0
-    low_stock = (await db.execute(stmt_low)).scalar() or 0
-    total_items = (await db.execute(stmt_count)).scalar() or 0
-
-    return {
-        "total_value": float(value),
-        "low_stock_products": low_stock,
-        "total_items": total_items,
-    }
+    # one row, maintained on stock / price writes
+    return await kpi_service.get_inventory_kpis(db)
 
 
 # =====================================================
@@ -80,6 +67,26 @@ async def create(
     return {"id": product.id}
 
 
+@router.post("/products/import")
+async def bulk_import(
+    file: UploadFile = File(...),
+    format: str | None = None,
+    db: AsyncSession = Depends(get_db),
+    user=Depends(get_current_user),
+):
+    """
+    CSV or NDJSON shaped like products.csv; upserts on product_id.
+    Embeddings are queued in batches for new / changed products.
+    """
+    admin_only(user)
+
+    return await import_products(
+        db=db,
+        fileobj=file.file,
+        fmt=detect_format(file.filename, format),
+    )
+
+
 @router.patch("/products/{product_id}")
 async def update(
     product_id: UUID,
@@ -130,7 +137,7 @@ async def set_global_stock(
 
 @router.get("/products/stock")
 async def product_stock_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     """
@@ -138,30 +145,7 @@ async def product_stock_overview(
     """
     admin_only(user)
 
-    res = await db.execute(
-        select(
-            Product.id,
-            Product.name,
-            Product.price,
-            GlobalInventory.total_stock,
-            GlobalInventory.allocated_stock,
-            GlobalInventory.reserved_stock,
-        )
-        .join(GlobalInventory, GlobalInventory.product_id == Product.id)
-    )
-
-    return [
-        {
-            "product_id": r.id,
-            "name": r.name,
-            "price": float(r.price),
-            "total_stock": r.total_stock,
-            "allocated_stock": r.allocated_stock,
-            "reserved_stock": r.reserved_stock,
-            "available_stock": r.total_stock - r.allocated_stock - r.reserved_stock,
-        }
-        for r in res
-    ]
+    return ORJSONResponse(await admin_catalog(db))
 
 
 # =====================================================
@@ -170,17 +154,89 @@ async def product_stock_overview(
 
 @router.get("/summary")
 async def kpi_summary(
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    admin_only(user)
+
+    # one row, maintained on checkout / payment / cancel / refund
+    kpis = await kpi_service.get_kpi_summary(db)
+    return {
+        "total_orders": kpis["orders_count"],
+        "total_revenue": kpis["gross_revenue"],
+        **kpis,
+    }
+
+
+@router.get("/kpis/daily")
+async def kpi_daily(
+    start: date | None = None,
+    end: date | None = None,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    """
+    Defaults to the last 30 days (UTC order dates).
+    """
+    admin_only(user)
+
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    return await kpi_service.get_daily_kpis(db, start=start, end=end)
+
+
+@router.get("/kpis/stores/{store_id}")
+async def kpi_store(
+    store_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    admin_only(user)
+    return await kpi_service.get_store_kpis(db, store_id=store_id)
+
+
+@router.post("/kpis/reconcile")
+async def kpi_reconcile(
     db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
+    """
+    Queues an immediate rebuild of all rollups from source tables
+    (also runs nightly).
+    """
     admin_only(user)
 
-    res = await db.execute(
-        select(func.count(Order.id), func.sum(Order.total))
+    await enqueue_job(
+        db,
+        job_type=JobType.reconcile_kpis,
+        payload={"trigger": "admin"},
+        dedupe_key=f"{JobType.reconcile_kpis.value}:manual",
+        priority=PRIORITY_HIGH,
     )
-    orders, revenue = res.first()
+    return {"status": "queued"}
 
-    return {
-        "total_orders": orders or 0,
-        "total_revenue": float(revenue or 0),
-    }
+
+# =====================================================
+# LLM RESPONSE CACHE
+# =====================================================
+
+@router.get("/llm/cache/stats")
+async def llm_cache_stats(
+    user=Depends(get_current_user),
+):
+    admin_only(user)
+    return await response_cache.stats()
+
+
+@router.delete("/llm/cache")
+async def purge_llm_cache(
+    intent: str | None = None,
+    scope: str | None = None,
+    user=Depends(get_current_user),
+):
+    """
+    scope: "answer" or a tool name. No filters → purge everything.
+    """
+    admin_only(user)
+    deleted = await response_cache.purge(intent=intent, scope=scope)
+    return {"status": "purged", "keys_deleted": deleted}
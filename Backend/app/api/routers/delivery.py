@@ -4,8 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from app.schema.schemas import DeliveryAdminOut
 from app.services.delivery_service import list_deliveries_admin
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
+from app.core.responses import ORJSONResponse
 from app.schema.schemas import DeliveryCreate, DeliveryUpdate, DeliveryOut
 from app.services.delivery_service import (
     create_delivery,
@@ -17,13 +18,13 @@ from app.utils.api_error import forbidden
 router = APIRouter(prefix="/delivery", tags=["Delivery"])
 @router.get("/admin", response_model=list[DeliveryAdminOut])
 async def list_admin(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     if user["role"] not in ("admin", "support"):
         forbidden()
 
-    return await list_deliveries_admin(db)
+    return ORJSONResponse(await list_deliveries_admin(db))
 
 @router.post("/admin", response_model=DeliveryOut)
 async def create(
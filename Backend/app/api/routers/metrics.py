@@ -0,0 +1,15 @@
+# app/api/routers/metrics.py
+from fastapi import APIRouter, Response
+
+from app.core.metrics import render_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus scrape endpoint. Keep it off the public ingress.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
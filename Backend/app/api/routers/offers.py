@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
 from app.services.offer_service import (
     list_active_offers,
@@ -13,7 +13,13 @@ from app.services.offer_service import (
     deactivate_offer,
     preview_offers,
 )
-from app.schema.schemas import OfferCreate, OfferUpdate, OfferOut
+from app.services.offer_simulator import simulate_offers
+from app.schema.schemas import (
+    OfferCreate,
+    OfferUpdate,
+    OfferOut,
+    OfferSimulationRequest,
+)
 from app.utils.api_error import forbidden
 
 router = APIRouter(prefix="/offers", tags=["Offers"])
@@ -101,3 +107,26 @@ async def deactivate(
 
     await deactivate_offer(db, offer_id)
     return {"status": "deactivated"}
+
+
+@router.post("/admin/simulate")
+async def simulate(
+    payload: OfferSimulationRequest,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    """
+    Estimated cost of a proposed offer set over historical orders.
+    Nothing is saved.
+    """
+    if user["role"] != "admin":
+        forbidden()
+
+    return await simulate_offers(
+        db,
+        offers=payload.offers,
+        source=payload.source,
+        start=payload.start,
+        end=payload.end,
+        mode=payload.mode,
+    )
@@ -2,7 +2,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
 from app.services.order_service import (
     get_order_detail,
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/orders", tags=["Orders"])
 @router.get("/{order_id}")
 async def order_detail(
     order_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     return await get_order_detail(
@@ -30,7 +30,7 @@ async def order_detail(
 
 @router.get("/", response_model=list[OrderOut])
 async def list_(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     return await list_orders(db, user["user_id"])
@@ -42,7 +42,7 @@ async def cancel(
     db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
-    await cancel_order(db, user["user_id"], order_id)
+    await cancel_order(db, user_id=user["user_id"], order_id=order_id)
     return {"status": "cancelled"}
 
 
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 from sqlalchemy import select
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
 from app.core.ws_manager import ws_manager
 from app.models.enums import pickup_status_enum
@@ -15,6 +15,8 @@ from app.services.pickup_service import (
     list_stores_that_can_fulfill_cart,
     list_pickups_for_store_dashboard,
 )
+from app.services.store_dashboard_service import get_store_dashboard
+from app.schema.enums import PickupStatus
 
 from app.utils.api_error import forbidden, not_found
 
@@ -44,7 +46,7 @@ async def store_pickups(
 @router.patch("/{pickup_id}")
 async def update_status(
     pickup_id: UUID,
-    status: str,
+    status: PickupStatus,
     db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -128,7 +130,7 @@ async def eligible_stores(
 @router.get("/store/{store_id}/dashboard")
 async def store_dashboard_pickups(
     store_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     if user["role"] not in ("admin", "store_manager"):
@@ -137,4 +139,19 @@ async def store_dashboard_pickups(
     return await list_pickups_for_store_dashboard(
         db=db,
         store_id=store_id,
-    )
\ No newline at end of file
+    )
+
+@router.get("/store/{store_id}/dashboard/summary")
+async def store_dashboard_summary(
+    store_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    user=Depends(get_current_user),
+):
+    """
+    Today's counts (store-local date), one row. Live updates arrive on
+    /ws/stores/{store_id}/pickups as {"type": "dashboard", ...}.
+    """
+    if user["role"] not in ("admin", "store_manager"):
+        forbidden()
+
+    return await get_store_dashboard(db, store_id)
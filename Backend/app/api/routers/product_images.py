@@ -21,6 +21,7 @@ router = APIRouter(
 async def upload_image(
     product_id: UUID,
     file: UploadFile = File(...),
+    is_primary: bool = False,
     db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -31,11 +32,17 @@ async def upload_image(
         db=db,
         product_id=product_id,
         file=file,
+        is_primary=is_primary,
     )
 
     return {
         "id": img.id,
         "url": img.image_url,
+        "thumb_url": img.thumb_url,
+        "small_url": img.small_url,
+        "large_url": img.large_url,
+        "width": img.width,
+        "height": img.height,
     }
 
 
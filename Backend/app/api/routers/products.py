@@ -4,10 +4,11 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
+from app.core.responses import ORJSONResponse
 from app.services.product_service import (
-    list_products,
+    list_product_rows,
     get_product,
 )
 from app.schema.schemas import ProductOut
@@ -16,8 +17,8 @@ router = APIRouter(prefix="/products", tags=["Products"])
 
 
 @router.get("/", response_model=list[ProductOut])
-async def all_products(db: AsyncSession = Depends(get_db)):
-    return await list_products(db)
+async def all_products(db: AsyncSession = Depends(get_read_db)):
+    return ORJSONResponse(await list_product_rows(db))
 
 
 @router.get("/{product_id}", response_model=ProductOut)
@@ -3,8 +3,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
+from app.core.responses import ORJSONResponse
 from app.schema.schemas import (
     RefundAdminOut,
     RefundCreate,
@@ -61,15 +62,17 @@ async def admin_update_refund(
 @router.get("/admin", response_model=list[RefundAdminOut])
 async def list_all(
     status: RefundStatus | None = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     if user["role"] not in ("admin", "support"):
         forbidden()
 
-    return await list_refunds(
-        db,
-        status=status.value if status else None,
+    return ORJSONResponse(
+        await list_refunds(
+            db,
+            status=status.value if status else None,
+        )
     )
 
 
@@ -5,8 +5,9 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.auth import get_current_user
+from app.core.responses import ORJSONResponse
 from app.utils.api_error import forbidden
 
 from app.services.store_service import (
@@ -41,7 +42,7 @@ router = APIRouter(prefix="/stores", tags=["Stores"])
 
 @router.get("/", response_model=list[StoreOut])
 async def list_(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await list_stores(db)
 
@@ -82,7 +83,7 @@ async def update_inventory(
 @router.get("/{store_id}/inventory", response_model=StoreInventoryOut)
 async def store_inventory(
     store_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await get_store_inventory(db, store_id)
 
@@ -108,7 +109,7 @@ async def set_hours(
 @router.get("/{store_id}/hours", response_model=list[StoreHourOut])
 async def get_hours(
     store_id: UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     return await get_store_hours(db, store_id)
 
@@ -141,13 +142,13 @@ async def allocate_stock_endpoint(
 
 @router.get("/admin/catalog")
 async def admin_catalog_view(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user=Depends(get_current_user),
 ):
     if user["role"] != "admin":
         forbidden()
 
-    return await admin_catalog(db)
+    return ORJSONResponse(await admin_catalog(db))
 
 
 @router.patch("/admin/global-stock")
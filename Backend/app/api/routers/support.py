@@ -3,22 +3,23 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_db, AsyncSessionLocal, mark_read_your_writes
 from app.core.auth import get_current_user
 from app.llm.agent import run_agent
 from app.models.models import Conversation
-from app.models.enums import message_role_enum
 from app.schema.schemas import MessageCreate, ConversationOut, AgentActionOut # Ensure AgentActionOut exists
 from app.schema.enums import ConversationStatus
 
 from app.services.support_service import (
     get_or_create_active_conversation,
     get_conversation_history,
-    add_message,
     get_ai_handoffs,
     end_session_for_user,
     get_pending_actions,
+    get_conversation_for_user,
+    persist_chat_turn,
 )
 from app.utils.api_error import forbidden, not_found
 
@@ -71,35 +72,43 @@ async def get_actions(
 async def send_message(
     conversation_id: UUID,
     payload: MessageCreate,
-    db: AsyncSession = Depends(get_db),
     user=Depends(get_current_user),
 ):
+    """
+    No request-scoped session here on purpose: DB work happens in short
+    phases around the agent, so a pooled connection is never held while
+    waiting on the LLM.
+    """
     user_id = user["user_id"]
+    received_at = datetime.utcnow()
 
-    # A. Save USER message
-    await add_message(
-        db=db,
-        conversation_id=conversation_id,
-        user_id=user_id,
-        role=message_role_enum.user,
-        content=payload.content,
-    )
+    # A. Resolve conversation (read only, connection returned right after)
+    async with AsyncSessionLocal() as db:
+        convo = await get_conversation_for_user(db, conversation_id, user_id)
 
-    # B. Run AI Agent
+    # B. Run AI Agent (no connection held)
     ai_response = await run_agent(
         user_id=user_id,
+        chat_session_id=convo.chat_session_id,
+        conversation_id=conversation_id,
         user_message=payload.content,
-        conversation_id=conversation_id, # Agent uses this to find the Session
     )
 
-    # C. Save AI Response
-    await add_message(
-        db=db,
-        conversation_id=conversation_id,
-        user_id=user_id,
-        role=message_role_enum.assistant,
-        content=ai_response["content"],
-    )
+    # C. Persist the whole turn in one transaction
+    async with AsyncSessionLocal() as db:
+        await persist_chat_turn(
+            db,
+            conversation_id=conversation_id,
+            user_id=user_id,
+            user_message=payload.content,
+            assistant_message=ai_response["content"],
+            received_at=received_at,
+            action_type=ai_response["tool_used"] or "chat",
+            action_payload=ai_response["action_payload"],
+            confidence=ai_response["confidence"],
+        )
+    # tools may have written (cart, orders) → keep this user on the primary
+    await mark_read_your_writes(user_id)
 
     return {
         "role": "assistant",
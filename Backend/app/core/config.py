@@ -7,6 +7,21 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
     REDIS_URL: str = Field(..., env="REDIS_URL")
 
+    # read-only traffic; unset → reads use the primary
+    DATABASE_REPLICA_URL: str | None = None
+    # "require" for Supabase; "disable" for local Postgres
+    DATABASE_SSL: str = "require"
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 20
+
+    # after a user's own write, their reads go to the primary this long
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
+
     SUPABASE_ANON_KEY: str
     SUPABASE_SERVICE_ROLE_KEY: str
     SUPABASE_JWT_SECRET: str
@@ -14,6 +29,30 @@ class Settings(BaseSettings):
     GEMINI_API_KEY: str
     SUPABASE_URL: str
 
+    LLM_CONTEXT_CACHE_ENABLED: bool = True
+
+    # uploaded files: "supabase" (Storage bucket) or "local" (a directory
+    # served at LOCAL_STORAGE_URL; dev / tests)
+    STORAGE_BACKEND: str = "supabase"
+    LOCAL_STORAGE_DIR: str = "media"
+    LOCAL_STORAGE_URL: str = "/media"
+    STORAGE_IO_THREADS: int = 8
+
+    # product images: upload cap, Pillow worker processes
+    IMAGE_MAX_BYTES: int = 20 * 1024 * 1024
+    IMAGE_WORKERS: int = 2
+
+    # startup warm-up: connections opened before /ready reports ready
+    DB_POOL_PREFILL: int = 5
+    REDIS_POOL_PREFILL: int = 5
+    WARMUP_TIMEOUT_SECONDS: int = 30
+
+    # "dev" adds X-DB-* query stats headers to every response
+    APP_ENV: str = "production"
+    SLOW_QUERY_MS: int = 200
+    # same statement shape this many times in one request → N+1 warning
+    N_PLUS_ONE_THRESHOLD: int = 5
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,30 +1,138 @@
 # app/core/database.py
-
+#
+# Primary + optional read replica.
+#
+#   get_db      → primary (anything that writes)
+#   get_read_db → replica, unless the caller wrote recently
+#                 (read-your-writes), or no replica is configured
+#
+# A request whose primary session commits a write marks its user in
+# Redis for DB_READ_YOUR_WRITES_SECONDS, as part of that commit (so
+# before the response goes out); during that window the user's
+# get_read_db sessions are served from the primary.
+import jwt
+from fastapi.requests import HTTPConnection
+from sqlalchemy import event
+from sqlalchemy.sql.elements import TextClause
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from app.core.config import settings
+from app.core import metrics, query_counter
+from app.core.metrics import InstrumentedQueuePool
+from app.core.redis import redis_client
+
+
+def _async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://")
 
 
-DATABASE_URL = settings.DATABASE_URL.replace(
-    "postgresql://", "postgresql+asyncpg://"
+DATABASE_URL = _async_url(settings.DATABASE_URL)
+REPLICA_URL = (
+    _async_url(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
 )
 
-engine = create_async_engine(
+
+def _make_engine(url: str, *, name: str, pool_size: int, max_overflow: int):
+    db_engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        connect_args={
+            "ssl": settings.DATABASE_SSL
+        }
+    )
+    metrics.instrument_engine(db_engine, name)
+    query_counter.instrument_engine(db_engine)
+    return db_engine
+
+
+engine = _make_engine(
     DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    connect_args={
-        "ssl": "require"
-    }
+    name="primary",
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
 )
 
+read_engine = (
+    _make_engine(
+        REPLICA_URL,
+        name="replica",
+        pool_size=settings.DB_READ_POOL_SIZE,
+        max_overflow=settings.DB_READ_MAX_OVERFLOW,
+    )
+    if REPLICA_URL
+    else engine
+)
+
+
+# =====================================================
+# WRITE TRACKING (PRIMARY SESSIONS)
+# =====================================================
+
+class PrimarySession(Session):
+    pass
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _flushed(session, flush_context):
+    # flush only runs with pending changes
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _executed(state):
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+    elif isinstance(state.statement, TextClause):
+        # raw SQL: anything but a plain SELECT may write
+        if not state.statement.text.lstrip().upper().startswith("SELECT"):
+            state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _committed(session):
+    if session.info.pop("wrote", False):
+        session.info["committed_write"] = True
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("wrote", None)
+
+
+class PrimaryAsyncSession(AsyncSession):
+    """
+    A commit that wrote marks read-your-writes for info["user_id"]
+    (set by get_db) before returning.
+    """
+
+    async def commit(self):
+        await super().commit()
+        if self.info.pop("committed_write", False):
+            await mark_read_your_writes(self.info.get("user_id"))
+
+
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
+    class_=PrimaryAsyncSession,
+    sync_session_class=PrimarySession,
+    expire_on_commit=False,
+)
+
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
     class_=AsyncSession,
     expire_on_commit=False,
 )
@@ -34,6 +142,74 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db():
+# =====================================================
+# READ-YOUR-WRITES
+# =====================================================
+
+def _sticky_key(user_id) -> str:
+    return f"db:rw:{user_id}"
+
+
+def _request_user_id(conn: HTTPConnection) -> str | None:
+    """
+    Routing hint only: the token is NOT verified here (get_current_user
+    does that). A forged token can at worst send reads to the primary.
+    """
+    auth = conn.headers.get("authorization") or ""
+    if not auth.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(auth[7:], options={"verify_signature": False})
+    except jwt.PyJWTError:
+        return None
+    return payload.get("sub")
+
+
+async def mark_read_your_writes(user_id):
+    """
+    Route this user's reads to the primary for a short while.
+    Call after committing a write outside get_db.
+    """
+    if not user_id or read_engine is engine:
+        return
+    try:
+        await redis_client.set(
+            _sticky_key(user_id), 1, ex=settings.DB_READ_YOUR_WRITES_SECONDS
+        )
+    except Exception as e:
+        print("Read-your-writes mark failed:", e)
+
+
+async def _recently_wrote(user_id) -> bool:
+    if not user_id:
+        return False
+    try:
+        return bool(await redis_client.exists(_sticky_key(user_id)))
+    except Exception:
+        # can't tell → safest is the primary
+        return True
+
+
+# =====================================================
+# DEPENDENCIES
+# =====================================================
+
+async def get_db(conn: HTTPConnection):
     async with AsyncSessionLocal() as session:
+        session.info["user_id"] = _request_user_id(conn)
+        yield session
+
+
+async def get_read_db(conn: HTTPConnection):
+    """
+    Read-only endpoints. Never commit on this session.
+    """
+    if read_engine is not engine and not await _recently_wrote(
+        _request_user_id(conn)
+    ):
+        factory = ReadSessionLocal
+    else:
+        factory = AsyncSessionLocal
+
+    async with factory() as session:
         yield session
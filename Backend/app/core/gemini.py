@@ -0,0 +1,18 @@
+# app/core/gemini.py
+#
+# One shared google-genai client per process, built on first use.
+#
+# Nothing is constructed at import time, so importing the app (workers,
+# scripts, tests) stays cheap; the API lifespan calls it once up front
+# so the first request doesn't pay for it. `.models` is the sync
+# surface, `.aio.models` / `.aio.caches` the async one.
+from functools import lru_cache
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_gemini_client():
+    from google import genai
+
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
@@ -0,0 +1,263 @@
+# app/core/metrics.py
+#
+# Prometheus metrics, scraped from GET /metrics.
+#
+# Multiple workers: set PROMETHEUS_MULTIPROC_DIR (an empty, writable
+# dir, wiped on deploy) before starting uvicorn / the job worker. Every
+# process then writes its samples there and /metrics aggregates them.
+# Without it, each process reports only its own numbers.
+#
+# Cache hit ratio per layer:
+#   sum by (cache) (rate(cache_requests_total{result="hit"}[5m]))
+#     / sum by (cache) (rate(cache_requests_total[5m]))
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# seconds; tuned for API + LLM latencies
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+)
+FAST_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1,
+)
+
+
+# =====================================================
+# HTTP
+# =====================================================
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+
+# =====================================================
+# DATABASE POOL
+# =====================================================
+
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool",
+    ["pool"],
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative: pool not yet full)",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=FAST_BUCKETS,
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Times every checkout, including waits when the pool is exhausted.
+    """
+    metrics_name = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_name).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine, name: str):
+    pool = engine.sync_engine.pool
+    pool.metrics_name = name
+
+    def _sample():
+        DB_POOL_IN_USE.labels(name).set(pool.checkedout())
+        DB_POOL_OVERFLOW.labels(name).set(pool.overflow())
+
+    @event.listens_for(pool, "checkout")
+    def _checkout(dbapi_conn, record, proxy):
+        DB_POOL_CHECKOUTS.labels(name).inc()
+        _sample()
+
+    @event.listens_for(pool, "checkin")
+    def _checkin(dbapi_conn, record):
+        _sample()
+
+
+# =====================================================
+# REDIS
+# =====================================================
+
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency",
+    ["command"],
+    buckets=FAST_BUCKETS,
+)
+
+
+# =====================================================
+# LLM
+# =====================================================
+
+LLM_LATENCY = Histogram(
+    "llm_call_duration_seconds",
+    "Gemini call latency",
+    ["op", "purpose"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "llm_call_errors_total",
+    "Gemini calls that raised",
+    ["op", "purpose"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported by Gemini usage metadata",
+    ["op", "purpose", "kind"],
+)
+TOOL_LATENCY = Histogram(
+    "agent_tool_duration_seconds",
+    "Agent tool execution latency",
+    ["tool", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def observe_llm(op: str, purpose: str):
+    """
+    op: generate_content | embed_content | cache_create
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        LLM_ERRORS.labels(op, purpose).inc()
+        raise
+    finally:
+        LLM_LATENCY.labels(op, purpose).observe(time.perf_counter() - started)
+
+
+def record_llm_usage(op: str, purpose: str, response):
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return
+    for kind, field in (
+        ("prompt", "prompt_token_count"),
+        ("output", "candidates_token_count"),
+        ("cached", "cached_content_token_count"),
+        ("thoughts", "thoughts_token_count"),
+    ):
+        count = getattr(usage, field, None)
+        if count:
+            LLM_TOKENS.labels(op, purpose, kind).inc(count)
+
+
+# =====================================================
+# CACHES
+# =====================================================
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by layer",
+    ["cache", "result"],
+)
+
+
+def cache_hit(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+# =====================================================
+# ASGI MIDDLEWARE + EXPOSITION
+# =====================================================
+
+class MetricsMiddleware:
+    """
+    Pure ASGI (no BaseHTTPMiddleware overhead). The route label is the
+    matched template (/orders/{order_id}), never the raw path.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            HTTP_LATENCY.labels(
+                method,
+                getattr(route, "path_format", None) or "unmatched",
+                str(status["code"]),
+            ).observe(time.perf_counter() - started)
+
+
+def setup_metrics(app):
+    app.add_middleware(MetricsMiddleware)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead():
+    """
+    Call on shutdown so this pid's live gauges drop out of the totals.
+    """
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
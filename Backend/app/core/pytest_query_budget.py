@@ -0,0 +1,78 @@
+# app/core/pytest_query_budget.py
+#
+# pytest plugin: SQL query budgets per endpoint.
+#
+#   pytest -p app.core.pytest_query_budget
+#   (or in a conftest.py: pytest_plugins = ["app.core.pytest_query_budget"])
+#
+# Whole test:
+#
+#   @pytest.mark.query_budget(3)
+#   async def test_view_cart(client): ...
+#
+# One call:
+#
+#   async def test_checkout(client, query_budget):
+#       with query_budget(12):
+#           await client.post("/cart/checkout", json=...)
+#
+# A test fails if it runs more statements than its budget, or (unless
+# allow_n_plus_one=True) repeats one statement shape N_PLUS_ONE_THRESHOLD
+# times. The app must be driven in-process (httpx ASGITransport /
+# TestClient) so requests share the test's context.
+from contextlib import contextmanager
+
+import pytest
+
+from app.core.query_counter import count_queries
+
+
+def _check(stats, max_queries: int, allow_n_plus_one: bool, label: str):
+    problems = []
+    if stats.count > max_queries:
+        problems.append(
+            f"{label}: {stats.count} queries, budget {max_queries}"
+        )
+    if not allow_n_plus_one:
+        for shape, n in stats.repeated():
+            problems.append(f"{label}: N+1 ({n}x) {stats.samples[shape][:200]}")
+
+    if problems:
+        shapes = "\n".join(
+            f"  {n:>4}x {shape[:160]}" for shape, n in stats.shapes.most_common(10)
+        )
+        pytest.fail("\n".join(problems) + "\nTop statements:\n" + shapes)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(max_queries, allow_n_plus_one=False): "
+        "fail the test if it runs more SQL statements than max_queries",
+    )
+
+
+@pytest.fixture(autouse=True)
+def _query_budget_marker(request):
+    marker = request.node.get_closest_marker("query_budget")
+    if not marker:
+        yield
+        return
+
+    max_queries = marker.args[0] if marker.args else marker.kwargs["max_queries"]
+    allow = marker.kwargs.get("allow_n_plus_one", False)
+
+    with count_queries() as stats:
+        yield
+    _check(stats, max_queries, allow, request.node.name)
+
+
+@pytest.fixture
+def query_budget(request):
+    @contextmanager
+    def budget(max_queries: int, *, allow_n_plus_one: bool = False):
+        with count_queries() as stats:
+            yield stats
+        _check(stats, max_queries, allow_n_plus_one, request.node.name)
+
+    return budget
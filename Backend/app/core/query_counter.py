@@ -0,0 +1,174 @@
+# app/core/query_counter.py
+#
+# Per-request SQL accounting.
+#
+# QueryCounterMiddleware opens a QueryStats for every HTTP request; the
+# cursor hooks on each engine add every statement to it (count, DB
+# time, normalized shape). After the response:
+#   - shapes repeated >= N_PLUS_ONE_THRESHOLD times are logged as N+1
+#   - statements slower than SLOW_QUERY_MS are logged with a parameter
+#     fingerprint (hash + types, never the values)
+#   - APP_ENV=dev adds X-DB-Queries / X-DB-Time-ms / X-DB-N-Plus-One
+#
+# count_queries() does the same around any block (tests, scripts);
+# stats nest, so a test sees the queries of the requests it makes.
+import hashlib
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+_SPACES = re.compile(r"\s+")
+# expanded IN (...) lists and VALUES rows differ only in arity
+_PARAM_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)*")
+_VALUES_ROWS = re.compile(r"(\(\?\))(?:\s*,\s*\(\?\))+")
+
+
+@dataclass(slots=True)
+class QueryStats:
+    parent: "QueryStats | None" = None
+    count: int = 0
+    db_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    samples: dict = field(default_factory=dict)  # shape → first raw statement
+
+    def record(self, shape: str, statement: str, elapsed: float):
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.db_time += elapsed
+            stats.shapes[shape] += 1
+            stats.samples.setdefault(shape, statement)
+            stats = stats.parent
+
+    def repeated(self, threshold: int | None = None) -> list[tuple[str, int]]:
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [(s, n) for s, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def count_queries():
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# =====================================================
+# SHAPES / FINGERPRINTS
+# =====================================================
+
+def statement_shape(statement: str) -> str:
+    shape = _SPACES.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("?", shape)
+    return _VALUES_ROWS.sub(r"\1, ...", shape)
+
+
+def params_fingerprint(params) -> str:
+    """
+    Identifies identical parameter sets across log lines without
+    logging values (ids, emails, ...).
+    """
+    if isinstance(params, (list, tuple)):
+        types = ",".join(type(p).__name__ for p in params)
+    elif isinstance(params, dict):
+        types = ",".join(f"{k}:{type(v).__name__}" for k, v in params.items())
+    else:
+        types = type(params).__name__
+    digest = hashlib.blake2b(repr(params).encode(), digest_size=6).hexdigest()
+    return f"{digest} ({types})"
+
+
+# =====================================================
+# ENGINE HOOKS
+# =====================================================
+
+def instrument_engine(engine):
+    sync_engine = engine.sync_engine
+
+    # the start time lives on the statement's execution context: nothing
+    # to pair up or leak when a statement fails (no after_cursor_execute)
+    # or stats are opened / closed between the two hooks
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+
+        stats = _current.get()
+        if stats is None:
+            return
+
+        stats.record(statement_shape(statement), statement, elapsed)
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            print(
+                f"Slow query {elapsed * 1000:.0f}ms params={params_fingerprint(parameters)}:",
+                _SPACES.sub(" ", statement)[:500],
+            )
+
+
+# =====================================================
+# MIDDLEWARE
+# =====================================================
+
+def _report(scope, stats: QueryStats):
+    repeated = stats.repeated()
+    if not repeated:
+        return
+    route = getattr(scope.get("route"), "path_format", None) or scope.get("path")
+    for shape, n in repeated:
+        print(f"N+1 suspected on {scope['method']} {route}: {n}x", stats.samples[shape][:300])
+
+
+class QueryCounterMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.headers = settings.APP_ENV == "dev"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with count_queries() as stats:
+
+            async def send_wrapper(message):
+                if self.headers and message["type"] == "http.response.start":
+                    message.setdefault("headers", [])
+                    message["headers"] = [
+                        *message["headers"],
+                        (b"x-db-queries", str(stats.count).encode()),
+                        (b"x-db-time-ms", f"{stats.db_time * 1000:.1f}".encode()),
+                        (b"x-db-n-plus-one", str(len(stats.repeated())).encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                _report(scope, stats)
+
+
+def setup_query_counter(app):
+    app.add_middleware(QueryCounterMiddleware)
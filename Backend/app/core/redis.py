@@ -1,9 +1,28 @@
 # app/core/redis.py
+import time
 
 import redis.asyncio as redis
 from app.core.config import settings
+from app.core.metrics import REDIS_LATENCY
 
-redis_client = redis.from_url(
+
+class InstrumentedRedis(redis.Redis):
+    """
+    Times every command (scripts included). Pipelines and pub/sub go
+    through their own paths and are not timed.
+    """
+
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_LATENCY.labels(str(args[0]).upper()).observe(
+                time.perf_counter() - started
+            )
+
+
+redis_client = InstrumentedRedis.from_url(
     settings.REDIS_URL,
     decode_responses=True,
 )
@@ -0,0 +1,23 @@
+# app/core/responses.py
+#
+# orjson-backed JSON response for the large read-only lists.
+#
+# Serializes dataclasses (app/schema/rows.py), UUID, datetime and enums
+# natively in C; the default JSONResponse goes through json.dumps.
+# Routes return it directly, which also skips response_model
+# validation — only for content already shaped like that model.
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default)
@@ -13,4 +13,6 @@ def setup_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # dev-mode query stats (app/core/query_counter.py)
+        expose_headers=["X-DB-Queries", "X-DB-Time-ms", "X-DB-N-Plus-One"],
     )
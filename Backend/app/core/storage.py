@@ -0,0 +1,103 @@
+# app/core/storage.py
+#
+# Object storage for uploaded files, one interface, two backends
+# (STORAGE_BACKEND):
+#
+#   supabase  a Supabase Storage bucket (production)
+#   local     LOCAL_STORAGE_DIR/<bucket>, served by the API at
+#             LOCAL_STORAGE_URL (dev, tests: no network, no keys)
+#
+# Both are blocking clients, so every call runs on a dedicated thread
+# pool (STORAGE_IO_THREADS) instead of the event loop. Callers hand
+# over a file path; the backend reads it from disk (httpx streams it
+# to Supabase), so nothing holds a whole upload as one bytes object.
+import asyncio
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.supabase import get_supabase
+
+_io_pool = ThreadPoolExecutor(
+    max_workers=settings.STORAGE_IO_THREADS,
+    thread_name_prefix="storage",
+)
+
+
+class Storage:
+    async def put(
+        self,
+        key: str,
+        path: str | Path,
+        *,
+        content_type: str,
+        immutable: bool = False,
+    ) -> str:
+        """
+        Stores the file at `key` (overwriting) and returns its public URL.
+        immutable: content-addressed key, cacheable forever.
+        """
+        await asyncio.get_running_loop().run_in_executor(
+            _io_pool, self._put, key, str(path), content_type, immutable
+        )
+        return self.public_url(key)
+
+    def _put(self, key: str, path: str, content_type: str, immutable: bool):
+        raise NotImplementedError
+
+    def public_url(self, key: str) -> str:
+        raise NotImplementedError
+
+
+class SupabaseStorage(Storage):
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    def _put(self, key, path, content_type, immutable):
+        get_supabase().storage.from_(self.bucket).upload(
+            key,
+            path,
+            {
+                "content-type": content_type,
+                "cache-control": "31536000" if immutable else "3600",
+                "upsert": "true",
+            },
+        )
+
+    def public_url(self, key):
+        # built locally, no request
+        return get_supabase().storage.from_(self.bucket).get_public_url(key)
+
+
+class LocalStorage(Storage):
+    def __init__(self, bucket: str):
+        self.root = Path(settings.LOCAL_STORAGE_DIR) / bucket
+        self.base_url = f"{settings.LOCAL_STORAGE_URL.rstrip('/')}/{bucket}"
+
+    def _put(self, key, path, content_type, immutable):
+        dest = self.root / key
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        # readers never see a half-written file
+        part = dest.with_name(dest.name + ".part")
+        shutil.copyfile(path, part)
+        part.replace(dest)
+
+    def public_url(self, key):
+        return f"{self.base_url}/{key}"
+
+
+BACKENDS = {
+    "supabase": SupabaseStorage,
+    "local": LocalStorage,
+}
+
+
+@lru_cache
+def get_storage(bucket: str) -> Storage:
+    try:
+        backend = BACKENDS[settings.STORAGE_BACKEND]
+    except KeyError:
+        raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+    return backend(bucket)
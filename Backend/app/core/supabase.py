@@ -1,8 +1,17 @@
 # app/core/supabase.py
-from supabase import create_client
+#
+# Built on first use: only image uploads need it, and importing
+# supabase pulls in postgrest / gotrue / storage3 / realtime.
+from functools import lru_cache
+
 from app.core.config import settings
 
-supabase = create_client(
-    settings.SUPABASE_URL,
-    settings.SUPABASE_SERVICE_ROLE_KEY,  # service role REQUIRED
-)
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def get_supabase():
+    from supabase import create_client
+
+    return create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_SERVICE_ROLE_KEY,  # service role REQUIRED
+    )
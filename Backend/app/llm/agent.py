@@ -1,79 +1,325 @@
 # app/llm/agent.py
+import asyncio
+import time
 from uuid import UUID
+from fastapi import HTTPException
+from google.genai import types
 from app.llm.memory import AgentMemory
-from app.llm.tools import Tools
-from app.llm.llm import call_llm_with_tools
+from app.llm import response_cache, intent_router, prompt_builder
+from app.llm.tools import Tools, to_jsonable
+from app.llm.llm import (
+    call_llm_with_tools,
+    CONFIRMATION_REQUIRED,
+    READ_ONLY_TOOLS,
+)
 from app.core.database import AsyncSessionLocal
-from app.services.agent_action_service import log_agent_action
-from app.services.user_event_service import record_event
-from app.schema.enums import UserEventType
+from app.core.metrics import TOOL_LATENCY
 
 CONFIDENCE_THRESHOLD = 0.6
 
+# Model round-trips allowed per user message (tool calls + final answer)
+MAX_AGENT_STEPS = 4
+TOOL_TIMEOUT_SECONDS = 10
+
+
+# =====================================================
+# TOOL EXECUTION
+# =====================================================
+
+async def _invoke(tools: Tools, name: str, args: dict) -> dict:
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        result = await asyncio.wait_for(
+            getattr(tools, name)(**args),
+            timeout=TOOL_TIMEOUT_SECONDS,
+        )
+        return {"result": to_jsonable(result)}
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        return {"error": f"{name} timed out"}
+    except HTTPException as e:
+        outcome = "rejected"
+        return {"error": e.detail}
+    except Exception as e:
+        outcome = "error"
+        return {"error": f"{name} failed: {e}"}
+    finally:
+        TOOL_LATENCY.labels(name, outcome).observe(time.perf_counter() - started)
+
+
+async def _invoke_isolated(user_id: UUID, name: str, args: dict) -> dict:
+    # Short-lived session per call: the pooled connection is returned as
+    # soon as the tool finishes, never held across a model round-trip.
+    async with AsyncSessionLocal() as db:
+        return await _invoke(Tools(db=db, user_id=user_id), name, args)
+
+
+async def _invoke_sequential(user_id: UUID, calls: list[tuple[str, dict]]) -> list[dict]:
+    async with AsyncSessionLocal() as db:
+        tools = Tools(db=db, user_id=user_id)
+        return [await _invoke(tools, name, args) for name, args in calls]
+
+
+async def execute_tool_calls(
+    calls: list[types.FunctionCall],
+    *,
+    user_id: UUID,
+) -> list[dict]:
+    """
+    Read-only calls run concurrently, one session each; anything that
+    writes runs sequentially on one session, in the order the model asked.
+    Output order matches `calls`.
+    """
+    outputs: list[dict | None] = [None] * len(calls)
+
+    reads = [
+        (i, c) for i, c in enumerate(calls) if c.name in READ_ONLY_TOOLS
+    ]
+    read_results = await asyncio.gather(
+        *(_invoke_isolated(user_id, c.name, dict(c.args or {})) for _, c in reads)
+    )
+    for (i, _), out in zip(reads, read_results):
+        outputs[i] = out
+
+    writes = [(i, c) for i, c in enumerate(calls) if outputs[i] is None]
+    if writes:
+        write_results = await _invoke_sequential(
+            user_id, [(c.name, dict(c.args or {})) for _, c in writes]
+        )
+        for (i, _), out in zip(writes, write_results):
+            outputs[i] = out
+
+    return outputs
+
+
+def _confirmation(call: types.FunctionCall):
+    name = call.name
+    return (
+        {
+            "message": f"Please confirm to proceed with {name.replace('_', ' ')}.",
+            "actions": [
+                {
+                    "type": "confirm",
+                    "label": "Confirm",
+                    "tool": name,
+                    "params": dict(call.args or {}),
+                },
+                {"type": "cancel", "label": "Cancel"},
+            ],
+        },
+        {
+            "confidence": 0.85,
+            "tool_name": name,
+            "order_id": (call.args or {}).get("order_id"),
+        },
+    )
+
+
+# =====================================================
+# AGENT LOOP (BOUNDED)
+# =====================================================
+
+async def run_tool_loop(
+    *,
+    contents: list[types.Content],
+    declarations: list[types.FunctionDeclaration],
+    user_id: UUID,
+):
+    """
+    Lets the model call several tools per response and feeds every
+    result back in one follow-up call, for at most MAX_AGENT_STEPS
+    round-trips. Returns (response, meta) like the old single-call path.
+    """
+    used: list[str] = []
+    data: dict = {}
+    order_id = None  # first order the tools acted on → AgentAction.order_id
+
+    for _ in range(MAX_AGENT_STEPS):
+        content = await call_llm_with_tools(contents, declarations)
+        parts = (content.parts if content else None) or []
+
+        calls = [p.function_call for p in parts if p.function_call]
+        text = "".join(p.text for p in parts if p.text)
+
+        if not calls:
+            if not text and not used:
+                return {"message": "I couldn’t process that."}, {"confidence": 0.2}
+            break
+
+        confirm = next((c for c in calls if c.name in CONFIRMATION_REQUIRED), None)
+        if confirm:
+            return _confirmation(confirm)
+
+        if any(not hasattr(Tools, c.name) for c in calls):
+            return {"message": "Action not allowed."}, {"confidence": 0.2}
+
+        outputs = await execute_tool_calls(calls, user_id=user_id)
+
+        contents.append(content)
+        contents.append(
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part.from_function_response(name=c.name, response=out)
+                    for c, out in zip(calls, outputs)
+                ],
+            )
+        )
+
+        for c, out in zip(calls, outputs):
+            used.append(c.name)
+            order_id = order_id or (c.args or {}).get("order_id")
+            data.setdefault(c.name, []).append(out.get("result", out))
+    else:
+        text = ""  # step budget exhausted, return what the tools produced
+
+    if not used:
+        return (
+            {"message": text, "actions": []},
+            {"confidence": 0.7, "tool_name": None},
+        )
+
+    # single result keeps the old `data` shape
+    if len(used) == 1:
+        data = data[used[0]][0]
+
+    return (
+        {"message": text or "Done ✅", "data": data, "actions": []},
+        {
+            "confidence": 0.9,
+            "tool_name": ",".join(dict.fromkeys(used)),
+            "order_id": order_id,
+        },
+    )
+
+
+async def dispatch_intent(match: intent_router.IntentMatch, *, user_id: UUID):
+    """
+    Runs a locally routed intent without calling the model.
+    Returns None on tool error so the LLM can explain it instead.
+    """
+    out = await _invoke_isolated(user_id, match.tool, match.args)
+    if "error" in out:
+        return None
+
+    return (
+        {"message": "Done ✅", "data": out["result"], "actions": []},
+        {
+            "confidence": 0.9,
+            "tool_name": match.tool,
+            "routed": match.source,
+            "order_id": match.args.get("order_id"),
+        },
+    )
+
+
+async def replay_cached(entry: dict, *, user_id: UUID):
+    """
+    Answers from the semantic cache without calling the model.
+    Plans are re-executed for the current user.
+    """
+    meta = {"confidence": entry["confidence"], "cached": True}
+
+    if entry["kind"] == "answer":
+        meta["tool_name"] = None
+        return {"message": entry["message"], "actions": []}, meta
+
+    out = await _invoke_isolated(user_id, entry["tool"], {})
+    meta["tool_name"] = entry["tool"]
+    return (
+        {"message": "Done ✅", "data": out.get("result", out), "actions": []},
+        meta,
+    )
+
+
 async def run_agent(
     *,
     user_id: UUID,
     chat_session_id: UUID,
-    conversation_id: UUID, 
+    conversation_id: UUID,
     user_message: str,
 ):
     """
     Runs AI agent for a CHAT SESSION.
-    Uses 'conversation_id' only for logging AgentActions (buttons).
+    Does not write to the DB; the returned 'action_payload' is persisted
+    by the caller together with the messages for 'conversation_id'.
     """
 
     # Fix: Ensure ID is string for Redis key
     memory = AgentMemory(chat_session_id=str(chat_session_id))
 
-    async with AsyncSessionLocal() as db:
-        tools = Tools(db=db, user_id=user_id)
+    # No DB session is held in here: tools open their own short sessions.
+    # The caller persists the turn (see support_service.persist_chat_turn).
+    first_turn = await memory.is_empty()
+
+    # -------- local intent router (rules cost no I/O) --------
+    match = intent_router.match_rules(user_message)
+    vector = None
+    if not match.dispatchable:
+        vector = await response_cache.embed(user_message)
+        if vector is not None and match.intent is None:
+            match = await intent_router.match_centroid(user_message, vector)
+
+    intent = match.intent or response_cache.DEFAULT_INTENT
+    routed = (
+        await dispatch_intent(match, user_id=user_id) if match.dispatchable else None
+    )
 
-        # -------- analytics --------
-        await record_event(
-            db=db,
+    # -------- semantic cache (first turn only: no convo context) --------
+    cached = None
+    if not routed and first_turn and vector is not None:
+        cached = await response_cache.lookup(vector, intent=intent)
+
+    if routed:
+        response, meta = routed
+    elif cached:
+        response, meta = await replay_cached(cached, user_id=user_id)
+    else:
+        contents, declarations = await prompt_builder.build_prompt(
+            memory, user_message, intent=match.intent
+        )
+        response, meta = await run_tool_loop(
+            contents=contents,
+            declarations=declarations,
             user_id=user_id,
-            event_type=UserEventType.chat_message.value,
-            metadata={"source": "ai_chat"},
         )
+        if vector is not None and first_turn:
+            await response_cache.store(
+                vector,
+                message=user_message,
+                response=response,
+                meta=meta,
+                intent=intent,
+            )
 
-        history = await memory.read()
+    confidence = meta.get("confidence", 0.5)
+    tool_name = meta.get("tool_name")
 
-        response, meta = await call_llm_with_tools(
-            history=history,
-            message=user_message,
-            tools=tools,
-        )
+    message = response.get("message", "")
+    actions = response.get("actions", [])
+    data = response.get("data")
 
-        confidence = meta.get("confidence", 0.5)
-        tool_name = meta.get("tool_name")
-
-        message = response.get("message", "")
-        actions = response.get("actions", [])
-        data = response.get("data")
-
-        
-        await log_agent_action(
-            db=db,
-            conversation_id=conversation_id, 
-            action_type=tool_name or "chat",
-            payload={
-                "user_message": user_message,
-                "response": message,
-                "actions": actions,
-            },
-            confidence=confidence,
-        )
+    handoff = confidence < CONFIDENCE_THRESHOLD
 
-        handoff = confidence < CONFIDENCE_THRESHOLD
+    action_payload = {
+        "user_message": user_message,
+        "response": message,
+        "actions": actions,
+    }
+    if meta.get("order_id"):
+        action_payload["order_id"] = str(meta["order_id"])
 
-        await memory.append("user", user_message)
-        await memory.append("assistant", message)
+    await memory.append("user", user_message)
+    await memory.append("assistant", message)
+    prompt_builder.schedule_summary_refresh(memory)
 
-        return {
-            "content": message,
-            "actions": actions,
-            "data": data,
-            "confidence": confidence,
-            "handoff": handoff,
-            "tool_used": tool_name,
-        }
\ No newline at end of file
+    return {
+        "content": message,
+        "actions": actions,
+        "data": data,
+        "confidence": confidence,
+        "handoff": handoff,
+        "tool_used": tool_name,
+        "action_payload": action_payload,
+    }
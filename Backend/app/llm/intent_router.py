@@ -0,0 +1,234 @@
+# app/llm/intent_router.py
+#
+# Local intent classifier that runs before the LLM.
+# 1. keyword / regex rules (no I/O)
+# 2. nearest-centroid over embeddings of LABELLED_EXAMPLES
+# High-confidence simple intents are dispatched straight to a Tools method.
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.core.redis import redis_client
+from app.services.embedding_service import generate_text_embedding
+
+RULE_CONFIDENCE = 0.95
+CENTROID_THRESHOLD = 0.80
+CENTROID_MARGIN = 0.05  # best must beat runner-up by this much
+
+UUID_RE = re.compile(
+    r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
+    re.IGNORECASE,
+)
+
+# intent → (tool, required args)
+SIMPLE_INTENTS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "view_cart": ("view_cart", ()),
+    "list_addresses": ("list_addresses", ()),
+    "track_order": ("order_timeline", ("order_id",)),
+    "delivery_status": ("get_delivery_status", ("order_id",)),
+    "browse_products": ("list_products", ()),
+    "recommendations": ("recommend_products", ()),
+    "preferences": ("get_user_preferences", ()),
+}
+
+RULES: list[tuple[str, re.Pattern]] = [
+    ("delivery_status", re.compile(r"\b(where('?s| is)|delivery status|when will .* (arrive|deliver))\b.*\b(order|package|parcel|delivery)\b", re.I)),
+    ("track_order", re.compile(r"\b(track|status of|timeline|check)\b.*\border\b|\border status\b", re.I)),
+    ("view_cart", re.compile(r"\b(show|view|see|what'?s in|open|check)\b.*\b(my )?(cart|basket|bag)\b", re.I)),
+    ("list_addresses", re.compile(r"\b(show|list|view|see|what are|which)\b.*\b(my )?(saved )?address(es)?\b", re.I)),
+    ("recommendations", re.compile(r"\b(recommend|suggest)\b.*\b(me|products?|something)\b", re.I)),
+    ("browse_products", re.compile(r"\b(show|list|browse|see)\b.*\b(all |your )?products\b", re.I)),
+    ("preferences", re.compile(r"\bmy (preferences|interests)\b", re.I)),
+]
+
+# list_products takes no filters: "laptops under 2000" routed locally
+# would return the whole catalog, so only a bare browse is dispatched
+PLAIN_BROWSE = re.compile(
+    r"^\W*(please\s+)?("
+    r"(show|list|browse|see|view)(\s+me)?(\s+(all|your|the))*\s+(products|catalog(ue)?|items)"
+    r"|what do you (sell|have)"
+    r"|what'?s in (your|the) catalog(ue)?"
+    r")(\s+please)?\W*$",
+    re.I,
+)
+
+# Writes or anything needing judgment → never routed locally
+BLOCKLIST = re.compile(r"\b(cancel|refund|return|complain|delete|remove|add|buy|checkout|order now|pay)\b", re.I)
+
+LABELLED_EXAMPLES: dict[str, list[str]] = {
+    "view_cart": [
+        "show my cart",
+        "what's in my cart",
+        "view cart",
+        "what did I add to my basket",
+        "cart total",
+    ],
+    "list_addresses": [
+        "list my addresses",
+        "show my saved addresses",
+        "which addresses do I have",
+    ],
+    "browse_products": [
+        "show me products",
+        "what do you sell",
+        "what's in your catalog",
+        "browse the catalog",
+    ],
+    "recommendations": [
+        "recommend something for me",
+        "what should I buy",
+        "suggest products I might like",
+    ],
+    "preferences": [
+        "what are my preferences",
+        "what do you know about my taste",
+    ],
+}
+
+
+@dataclass
+class IntentMatch:
+    intent: str | None
+    confidence: float
+    source: str  # "rule" | "centroid" | "none"
+    tool: str | None = None
+    args: dict = field(default_factory=dict)
+
+    @property
+    def dispatchable(self) -> bool:
+        if not self.tool:
+            return False
+        threshold = RULE_CONFIDENCE if self.source == "rule" else CENTROID_THRESHOLD
+        return self.confidence >= threshold
+
+
+NO_MATCH = IntentMatch(intent=None, confidence=0.0, source="none")
+
+
+# =====================================================
+# RULES
+# =====================================================
+
+def _with_args(intent: str, message: str, confidence: float, source: str) -> IntentMatch:
+    tool, required = SIMPLE_INTENTS[intent]
+    args = {}
+
+    if intent == "browse_products" and not PLAIN_BROWSE.match(message):
+        # category / price constraints: the model has to handle them
+        return IntentMatch(intent=intent, confidence=confidence, source=source)
+
+    if "order_id" in required:
+        m = UUID_RE.search(message)
+        if not m:
+            # right intent, but the model has to ask for the id
+            return IntentMatch(intent=intent, confidence=confidence, source=source)
+        args["order_id"] = m.group(0)
+
+    return IntentMatch(
+        intent=intent,
+        confidence=confidence,
+        source=source,
+        tool=tool,
+        args=args,
+    )
+
+
+def match_rules(message: str) -> IntentMatch:
+    if BLOCKLIST.search(message):
+        return NO_MATCH
+
+    hits = [intent for intent, pattern in RULES if pattern.search(message)]
+
+    # compound questions ("cart and my order") belong to the agent loop
+    if len(hits) != 1:
+        return NO_MATCH
+
+    return _with_args(hits[0], message, RULE_CONFIDENCE, "rule")
+
+
+# =====================================================
+# NEAREST CENTROID
+# =====================================================
+
+_centroids: dict[str, np.ndarray] | None = None
+
+
+def _examples_hash() -> str:
+    return hashlib.sha1(
+        json.dumps(LABELLED_EXAMPLES, sort_keys=True).encode()
+    ).hexdigest()[:12]
+
+
+def _normalize(v) -> np.ndarray:
+    v = np.asarray(v, dtype=np.float32)
+    n = np.linalg.norm(v)
+    return v / n if n else v
+
+
+async def load_centroids() -> dict[str, np.ndarray]:
+    """
+    Centroids are cached in Redis keyed by a hash of LABELLED_EXAMPLES,
+    so examples are embedded once per change, not once per worker.
+    """
+    global _centroids
+    if _centroids is not None:
+        return _centroids
+
+    key = f"llm:intent:centroids:{_examples_hash()}"
+    raw = await redis_client.get(key)
+
+    if raw:
+        _centroids = {k: np.asarray(v, dtype=np.float32) for k, v in json.loads(raw).items()}
+        return _centroids
+
+    centroids = {}
+    for intent, examples in LABELLED_EXAMPLES.items():
+        vectors = [_normalize(await generate_text_embedding(e)) for e in examples]
+        centroids[intent] = _normalize(np.mean(vectors, axis=0))
+
+    await redis_client.set(key, json.dumps({k: v.tolist() for k, v in centroids.items()}))
+    _centroids = centroids
+    return _centroids
+
+
+async def match_centroid(message: str, vector: np.ndarray) -> IntentMatch:
+    if BLOCKLIST.search(message):
+        return NO_MATCH
+
+    try:
+        centroids = await load_centroids()
+    except Exception:
+        return NO_MATCH
+
+    scores = sorted(
+        ((float(np.dot(vector, c)), intent) for intent, c in centroids.items()),
+        reverse=True,
+    )
+    if not scores:
+        return NO_MATCH
+
+    best, intent = scores[0]
+    runner_up = scores[1][0] if len(scores) > 1 else 0.0
+
+    if best - runner_up < CENTROID_MARGIN:
+        return IntentMatch(intent=intent, confidence=best, source="centroid")
+
+    return _with_args(intent, message, best, "centroid")
+
+
+# =====================================================
+# ENTRY
+# =====================================================
+
+async def route(message: str, vector: np.ndarray | None = None) -> IntentMatch:
+    """
+    Rules first (free). Centroid only if a message embedding is available.
+    """
+    match = match_rules(message)
+    if match.intent or vector is None:
+        return match
+
+    return await match_centroid(message, vector)
@@ -1,10 +1,23 @@
 # app/llm/llm.py
-from google.genai import Client
+import asyncio
+import hashlib
+import json
+import time
+from functools import cache
+from google.genai import types
+from google.genai import errors
 from app.llm.tool_schema import TOOLS
 from app.llm.system_prompt import SYSTEM_PROMPT
 from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.gemini import get_gemini_client
+from app.core.metrics import observe_llm, record_llm_usage, cache_hit
 
-client = Client(api_key=settings.GEMINI_API_KEY)
+MODEL = "gemini-2.5-flash"
+
+# Provider-side cache for the static prefix (system prompt + tool schema)
+CONTEXT_CACHE_TTL_SECONDS = 3600
+CONTEXT_CACHE_RETRY_SECONDS = 300  # back-off after a failed create
 
 CONFIRMATION_REQUIRED = {
     "cancel_order",
@@ -15,59 +28,207 @@ CONFIRMATION_REQUIRED = {
     "delete_address",
 }
 
+# Tools that never write. Safe to run concurrently, each on its own session.
+READ_ONLY_TOOLS = {
+    "view_cart",
+    "order_timeline",
+    "get_delivery_status",
+    "list_addresses",
+}
 
-async def call_llm_with_tools(history, message, tools):
-    contents = [
-        {"role": "system", "content": SYSTEM_PROMPT},
-        *history,
-        {"role": "user", "content": message},
-    ]
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=contents,
-        config={"tools": TOOLS},
+# =====================================================
+# CONTEXT CACHE (STATIC PREFIX)
+# =====================================================
+
+_context_cache = {"name": None, "hash": None, "expires_at": 0.0, "disabled_until": 0.0}
+_context_cache_lock = asyncio.Lock()
+
+
+@cache
+def prefix_hash() -> str:
+    """
+    Changes whenever the model, prompt or any tool declaration changes,
+    which forces a new cached-content handle. All three are fixed per
+    process (a deploy changes them), so it's computed once.
+    """
+    payload = json.dumps(
+        {
+            "model": MODEL,
+            "system": SYSTEM_PROMPT,
+            "tools": [t.model_dump(mode="json", exclude_none=True) for t in TOOLS],
+        },
+        sort_keys=True,
     )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
 
-    candidate = response.candidates[0]
-    parts = candidate.content.parts
-
-    part = next((p for p in parts if p.text or p.function_call), None)
-    if not part:
-        return {"message": "I couldn’t process that."}, {"confidence": 0.2}
-
-    if part.function_call:
-        name = part.function_call.name
-        args = part.function_call.args or {}
-
-        if name in CONFIRMATION_REQUIRED:
-            return (
-                {
-                    "message": f"Please confirm to proceed with {name.replace('_', ' ')}.",
-                    "actions": [
-                        {
-                            "type": "confirm",
-                            "label": "Confirm",
-                            "tool": name,
-                            "params": args,
-                        },
-                        {"type": "cancel", "label": "Cancel"},
-                    ],
-                },
-                {"confidence": 0.85, "tool_name": name},
-            )
 
-        if not hasattr(tools, name):
-            return {"message": "Action not allowed."}, {"confidence": 0.2}
+def is_stale_cache_error(e: errors.APIError) -> bool:
+    """
+    The cached content is gone (expired, deleted server-side). Anything
+    else — 429, 5xx, safety blocks — is not the handle's fault.
+    """
+    if e.code == 404 or e.status == "NOT_FOUND":
+        return True
+    message = (e.message or "").lower()
+    return e.code in (400, 403) and "cache" in message and (
+        "expired" in message or "not found" in message
+    )
+
+
+def invalidate_context_cache():
+    _context_cache.update(name=None, hash=None, expires_at=0.0)
+
+
+async def get_context_cache() -> str | None:
+    """
+    Returns a cached-content name for the static prefix, creating it on
+    first use, on expiry, or when the prefix hash changes. Workers share
+    the handle through Redis. None → caller sends the prefix inline.
+    """
+    if not settings.LLM_CONTEXT_CACHE_ENABLED:
+        return None
+
+    now = time.time()
+    digest = prefix_hash()
+
+    if _context_cache["disabled_until"] > now:
+        return None
+    if _context_cache["hash"] == digest and _context_cache["expires_at"] > now:
+        cache_hit("llm_context", True)
+        return _context_cache["name"]
+
+    async with _context_cache_lock:
+        if _context_cache["hash"] == digest and _context_cache["expires_at"] > now:
+            cache_hit("llm_context", True)
+            return _context_cache["name"]
+
+        redis_key = f"llm:ctxcache:{digest}"
+        # renew a minute early so in-flight requests never hit an expired handle
+        usable_for = CONTEXT_CACHE_TTL_SECONDS - 60
+
+        try:
+            name = await redis_client.get(redis_key)
+            ttl = await redis_client.ttl(redis_key) if name else -2
+
+            # another worker's handle counts as a hit
+            cache_hit("llm_context", bool(name and ttl > 0))
+
+            if not name or ttl <= 0:
+                with observe_llm("cache_create", "agent"):
+                    cache = await get_gemini_client().aio.caches.create(
+                        model=MODEL,
+                        config=types.CreateCachedContentConfig(
+                            display_name=f"support-agent-{digest}",
+                            system_instruction=SYSTEM_PROMPT,
+                            tools=[types.Tool(function_declarations=TOOLS)],
+                            ttl=f"{CONTEXT_CACHE_TTL_SECONDS}s",
+                        ),
+                    )
+                name, ttl = cache.name, usable_for
+                await redis_client.set(redis_key, name, ex=usable_for)
+
+        except Exception as e:
+            # caching unavailable (quota, prefix too small, ...) → inline
+            print("Context cache unavailable:", e)
+            _context_cache["disabled_until"] = now + CONTEXT_CACHE_RETRY_SECONDS
+            return None
 
-        result = await getattr(tools, name)(**args)
+        _context_cache.update(name=name, hash=digest, expires_at=now + ttl)
+        return name
 
-        return (
-            {"message": "Done ✅", "data": result, "actions": []},
-            {"confidence": 0.9, "tool_name": name},
+
+def _tool_config(
+    declarations: list[types.FunctionDeclaration] | None,
+    cached_content: str | None,
+) -> types.GenerateContentConfig:
+    no_afc = types.AutomaticFunctionCallingConfig(disable=True)
+
+    if cached_content:
+        # prompt + full tool schema come from the cache
+        return types.GenerateContentConfig(
+            cached_content=cached_content,
+            automatic_function_calling=no_afc,
         )
 
-    return (
-        {"message": part.text, "actions": []},
-        {"confidence": 0.7, "tool_name": None},
+    return types.GenerateContentConfig(
+        system_instruction=SYSTEM_PROMPT,
+        tools=[types.Tool(function_declarations=declarations or TOOLS)],
+        automatic_function_calling=no_afc,
+    )
+
+
+# =====================================================
+# CALLS
+# =====================================================
+
+def build_contents(history: list[dict], message: str) -> list[types.Content]:
+    """
+    Converts Redis memory ({role, content}) into Gemini contents.
+    """
+    contents = [
+        types.Content(
+            role="model" if h["role"] == "assistant" else "user",
+            parts=[types.Part(text=h["content"])],
+        )
+        for h in history
+        if h.get("content")
+    ]
+    contents.append(
+        types.Content(role="user", parts=[types.Part(text=message)])
     )
+    return contents
+
+
+async def call_llm_with_tools(
+    contents: list[types.Content],
+    declarations: list[types.FunctionDeclaration] | None = None,
+) -> types.Content | None:
+    """
+    Single model round-trip. Returns the candidate content
+    (text and/or function calls), or None if the model returned nothing.
+
+    Uses the cached static prefix when available (full tool list, cheap
+    cached tokens); otherwise sends the prompt inline, where
+    `declarations` narrows the tool list (defaults to all TOOLS).
+    """
+    cached_content = await get_context_cache()
+
+    try:
+        with observe_llm("generate_content", "agent"):
+            response = await get_gemini_client().aio.models.generate_content(
+                model=MODEL,
+                contents=contents,
+                config=_tool_config(declarations, cached_content),
+            )
+    except errors.APIError as e:
+        if not cached_content or not is_stale_cache_error(e):
+            raise
+        # handle expired or was deleted server-side → recreate next call
+        invalidate_context_cache()
+        await redis_client.delete(f"llm:ctxcache:{prefix_hash()}")
+        with observe_llm("generate_content", "agent"):
+            response = await get_gemini_client().aio.models.generate_content(
+                model=MODEL,
+                contents=contents,
+                config=_tool_config(declarations, None),
+            )
+
+    record_llm_usage("generate_content", "agent", response)
+
+    if not response.candidates:
+        return None
+    return response.candidates[0].content
+
+
+async def summarize_text(prompt: str) -> str:
+    """
+    Plain completion (no tools). Used for rolling / session summaries.
+    """
+    with observe_llm("generate_content", "summary"):
+        response = await get_gemini_client().aio.models.generate_content(
+            model=MODEL,
+            contents=prompt,
+        )
+    record_llm_usage("generate_content", "summary", response)
+    return (response.text or "").strip()
@@ -0,0 +1,157 @@
+# app/llm/prompt_builder.py
+#
+# Token-budgeted prompt assembly:
+#   rolling summary (Redis, refreshed in the background)
+#   + the raw turns not yet folded into it (long tool outputs compacted)
+#   + the tool declarations relevant to the detected intent
+import asyncio
+
+from google.genai import types
+
+from app.llm.llm import build_contents, summarize_text
+from app.llm.memory import AgentMemory
+from app.llm.system_prompt import SYSTEM_PROMPT
+from app.llm.tool_schema import TOOLS
+
+PROMPT_TOKEN_BUDGET = 3000
+VERBATIM_TURNS = 6
+MAX_TURN_CHARS = 1200
+SUMMARY_MAX_CHARS = 2400
+
+# fold once this many turns sit outside the verbatim window;
+# until then they are still sent raw, so nothing drops out of context
+SUMMARY_BATCH = 6
+
+# intent (from intent_router) → tools the model may need for it
+TOOL_GROUPS: dict[str, set[str]] = {
+    "view_cart": {"view_cart", "add_to_cart", "remove_from_cart", "create_order", "list_addresses"},
+    "list_addresses": {"list_addresses", "add_address", "delete_address", "set_default_address"},
+    "track_order": {"order_timeline", "get_delivery_status", "cancel_order", "request_refund", "raise_complaint"},
+    "delivery_status": {"get_delivery_status", "order_timeline", "raise_complaint"},
+    "browse_products": {"list_products", "view_product", "recommend_products", "add_to_cart"},
+    "recommendations": {"recommend_products", "view_product", "add_to_cart", "get_user_preferences"},
+    "preferences": {"get_user_preferences", "update_user_profile", "recommend_products"},
+}
+
+_background: set[asyncio.Task] = set()
+
+
+# =====================================================
+# TOKENS
+# =====================================================
+
+def estimate_tokens(text: str) -> int:
+    # ~4 chars/token for English; good enough for budgeting
+    return len(text) // 4 + 1
+
+
+def _declaration_tokens(declarations: list[types.FunctionDeclaration]) -> int:
+    return sum(
+        estimate_tokens(d.model_dump_json(exclude_none=True)) for d in declarations
+    )
+
+
+def compact(content: str, limit: int = MAX_TURN_CHARS) -> str:
+    if len(content) <= limit:
+        return content
+    return content[:limit] + " …[truncated]"
+
+
+# =====================================================
+# TOOL SELECTION
+# =====================================================
+
+def select_tools(intent: str | None) -> list[types.FunctionDeclaration]:
+    names = TOOL_GROUPS.get(intent or "")
+    if not names:
+        return TOOLS
+    return [t for t in TOOLS if t.name in names]
+
+
+# =====================================================
+# ASSEMBLY
+# =====================================================
+
+async def build_prompt(
+    memory: AgentMemory,
+    message: str,
+    *,
+    intent: str | None = None,
+) -> tuple[list[types.Content], list[types.FunctionDeclaration]]:
+    declarations = select_tools(intent)
+
+    summary = await memory.read_summary()
+    turns = [
+        {"role": t["role"], "content": compact(t.get("content") or "")}
+        for t in await memory.read(limit=VERBATIM_TURNS + SUMMARY_BATCH)
+    ]
+
+    fixed = (
+        estimate_tokens(SYSTEM_PROMPT)
+        + _declaration_tokens(declarations)
+        + estimate_tokens(message)
+    )
+    if summary:
+        summary = compact(summary, SUMMARY_MAX_CHARS)
+        fixed += estimate_tokens(summary)
+
+    # drop oldest verbatim turns until the prompt fits
+    while turns and fixed + sum(estimate_tokens(t["content"]) for t in turns) > PROMPT_TOKEN_BUDGET:
+        turns.pop(0)
+
+    if summary:
+        turns.insert(
+            0,
+            {"role": "user", "content": f"Summary of the conversation so far:\n{summary}"},
+        )
+
+    return build_contents(turns, message), declarations
+
+
+# =====================================================
+# ROLLING SUMMARY (ASYNC)
+# =====================================================
+
+async def refresh_summary(memory: AgentMemory):
+    if not await memory.acquire_summary_lock():
+        return
+
+    try:
+        turns = await memory.read_all()
+        if len(turns) < VERBATIM_TURNS + SUMMARY_BATCH:
+            return
+
+        old = turns[:-VERBATIM_TURNS]
+        previous = await memory.read_summary()
+
+        prompt = (
+            "Update the running summary of a support chat. Keep order ids, "
+            "product names, amounts, decisions and open questions. "
+            "Drop pleasantries. Max 150 words.\n\n"
+            f"Current summary:\n{previous or '(none)'}\n\n"
+            "New turns:\n"
+            + "\n".join(f"{t['role']}: {compact(t.get('content') or '', 600)}" for t in old)
+        )
+
+        summary = await summarize_text(prompt)
+        if summary:
+            await memory.fold_into_summary(summary, len(old))
+    finally:
+        await memory.release_summary_lock()
+
+
+def schedule_summary_refresh(memory: AgentMemory):
+    """
+    Fire-and-forget: summarization never sits on the response path.
+    """
+    task = asyncio.create_task(_safe_refresh(memory))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def _safe_refresh(memory: AgentMemory):
+    try:
+        await refresh_summary(memory)
+    except Exception as e:
+        # log only, never crash user flow
+        print("Summary refresh failed:", e)
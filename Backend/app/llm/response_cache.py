@@ -0,0 +1,187 @@
+# app/llm/response_cache.py
+#
+# Semantic response cache for repeated support questions.
+#
+#   llm:rcache:{intent}:{scope} → hash(field = message hash, value = entry)
+#
+# scope is "answer" (plain model reply) or a tool name. Tool entries store
+# only the PLAN, never the result, so a hit re-runs the tool for the caller.
+import base64
+import hashlib
+import json
+import time
+
+import numpy as np
+
+from app.core.redis import redis_client
+from app.core.metrics import cache_hit
+from app.services.embedding_service import generate_text_embedding
+
+CACHE_PREFIX = "llm:rcache"
+STATS_KEY = f"{CACHE_PREFIX}:stats"
+
+SIMILARITY_THRESHOLD = 0.92
+CACHE_TTL_SECONDS = 6 * 3600
+MAX_ENTRIES_PER_SCOPE = 256
+
+ANSWER_SCOPE = "answer"
+DEFAULT_INTENT = "general"
+
+# Argument-free tools: the plan carries nothing user specific
+CACHEABLE_PLANS = {
+    "view_cart",
+    "list_addresses",
+    "list_products",
+    "recommend_products",
+    "get_user_preferences",
+}
+
+
+# =====================================================
+# HELPERS
+# =====================================================
+
+def _key(intent: str, scope: str) -> str:
+    return f"{CACHE_PREFIX}:{intent}:{scope}"
+
+
+def _field(message: str) -> str:
+    normalized = " ".join(message.lower().split())
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def _pack(vector: np.ndarray) -> str:
+    return base64.b64encode(vector.astype(np.float16).tobytes()).decode()
+
+
+def _unpack(raw: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(raw), dtype=np.float16).astype(np.float32)
+
+
+def _normalize(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+async def embed(message: str) -> np.ndarray | None:
+    """
+    Never raises: a failed embedding just means no caching for this turn.
+    """
+    try:
+        return _normalize(await generate_text_embedding(message))
+    except Exception:
+        return None
+
+
+# =====================================================
+# LOOKUP / STORE
+# =====================================================
+
+async def lookup(
+    vector: np.ndarray,
+    *,
+    intent: str = DEFAULT_INTENT,
+) -> dict | None:
+    """
+    Returns the closest live entry above SIMILARITY_THRESHOLD, or None.
+    """
+    scopes = await redis_client.smembers(f"{CACHE_PREFIX}:{intent}:scopes")
+
+    best, best_score = None, SIMILARITY_THRESHOLD
+    now = time.time()
+
+    for scope in scopes:
+        entries = await redis_client.hgetall(_key(intent, scope))
+        for raw in entries.values():
+            entry = json.loads(raw)
+            if entry["expires_at"] < now:
+                continue
+            score = float(np.dot(vector, _unpack(entry["v"])))
+            if score >= best_score:
+                best, best_score = entry, score
+
+    await redis_client.hincrby(STATS_KEY, "hits" if best else "misses", 1)
+    cache_hit("llm_response", best is not None)
+
+    if not best:
+        return None
+    best.pop("v", None)
+    best["similarity"] = best_score
+    return best
+
+
+async def store(
+    vector: np.ndarray,
+    *,
+    message: str,
+    response: dict,
+    meta: dict,
+    intent: str = DEFAULT_INTENT,
+):
+    """
+    Caches a turn if it is safe to replay for another user:
+    - plain answers with no actions
+    - single argument-free tool plans (result is NOT stored)
+    """
+    if response.get("actions"):
+        return
+
+    tool_name = meta.get("tool_name")
+
+    if tool_name is None:
+        scope = ANSWER_SCOPE
+        entry = {
+            "kind": "answer",
+            "message": response.get("message", ""),
+            "confidence": meta.get("confidence", 0.7),
+        }
+        if not entry["message"]:
+            return
+    elif tool_name in CACHEABLE_PLANS:
+        scope = tool_name
+        entry = {
+            "kind": "plan",
+            "tool": tool_name,
+            "confidence": meta.get("confidence", 0.9),
+        }
+    else:
+        return
+
+    entry["v"] = _pack(vector)
+    entry["expires_at"] = time.time() + CACHE_TTL_SECONDS
+
+    key = _key(intent, scope)
+    if await redis_client.hlen(key) >= MAX_ENTRIES_PER_SCOPE:
+        return
+
+    await redis_client.hset(key, _field(message), json.dumps(entry))
+    await redis_client.expire(key, CACHE_TTL_SECONDS)
+    await redis_client.sadd(f"{CACHE_PREFIX}:{intent}:scopes", scope)
+    await redis_client.expire(f"{CACHE_PREFIX}:{intent}:scopes", CACHE_TTL_SECONDS)
+
+
+# =====================================================
+# ADMIN
+# =====================================================
+
+async def purge(*, intent: str | None = None, scope: str | None = None) -> int:
+    pattern = f"{CACHE_PREFIX}:{intent or '*'}:{scope or '*'}"
+    deleted = 0
+    async for key in redis_client.scan_iter(match=pattern):
+        if key == STATS_KEY:
+            continue
+        deleted += await redis_client.delete(key)
+    return deleted
+
+
+async def stats() -> dict:
+    raw = await redis_client.hgetall(STATS_KEY)
+    hits = int(raw.get("hits", 0))
+    misses = int(raw.get("misses", 0))
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
@@ -1,7 +1,30 @@
 # app/llm/tools.py
 from uuid import UUID
+from collections.abc import Mapping
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect as sa_inspect
 from app.schema.schemas import CheckoutCreate
 
+
+def to_jsonable(value):
+    """
+    Makes tool results safe to send back to the model
+    (ORM rows, row mappings, UUIDs, Decimals, datetimes).
+    """
+    if isinstance(value, Mapping):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, "__table__"):
+        return {
+            attr.key: to_jsonable(getattr(value, attr.key))
+            for attr in sa_inspect(value).mapper.column_attrs
+        }
+    try:
+        return jsonable_encoder(value)
+    except Exception:
+        return str(value)
+
 class Tools:
     def __init__(self, db, user_id: UUID):
         self.db = db
@@ -73,18 +96,23 @@ class Tools:
 
     async def cancel_order(self, order_id: str):
         await self.order_service.cancel_order(
-            self.db, self.user_id, UUID(order_id)
+            self.db, user_id=self.user_id, order_id=UUID(order_id)
         )
         return {"status": "cancelled"}
 
     async def order_timeline(self, order_id: str):
         return await self.order_service.get_order_timeline(
-            self.db, UUID(order_id), self.user_id
+            self.db, order_id=UUID(order_id), user_id=self.user_id
         )
 
     async def get_delivery_status(self, order_id: str):
         return await self.delivery_service.get_delivery_for_order(
-            self.db, UUID(order_id), self.user_id
+            self.db, order_id=UUID(order_id), user_id=self.user_id
+        )
+
+    async def list_addresses(self):
+        return await self.user_service.list_addresses(
+            self.db, self.user_id
         )
 
     async def raise_complaint(self, order_id: str, description: str):
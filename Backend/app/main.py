@@ -1,18 +1,43 @@
 # app/main.py
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from app.core.config import settings
 from app.core.security import setup_cors
+from app.core.metrics import setup_metrics, mark_process_dead
+from app.core.query_counter import setup_query_counter
+from app.core.gemini import get_gemini_client
+from app import warmup
 
 from app.api.routers import (
     products,
     carts,
     orders,
     support,
-    admin,payments,stores,offers,delivery,complaints,product_images,recommendations,users,events,refunds,pickups,recommendations,handoff,ws,leads,
+    admin,payments,stores,offers,delivery,complaints,product_images,recommendations,users,events,refunds,pickups,recommendations,handoff,ws,leads,metrics,
     
 )
-app = FastAPI(title="Website Support Agent")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # built lazily (cheap imports); pay for it before the first chat
+    await asyncio.to_thread(get_gemini_client)
+    # offer engine now; pools and caches in the background (see /ready)
+    await warmup.startup()
+    yield
+    await warmup.shutdown()
+    mark_process_dead()
+
+
+app = FastAPI(title="Website Support Agent", lifespan=lifespan)
 
 setup_cors(app)
+setup_query_counter(app)
+setup_metrics(app)
 
 app.include_router(products.router)
 app.include_router(carts.router)
@@ -33,6 +58,25 @@ app.include_router(events.router)
 app.include_router(pickups.router)
 app.include_router(handoff.router)
 app.include_router(ws.router)
+app.include_router(metrics.router)
+
+if settings.STORAGE_BACKEND == "local":
+    # uploaded files (app/core/storage.py); Supabase serves its own
+    app.mount(
+        settings.LOCAL_STORAGE_URL,
+        StaticFiles(directory=settings.LOCAL_STORAGE_DIR, check_dir=False),
+        name="media",
+    )
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    # 503 while warming up or draining: keep out of rotation
+    is_ready, body = warmup.readiness()
+    if not is_ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
@@ -12,7 +12,7 @@ from app.core.database import Base
 from app.models.enums import *
 from sqlalchemy import (
     Column, Text, Boolean, Numeric, ForeignKey,
-    TIMESTAMP, Integer, String, Time, Index
+    TIMESTAMP, Integer, String, Time, Index, Date, BigInteger, Table, text
 )
 from datetime import datetime
 
@@ -26,7 +26,7 @@ class User(Base):
     id = Column(UUID, primary_key=True)
     name = Column(Text)
     role = Column(user_role_enum, server_default="customer")
-    preferences = Column(JSONB, server_default="'{}'::jsonb")
+    preferences = Column(JSONB, server_default=text("'{}'::jsonb"))
 
     location = Column(Geography("POINT", srid=4326))
     location_updated_at = Column(TIMESTAMP)
@@ -38,9 +38,9 @@ class UserPreference(Base):
     __tablename__ = "user_preferences"
 
     user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
-    preferred_categories = Column(JSONB, server_default="'{}'::jsonb")
-    preferred_price_range = Column(JSONB, server_default="'{}'::jsonb")
-    preferred_brands = Column(JSONB, server_default="'{}'::jsonb")
+    preferred_categories = Column(JSONB, server_default=text("'{}'::jsonb"))
+    preferred_price_range = Column(JSONB, server_default=text("'{}'::jsonb"))
+    preferred_brands = Column(JSONB, server_default=text("'{}'::jsonb"))
 
     last_updated_at = Column(TIMESTAMP, server_default=func.now())
 
@@ -71,6 +71,8 @@ class Product(Base):
     __tablename__ = "products"
 
     id = Column(UUID, primary_key=True, default=uuid4)
+    # id in the source catalog; bulk imports upsert on it
+    external_id = Column(Text, unique=True)
     name = Column(Text, nullable=False)
     description = Column(Text)
     category = Column(Text)
@@ -84,21 +86,39 @@ class Product(Base):
     created_at = Column(TIMESTAMP, server_default=func.now())
 
 
+# Not mapped to a class; declared so the product_images / user_events
+# foreign keys resolve when a flush sorts its tables.
+product_variants = Table(
+    "product_variants",
+    Base.metadata,
+    Column("id", UUID, primary_key=True, default=uuid4),
+)
 
 
 class ProductImage(Base):
     __tablename__ = "product_images"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    product_id = Column(UUID, ForeignKey("products.id", ondelete="CASCADE"))
+    product_id = Column(UUID, ForeignKey("products.id", ondelete="CASCADE"), index=True)
     variant_id = Column(UUID, ForeignKey("product_variants.id", ondelete="CASCADE"))
 
+    # original as uploaded
     image_url = Column(Text, nullable=False)
+    # WebP renditions (longest edge 160 / 480 / 1600 px); lists use small
+    thumb_url = Column(Text)
+    small_url = Column(Text)
+    large_url = Column(Text)
+
+    # sha256 of the original: identical uploads reuse stored objects
+    content_hash = Column(Text, index=True)
+    content_type = Column(Text)
+    byte_size = Column(Integer)
+    width = Column(Integer)
+    height = Column(Integer)
+
     is_primary = Column(Boolean, server_default="false")
     created_at = Column(TIMESTAMP, server_default=func.now())
 
-    variant = relationship("ProductVariant", back_populates="images")
-
 
 # ================= INVENTORY =================
 class GlobalInventory(Base):
@@ -120,7 +140,7 @@ class OrderStatusHistory(Base):
     __tablename__ = "order_status_history"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    order_id = Column(UUID, ForeignKey("orders.id", ondelete="CASCADE"))
+    order_id = Column(UUID, ForeignKey("orders.id", ondelete="CASCADE"), index=True)
     status = Column(order_status_enum, nullable=False)
     created_at = Column(TIMESTAMP, server_default=func.now()) 
 
@@ -158,6 +178,9 @@ class Store(Base):
     location = Column(Geography("POINT", srid=4326))
     is_active = Column(Boolean, server_default="true")
 
+    # IANA name; "today" on the store dashboard is this zone's date
+    timezone = Column(Text, nullable=False, server_default="Asia/Kolkata")
+
     created_at = Column(TIMESTAMP, server_default=func.now())
 
     working_hours = relationship("StoreWorkingHour", back_populates="store")
@@ -186,6 +209,10 @@ class Cart(Base):
     user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), unique=True)
     updated_at = Column(TIMESTAMP, server_default=func.now())
 
+    # hot cart (Redis) version of the last write-behind flush;
+    # older snapshots never overwrite newer ones
+    version = Column(BigInteger, nullable=False, server_default="0")
+
 
 class CartItem(Base):
     __tablename__ = "cart_items"
@@ -214,6 +241,7 @@ class Order(Base):
     store_id = Column(UUID, ForeignKey("stores.id"))
 
     fulfillment_type = Column(fulfillment_type_enum, server_default="delivery")
+    status = Column(order_status_enum, server_default="pending")
 
     subtotal = Column(Numeric)
     discount_total = Column(Numeric, server_default="0")
@@ -223,6 +251,7 @@ class Order(Base):
     updated_at = Column(TIMESTAMP)
 
     items = relationship("OrderItem", cascade="all, delete")
+    status_history = relationship("OrderStatusHistory", back_populates="order")
 
 
 class OrderItem(Base):
@@ -235,6 +264,10 @@ class OrderItem(Base):
     quantity = Column(Integer, nullable=False)
     price = Column(Numeric, nullable=False)
 
+    # where the stock came from: global inventory or a store (pickup)
+    fulfillment_source = Column(fulfillment_source_enum, server_default="global")
+    fulfillment_ref_id = Column(UUID)
+
 
 
 # ================= PAYMENTS =================
@@ -243,7 +276,7 @@ class Payment(Base):
     __tablename__ = "payments"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    order_id = Column(UUID, ForeignKey("orders.id"))
+    order_id = Column(UUID, ForeignKey("orders.id"), index=True)
 
     provider = Column(Text)
     amount = Column(Numeric)
@@ -267,7 +300,7 @@ class Delivery(Base):
     __tablename__ = "deliveries"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    order_id = Column(UUID, ForeignKey("orders.id"))
+    order_id = Column(UUID, ForeignKey("orders.id"), index=True)
     user_id = Column(UUID, ForeignKey("users.id"))
     address_id = Column(UUID, ForeignKey("addresses.id"))
 
@@ -284,7 +317,7 @@ class Pickup(Base):
     __tablename__ = "pickups"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    order_id = Column(UUID, ForeignKey("orders.id"))
+    order_id = Column(UUID, ForeignKey("orders.id"), index=True)
     store_id = Column(UUID, ForeignKey("stores.id"))
     user_id = Column(UUID, ForeignKey("users.id"))
 
@@ -297,6 +330,11 @@ class Pickup(Base):
 
     order = relationship("Order")
 
+    __table_args__ = (
+        # store pickup lists / dashboards: range on created_at per store
+        Index("ix_pickups_store_created", "store_id", "created_at"),
+    )
+
 # ================= OFFERS =================
 
 class Offer(Base):
@@ -332,7 +370,7 @@ class Complaint(Base):
 
     id = Column(UUID, primary_key=True, default=uuid4)
     user_id = Column(UUID, ForeignKey("users.id"))
-    order_id = Column(UUID, ForeignKey("orders.id"))
+    order_id = Column(UUID, ForeignKey("orders.id"), index=True)
 
     description = Column(Text)
     status = Column(complaint_status_enum, server_default="open")
@@ -344,7 +382,7 @@ class Refund(Base):
     __tablename__ = "refunds"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    order_id = Column(UUID, ForeignKey("orders.id"))
+    order_id = Column(UUID, ForeignKey("orders.id"), index=True)
 
     reason = Column(Text)
     status = Column(refund_status_enum, server_default="initiated")
@@ -420,6 +458,13 @@ class ChatContext(Base):
     confidence = Column(Numeric)
     created_at = Column(TIMESTAMP, server_default=func.now())
 
+    # created_at of the last message folded into `summary`;
+    # a resumed session only summarizes messages after it
+    summarized_until = Column(TIMESTAMP)
+
+    # the summary's row in embeddings (source_type "chat_summary")
+    embedding_id = Column(UUID, ForeignKey("embeddings.id", ondelete="SET NULL"))
+
     chat_session = relationship("ChatSession", back_populates="contexts")
 
 
@@ -429,7 +474,7 @@ class Embedding(Base):
     __tablename__ = "embeddings"
 
     id = Column(UUID, primary_key=True, default=uuid4)
-    Column(embedding_source_enum, nullable=False)
+    source_type = Column(embedding_source_enum, nullable=False)
     source_id = Column(UUID)
 
     embedding = Column(Vector(768))
@@ -461,12 +506,19 @@ class AgentAction(Base):
 
     id = Column(UUID, primary_key=True, default=uuid4)
     conversation_id = Column(UUID, ForeignKey("conversations.id"))
+    # order the action was about (was only inside payload->>'order_id');
+    # backfill: python -m scripts.backfill_agent_action_order_id
+    order_id = Column(UUID, ForeignKey("orders.id", ondelete="SET NULL"))
     action_type = Column(Text)
     payload = Column(JSONB)
     status = Column(agent_action_status_enum, server_default="executed")
     confidence = Column(Numeric)
     created_at = Column(TIMESTAMP, server_default=func.now())
 
+    __table_args__ = (
+        Index("ix_agent_actions_order_created", "order_id", "created_at"),
+    )
+
 
 class Lead(Base):
     __tablename__ = "leads"
@@ -509,3 +561,107 @@ class InventoryMovement(Base):
     reference_id = Column(UUID)
 
     created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# ================= BACKGROUND JOBS =================
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID, primary_key=True, default=uuid4)
+    job_type = Column(Text, nullable=False)
+    payload = Column(JSONB, server_default=text("'{}'::jsonb"))
+
+    # lower runs first
+    priority = Column(Integer, nullable=False, server_default="5")
+    status = Column(Text, nullable=False, server_default="queued")
+
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False, server_default="5")
+    run_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
+    dedupe_key = Column(Text)
+    locked_at = Column(TIMESTAMP)
+    last_error = Column(Text)
+
+    created_at = Column(TIMESTAMP, server_default=func.now())
+    finished_at = Column(TIMESTAMP)
+
+    __table_args__ = (
+        # at most one *pending* job per key; a running one may be re-queued
+        Index(
+            "one_queued_job_per_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=(status == "queued"),
+        ),
+        Index("ix_jobs_claim", "job_type", "status", "priority", "run_at"),
+    )
+
+
+# ================= KPI ROLLUPS =================
+# Maintained in the same transaction as the order / stock write
+# (app/services/kpi_service.py); reconciled nightly from source tables.
+
+class _OrderKpiColumns:
+    orders_count = Column(Integer, nullable=False, server_default="0")
+    gross_revenue = Column(Numeric, nullable=False, server_default="0")
+
+    paid_orders = Column(Integer, nullable=False, server_default="0")
+    paid_revenue = Column(Numeric, nullable=False, server_default="0")
+
+    cancelled_orders = Column(Integer, nullable=False, server_default="0")
+    cancelled_revenue = Column(Numeric, nullable=False, server_default="0")
+
+    refunded_orders = Column(Integer, nullable=False, server_default="0")
+    refunded_revenue = Column(Numeric, nullable=False, server_default="0")
+
+    updated_at = Column(TIMESTAMP, server_default=func.now())
+
+
+class KpiGlobal(_OrderKpiColumns, Base):
+    __tablename__ = "kpi_global"
+
+    # single row: "all"
+    scope = Column(Text, primary_key=True, server_default="all")
+
+
+class KpiDaily(_OrderKpiColumns, Base):
+    __tablename__ = "kpi_daily"
+
+    # UTC date the order was placed
+    day = Column(Date, primary_key=True)
+
+
+class KpiStore(_OrderKpiColumns, Base):
+    __tablename__ = "kpi_store"
+
+    store_id = Column(UUID, ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True)
+
+
+class InventoryRollup(Base):
+    __tablename__ = "inventory_rollup"
+
+    scope = Column(Text, primary_key=True, server_default="all")
+
+    total_items = Column(Integer, nullable=False, server_default="0")
+    total_value = Column(Numeric, nullable=False, server_default="0")
+    low_stock_products = Column(Integer, nullable=False, server_default="0")
+
+    updated_at = Column(TIMESTAMP, server_default=func.now())
+
+
+class StorePickupDaily(Base):
+    __tablename__ = "store_pickup_daily"
+
+    store_id = Column(UUID, ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True)
+    # store-local date the pickup was created
+    day = Column(Date, primary_key=True)
+
+    total_pickups = Column(Integer, nullable=False, server_default="0")
+    pending = Column(Integer, nullable=False, server_default="0")
+    completed = Column(Integer, nullable=False, server_default="0")
+    cancelled = Column(Integer, nullable=False, server_default="0")
+    revenue = Column(Numeric, nullable=False, server_default="0")
+
+    updated_at = Column(TIMESTAMP, server_default=func.now())
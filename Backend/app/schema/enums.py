@@ -103,3 +103,20 @@ class UserEventType(str,Enum):
 
     complaint_created = "complaint_created"
     chat_message = "chat_message"
+
+
+class JobType(str, Enum):
+    embed_product = "embed_product"
+    # bulk catalog import: {"product_ids": [...]}
+    embed_products = "embed_products"
+    summarize_session = "summarize_session"
+    rebuild_user_embedding = "rebuild_user_embedding"
+    rebuild_user_profile = "rebuild_user_profile"
+    reconcile_kpis = "reconcile_kpis"
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
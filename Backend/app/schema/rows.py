@@ -0,0 +1,58 @@
+# app/schema/rows.py
+#
+# Read-only list rows for the large admin/catalog lists.
+#
+# Built straight from Core select tuples (`Row(*r)`, field order ==
+# column order) and serialized by ORJSONResponse, so a 10k-row list
+# skips ORM hydration, the identity map and Pydantic validation.
+# Each mirrors the Pydantic model that stays the route's
+# response_model (OpenAPI), field for field.
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+
+@dataclass(slots=True)
+class ProductListRow:
+    # ProductOut
+    id: UUID
+    name: str
+    category: str | None
+    description: str | None
+    image_url: str | None
+    variants: tuple = ()
+
+
+@dataclass(slots=True)
+class CatalogStockRow:
+    product_id: UUID
+    name: str
+    price: float
+    total_stock: int
+    allocated_stock: int
+    reserved_stock: int
+    available_stock: int
+
+
+@dataclass(slots=True)
+class RefundAdminRow:
+    # RefundAdminOut
+    id: UUID
+    order_id: UUID
+    reason: str
+    status: str
+    amount: float
+    created_at: datetime
+
+
+@dataclass(slots=True)
+class DeliveryAdminRow:
+    # DeliveryAdminOut
+    id: UUID
+    order_id: UUID
+    user_id: UUID
+    address_id: UUID | None
+    status: str
+    eta: datetime | None
+    created_at: datetime
+    updated_at: datetime | None
@@ -102,6 +102,8 @@ class ProductOut(BaseModel):
     name: str
     category: Optional[str]
     description: Optional[str]
+    # card image: primary upload's small variant
+    image_url: Optional[str] = None
     variants: List[ProductVariantOut] = []
 
     class Config:
@@ -111,7 +113,7 @@ class ProductOut(BaseModel):
 # ================= CART =================
 
 class CartItemCreate(BaseModel):
-    variant_id: UUID
+    product_id: UUID
     quantity: int = Field(gt=0)
 
 
@@ -168,6 +170,36 @@ class OfferOut(OfferCreate):
         from_attributes = True
 
 
+class SimulatedOffer(BaseModel):
+    title: str
+
+    min_cart_value: float = 0
+    percentage_off: Optional[float] = None
+    amount_off: Optional[float] = None
+    max_discount: Optional[float] = None
+
+    priority: int = 0
+    stackable: bool = False
+
+    @model_validator(mode="after")
+    def validate_discount(self):
+        if not self.percentage_off and not self.amount_off:
+            raise ValueError("Either percentage_off or amount_off required")
+        return self
+
+
+class OfferSimulationRequest(BaseModel):
+    offers: List[SimulatedOffer] = Field(min_length=1)
+
+    # "orders" → orders table, "csv" → mock orders.csv
+    source: Literal["orders", "csv"] = "orders"
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+    # "stack" → apply_offers chain, "best" → single best offer (checkout)
+    mode: Literal["stack", "best"] = "stack"
+
+
 # ================= CHECKOUT / ORDERS =================
 class CheckoutOut(BaseModel):
     order_id: UUID
@@ -335,13 +367,13 @@ class GlobalStockUpdate(BaseModel):
 
 class InventoryUpdate(BaseModel):
     store_id: UUID
-    variant_id: UUID
+    product_id: UUID
     allocated_stock: int = Field(ge=0)
 
 
 class StoreInventoryItemOut(BaseModel):
-    variant_id: UUID
-    sku: str
+    product_id: UUID
+    name: str
     price: float
     allocated_stock: int
     in_hand_stock: int
@@ -440,7 +472,7 @@ class LeadOut(LeadCreate):
         from_attributes = True
 
 class StockAllocation(BaseModel):
-    variant_id: UUID
+    product_id: UUID
     quantity: int
 
 
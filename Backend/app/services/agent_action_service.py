@@ -1,8 +1,46 @@
 # app/services/agent_action_service.py
 from uuid import uuid4, UUID
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.models import AgentAction
-from app.models.enums import agent_action_status_enum
+from app.models.models import AgentAction, Conversation, Order
+from app.services.cache_service import invalidate_order_timeline
+
+
+def _as_uuid(value) -> UUID | None:
+    # order ids in payloads come from model tool args; never fail on one
+    try:
+        return UUID(str(value)) if value else None
+    except ValueError:
+        return None
+
+
+async def owned_order_id(
+    db: AsyncSession,
+    value,
+    *,
+    user_id: UUID | None = None,
+    conversation_id: UUID | None = None,
+) -> UUID | None:
+    """
+    `value` as an agent_actions.order_id: only if it parses, the order
+    exists and it belongs to the user (given directly or as the
+    conversation's owner). Anything else → None.
+    """
+    order_id = _as_uuid(value)
+    if not order_id:
+        return None
+
+    stmt = select(Order.id).where(Order.id == order_id)
+    if user_id:
+        stmt = stmt.where(Order.user_id == user_id)
+    elif conversation_id:
+        stmt = stmt.where(
+            Order.user_id
+            == select(Conversation.user_id)
+            .where(Conversation.id == conversation_id)
+            .scalar_subquery()
+        )
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
 async def log_agent_action(
@@ -12,10 +50,17 @@ async def log_agent_action(
     payload: dict,
     confidence: float | None = None,
     status: str = "executed",
+    order_id: UUID | None = None,
 ):
+    if not order_id and payload.get("order_id"):
+        order_id = await owned_order_id(
+            db, payload["order_id"], conversation_id=conversation_id
+        )
+
     action = AgentAction(
         id=uuid4(),
         conversation_id=conversation_id,
+        order_id=order_id,
         action_type=action_type,
         payload=payload,
         status=status,  # ✅ string enum value
@@ -23,4 +68,6 @@ async def log_agent_action(
     )
     db.add(action)
     await db.commit()
+
+    await invalidate_order_timeline(order_id)
     return action
@@ -1,5 +1,6 @@
 # app/services/cache_service.py
 from app.core.redis import redis_client
+from app.core.metrics import cache_hit
 import json
 
 
@@ -10,3 +11,37 @@ async def cache_order_status(order_id, status):
 async def get_cached_order_status(order_id):
     val = await redis_client.get(f"order:{order_id}:status")
     return val
+
+
+# =====================================================
+# ORDER TIMELINE (READ MODEL)
+# =====================================================
+
+ORDER_TIMELINE_TTL_SECONDS = 600
+
+
+async def cache_order_timeline(order_id, timeline: dict):
+    await redis_client.set(
+        f"order:{order_id}:timeline",
+        json.dumps(timeline, default=str),
+        ex=ORDER_TIMELINE_TTL_SECONDS,
+    )
+
+
+async def get_cached_order_timeline(order_id) -> dict | None:
+    val = await redis_client.get(f"order:{order_id}:timeline")
+    cache_hit("order_timeline", val is not None)
+    return json.loads(val) if val else None
+
+
+async def invalidate_order_timeline(order_id):
+    """
+    Call after any commit that touches the order or its children.
+    Never fails the write: the TTL bounds staleness if Redis is down.
+    """
+    if not order_id:
+        return
+    try:
+        await redis_client.delete(f"order:{order_id}:timeline")
+    except Exception as e:
+        print("Timeline invalidation failed:", e)
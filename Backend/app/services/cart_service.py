@@ -1,10 +1,11 @@
 # app/services/cart_service.py
+from collections import defaultdict
 from uuid import UUID, uuid4
 from typing import Dict
+from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete, text
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, text
 
 from app.models.models import (
     Cart,
@@ -18,16 +19,35 @@ from app.models.models import (
 )
 
 from app.schema.schemas import CheckoutCreate
-from app.models.enums import order_status_enum
 from app.schema.enums import (
     FulfillmentType,
     FulfillmentSource,
+    OrderStatus,
     PickupStatus,
     UserEventType,
 )
 
 from app.services.user_event_service import record_event
-from app.services.offer_service import list_active_offers, evaluate_offer
+from app.services.kpi_service import apply_order_kpis
+from app.services.store_dashboard_service import (
+    apply_pickup_rollup,
+    publish_store_dashboard,
+)
+from app.services.offer_service import (
+    list_active_offers,
+    evaluate_offer,
+    best_offer_discount,
+)
+from app.services.hot_cart_service import (
+    get_hot_cart,
+    hot_add,
+    hot_set_quantity,
+    hot_clear,
+    hot_consume,
+    hot_restore,
+    NO_ITEM,
+    CONFLICT,
+)
 from app.utils.api_error import not_found, bad_request
 
 
@@ -35,51 +55,14 @@ from app.utils.api_error import not_found, bad_request
 # CART CORE (PRODUCT BASED)
 # =====================================================
 
-async def get_or_create_cart(db: AsyncSession, user_id: UUID) -> Cart:
-    res = await db.execute(
-        select(Cart).where(Cart.user_id == user_id)
-    )
-    cart = res.scalar_one_or_none()
-
-    if not cart:
-        cart = Cart(id=uuid4(), user_id=user_id)
-        db.add(cart)
-        await db.commit()
-        await db.refresh(cart)
-
-    return cart
-
-
 async def get_cart_items(db: AsyncSession, user_id: UUID) -> Dict:
-    cart = await get_or_create_cart(db, user_id)
-
-    res = await db.execute(
-        select(CartItem)
-        .where(CartItem.cart_id == cart.id)
-        .options(selectinload(CartItem.product))
-    )
-    items = res.scalars().all()
-
-    total = 0.0
-    out_items = []
-
-    for item in items:
-        price = float(item.product.price)
-        line_total = price * item.quantity
-        total += line_total
-
-        out_items.append({
-            "product_id": item.product_id,
-            "name": item.product.name,
-            "price": price,
-            "quantity": item.quantity,
-            "line_total": line_total,
-        })
+    # one HGETALL; totals are precomputed by the hot cart
+    cart = await get_hot_cart(db, user_id)
 
     return {
-        "cart_id": cart.id,
-        "total": total,
-        "items": out_items,
+        "cart_id": cart["cart_id"],
+        "total": cart["subtotal"],
+        "items": cart["items"],
     }
 
 
@@ -93,25 +76,11 @@ async def add_item(
     if quantity <= 0:
         bad_request("Quantity must be positive")
 
-    cart = await get_or_create_cart(db, user_id)
-
-    item = await db.get(
-        CartItem,
-        {"cart_id": cart.id, "product_id": product_id},
-    )
-
-    if item:
-        item.quantity += quantity
-    else:
-        db.add(
-            CartItem(
-                cart_id=cart.id,
-                product_id=product_id,
-                quantity=quantity,
-            )
-        )
+    product = await db.get(Product, product_id)
+    if not product or not product.is_active:
+        not_found("Product")
 
-    cart.updated_at = func.now()
+    await hot_add(db, user_id=user_id, product=product, quantity=quantity)
 
     await record_event(
         db=db,
@@ -120,8 +89,6 @@ async def add_item(
         product_id=product_id,
     )
 
-    await db.commit()
-
 
 async def update_item(
     db: AsyncSession,
@@ -130,36 +97,23 @@ async def update_item(
     product_id: UUID,
     quantity: int,
 ):
-    cart = await get_or_create_cart(db, user_id)
-
-    item = await db.get(
-        CartItem,
-        {"cart_id": cart.id, "product_id": product_id},
+    result = await hot_set_quantity(
+        db, user_id=user_id, product_id=product_id, quantity=quantity
     )
-    if not item:
+    if result == NO_ITEM:
         not_found("Cart item")
 
     if quantity <= 0:
-        await db.delete(item)
         await record_event(
             db=db,
             user_id=user_id,
             event_type=UserEventType.remove_from_cart.value,
             product_id=product_id,
         )
-    else:
-        item.quantity = quantity
-
-    cart.updated_at = func.now()
-    await db.commit()
 
 
 async def clear_cart(db: AsyncSession, user_id: UUID):
-    cart = await get_or_create_cart(db, user_id)
-    await db.execute(
-        delete(CartItem).where(CartItem.cart_id == cart.id)
-    )
-    await db.commit()
+    await hot_clear(db, user_id)
 
 
 # =====================================================
@@ -171,17 +125,12 @@ async def list_stores_that_can_fulfill_cart(
     *,
     user_id: UUID,
 ) -> list[dict]:
-    res = await db.execute(
-        select(CartItem)
-        .join(Cart)
-        .where(Cart.user_id == user_id)
-    )
-    items = res.scalars().all()
+    items = (await get_hot_cart(db, user_id))["items"]
     if not items:
         bad_request("Cart is empty")
 
-    product_ids = [i.product_id for i in items]
-    qty_map = {i.product_id: i.quantity for i in items}
+    product_ids = [i["product_id"] for i in items]
+    qty_map = {i["product_id"]: i["quantity"] for i in items}
 
     res = await db.execute(
         text("""
@@ -205,18 +154,28 @@ async def list_stores_that_can_fulfill_cart(
         },
     )
 
-    stores = []
-    for row in res.fetchall():
-        inv_res = await db.execute(
-            select(StoreInventory)
-            .where(
-                StoreInventory.store_id == row.store_id,
-                StoreInventory.product_id.in_(product_ids),
-            )
+    candidates = res.fetchall()
+    if not candidates:
+        return []
+
+    # stock for every candidate store in one round trip
+    inv_res = await db.execute(
+        select(StoreInventory)
+        .where(
+            StoreInventory.store_id.in_([row.store_id for row in candidates]),
+            StoreInventory.product_id.in_(product_ids),
         )
-        inventories = inv_res.scalars().all()
+    )
+    inventories = defaultdict(list)
+    for inv in inv_res.scalars():
+        inventories[inv.store_id].append(inv)
 
-        if all(inv.in_hand_stock >= qty_map[inv.product_id] for inv in inventories):
+    stores = []
+    for row in candidates:
+        if all(
+            inv.in_hand_stock >= qty_map[inv.product_id]
+            for inv in inventories[row.store_id]
+        ):
             stores.append({
                 "store_id": row.store_id,
                 "name": row.name,
@@ -235,27 +194,19 @@ async def preview_cart_offers(
     *,
     user_id: UUID,
 ) -> Dict:
-    cart = await get_or_create_cart(db, user_id)
+    cart = await get_hot_cart(db, user_id)
 
-    res = await db.execute(
-        select(CartItem)
-        .where(CartItem.cart_id == cart.id)
-        .options(selectinload(CartItem.product))
-    )
-    items = res.scalars().all()
-
-    if not items:
+    if not cart["items"]:
         return {"subtotal": 0, "offers": [], "best_discount": 0}
 
-    subtotal = sum(
-        float(i.product.price) * i.quantity for i in items
-    )
+    subtotal = cart["subtotal"]
 
-    offers = await list_active_offers(db)
+    # in-memory engine, no query
+    offers = await list_active_offers()
     applied = []
 
     for offer in offers:
-        discount = evaluate_offer(offer, subtotal)
+        discount = evaluate_offer(offer, subtotal=subtotal)
         if discount > 0:
             applied.append({
                 "offer_id": offer.id,
@@ -283,20 +234,24 @@ async def checkout(
     user_id: UUID,
     payload: CheckoutCreate,
 ):
-    cart = await get_or_create_cart(db, user_id)
-
-    res = await db.execute(
-        select(CartItem)
-        .where(CartItem.cart_id == cart.id)
-        .options(selectinload(CartItem.product))
-    )
-    items = res.scalars().all()
+    # the hot cart is authoritative for contents; prices come from
+    # products so a stale cached price is never charged
+    cart = await get_hot_cart(db, user_id)
+    items = cart["items"]  # sorted by product_id (lock order)
 
     if not items:
         bad_request("Cart is empty")
 
-    items.sort(key=lambda x: x.product_id)
-    subtotal = sum(float(i.product.price) * i.quantity for i in items)
+    res = await db.execute(
+        select(Product.id, Product.price).where(
+            Product.id.in_([i["product_id"] for i in items])
+        )
+    )
+    prices = {row.id: float(row.price) for row in res}
+    if len(prices) != len(items):
+        bad_request("Cart contains unavailable products")
+
+    subtotal = sum(prices[i["product_id"]] * i["quantity"] for i in items)
 
     store_id: UUID | None = None
 
@@ -306,23 +261,24 @@ async def checkout(
 
         store_id = payload.store_id
 
-        for item in items:
-            inv = await db.get(
-                StoreInventory,
-                {
-                    "store_id": store_id,
-                    "product_id": item.product_id,
-                },
-                with_for_update=True,
+        res = await db.execute(
+            select(StoreInventory)
+            .where(
+                StoreInventory.store_id == store_id,
+                StoreInventory.product_id.in_(list(prices)),
             )
-            if not inv or inv.in_hand_stock < item.quantity:
+            .order_by(StoreInventory.product_id)
+            .with_for_update()
+        )
+        store_stock = {inv.product_id: inv for inv in res.scalars()}
+
+        for item in items:
+            inv = store_stock.get(item["product_id"])
+            if not inv or inv.in_hand_stock < item["quantity"]:
                 bad_request("Selected store cannot fulfill cart")
 
-    offers = await list_active_offers(db)
-    discount_total = max(
-        (evaluate_offer(o, subtotal=subtotal) for o in offers),
-        default=0,
-    )
+    offers = await list_active_offers()
+    discount_total = float(best_offer_discount(offers, subtotal=subtotal))
 
     total = max(subtotal - discount_total, 0)
 
@@ -334,55 +290,53 @@ async def checkout(
         else None,
         fulfillment_type=payload.fulfillment_type.value,
         store_id=store_id,
-        status=order_status_enum.pending,
+        status=OrderStatus.pending.value,
         subtotal=subtotal,
         discount_total=discount_total,
         total=total,
+        # explicit so the KPI day matches the row
+        created_at=datetime.utcnow(),
     )
     db.add(order)
     await db.flush()
 
+    # one transaction: nothing below commits until the order is complete
     await record_event(
         db=db,
         user_id=user_id,
         event_type=UserEventType.checkout_started.value,
+        commit=False,
     )
 
     # ===== GLOBAL INVENTORY LOCK =====
-    for item in items:
-        gi = (
-            await db.execute(
-                select(GlobalInventory)
-                .where(GlobalInventory.product_id == item.product_id)
-                .with_for_update()
-            )
-        ).scalar_one_or_none()
+    # one statement for the whole cart, rows locked in product_id order
+    res = await db.execute(
+        select(GlobalInventory)
+        .where(GlobalInventory.product_id.in_(list(prices)))
+        .order_by(GlobalInventory.product_id)
+        .with_for_update()
+    )
+    global_stock = {gi.product_id: gi for gi in res.scalars()}
 
-        if not gi or gi.total_stock - gi.reserved_stock < item.quantity:
+    for item in items:
+        gi = global_stock.get(item["product_id"])
+        if not gi or gi.total_stock - gi.reserved_stock < item["quantity"]:
             bad_request("Out of stock")
 
     for item in items:
-        gi = await db.get(GlobalInventory, item.product_id)
-        gi.reserved_stock += item.quantity
+        global_stock[item["product_id"]].reserved_stock += item["quantity"]
 
         if payload.fulfillment_type == FulfillmentType.pickup:
-            inv = await db.get(
-                StoreInventory,
-                {
-                    "store_id": store_id,
-                    "product_id": item.product_id,
-                },
-            )
-            inv.in_hand_stock -= item.quantity
+            store_stock[item["product_id"]].in_hand_stock -= item["quantity"]
 
     for item in items:
         db.add(
             OrderItem(
                 id=uuid4(),
                 order_id=order.id,
-                product_id=item.product_id,
-                quantity=item.quantity,
-                price=float(item.product.price),
+                product_id=item["product_id"],
+                quantity=item["quantity"],
+                price=prices[item["product_id"]],
                 fulfillment_source=(
                     FulfillmentSource.store.value
                     if payload.fulfillment_type == FulfillmentType.pickup
@@ -391,25 +345,32 @@ async def checkout(
                 fulfillment_ref_id=(
                     store_id
                     if payload.fulfillment_type == FulfillmentType.pickup
-                    else item.product_id
+                    else item["product_id"]
                 ),
             )
         )
 
+    dashboard = None
     if payload.fulfillment_type == FulfillmentType.pickup:
-        db.add(
-            Pickup(
-                id=uuid4(),
-                order_id=order.id,
-                store_id=store_id,
-                user_id=user_id,
-                amount=total,
-                status=PickupStatus.ready.value,
-            )
+        pickup = Pickup(
+            id=uuid4(),
+            order_id=order.id,
+            store_id=store_id,
+            user_id=user_id,
+            amount=total,
+            status=PickupStatus.ready.value,
+            created_at=order.created_at,
+        )
+        db.add(pickup)
+        dashboard = await apply_pickup_rollup(
+            db, pickup=pickup, old_status=None, new_status=PickupStatus.ready
         )
 
+    # persisted copy too; the hot cart is consumed just before commit
     await db.execute(
-        delete(CartItem).where(CartItem.cart_id == cart.id)
+        delete(CartItem).where(
+            CartItem.cart_id.in_(select(Cart.id).where(Cart.user_id == user_id))
+        )
     )
 
     await record_event(
@@ -417,9 +378,31 @@ async def checkout(
         user_id=user_id,
         event_type=UserEventType.order_created.value,
         order_id=order.id,
+        commit=False,
     )
 
-    await db.commit()
+    await apply_order_kpis(db, order=order, orders=1)
+
+    # one cart version backs at most one order: a concurrent checkout, or
+    # an edit since the cart was read, fails here and nothing commits
+    consumed = await hot_consume(
+        user_id=user_id, version=cart["version"], order_id=order.id
+    )
+    if consumed == CONFLICT:
+        await db.rollback()
+        bad_request("Cart changed during checkout, please try again")
+
+    try:
+        await db.commit()
+    except Exception:
+        # no order → give the user their cart back
+        await hot_restore(
+            user_id=user_id, cart=cart, order_id=order.id, version=consumed
+        )
+        raise
+
+    if dashboard:
+        await publish_store_dashboard(dashboard)
 
     return {
         "order_id": order.id,
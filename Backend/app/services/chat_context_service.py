@@ -1,33 +1,164 @@
 # app/services/chat_context_service.py
+#
+# Session summaries (map-reduce):
+#   transcript → chunks → chunk summaries (bounded concurrency)
+#   → one reduced summary → ChatContext + a single embedding
+import asyncio
 from uuid import UUID, uuid4
+
+from sqlalchemy import select, desc, delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.models.models import ChatContext, Embedding
+
+from app.llm.llm import summarize_text
+from app.models.models import ChatContext, Embedding, Message
 from app.services.embedding_service import generate_text_embedding as embed_text
 
+CHUNK_CHARS = 6000
+MAX_MESSAGE_CHARS = 1500
+SUMMARY_CONCURRENCY = 4
+
+MAP_PROMPT = (
+    "Summarize this part of a customer support chat. Keep order ids, "
+    "product names, amounts, decisions and unresolved issues. "
+    "Drop pleasantries. Max 120 words.\n\n"
+)
+
+REDUCE_PROMPT = (
+    "Merge these partial summaries of one customer support chat, oldest "
+    "first, into a single summary. Later facts override earlier ones. "
+    "Keep order ids, product names, amounts, decisions and unresolved "
+    "issues. Max 200 words.\n\n"
+)
+
+
+# =====================================================
+# MAP-REDUCE
+# =====================================================
+
+def chunk_lines(lines: list[str], max_chars: int = CHUNK_CHARS) -> list[str]:
+    """
+    Packs whole lines into chunks of at most ~max_chars.
+    """
+    chunks, current, size = [], [], 0
+    for line in lines:
+        if current and size + len(line) > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+async def _summarize_all(prompt: str, parts: list[str]) -> list[str]:
+    sem = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    async def one(part: str) -> str:
+        async with sem:
+            return await summarize_text(prompt + part)
+
+    return list(await asyncio.gather(*(one(p) for p in parts)))
+
+
+async def map_reduce_summary(lines: list[str], previous: str | None = None) -> str:
+    """
+    `previous` is an existing summary of earlier messages; it is
+    reduced together with the new chunks (incremental update).
+    """
+    chunks = chunk_lines(lines)
+    partials = await _summarize_all(MAP_PROMPT, chunks) if chunks else []
+    partials = [p for p in partials if p]
+    if previous:
+        partials.insert(0, previous)
+
+    if not partials:
+        return ""
+
+    # reduce in rounds until one summary is left
+    while len(partials) > 1:
+        numbered = [f"[{i + 1}] {p}" for i, p in enumerate(partials)]
+        groups = chunk_lines(numbered)
+        partials = [p for p in await _summarize_all(REDUCE_PROMPT, groups) if p]
+        if len(groups) == 1:
+            break
+
+    return partials[0] if partials else ""
+
+
+# =====================================================
+# SESSION SUMMARY
+# =====================================================
 
 async def summarize_chat_session(
     db: AsyncSession,
     *,
     chat_session_id: UUID,
-    summary: str,
-    token_count: int,
-    confidence: float,
-):
-    ctx = ChatContext(
-        id=uuid4(),
-        chat_session_id=chat_session_id,
-        summary=summary,
-        token_count=token_count,
-        confidence=confidence,
+) -> ChatContext | None:
+    """
+    Creates or updates the session's ChatContext from the messages not
+    yet folded into it, then embeds the summary once and links it
+    (ChatContext.embedding_id). No commit: the caller commits it with
+    whatever depends on it. Returns None if there was nothing to
+    summarize.
+    """
+    res = await db.execute(
+        select(ChatContext)
+        .where(ChatContext.chat_session_id == chat_session_id)
+        .order_by(desc(ChatContext.created_at))
+        .limit(1)
+    )
+    ctx = res.scalar_one_or_none()
+
+    query = (
+        select(Message.role, Message.content, Message.created_at)
+        .where(Message.chat_session_id == chat_session_id)
+        .order_by(Message.created_at.asc())
     )
-    db.add(ctx)
+    if ctx and ctx.summarized_until:
+        query = query.where(Message.created_at > ctx.summarized_until)
 
-    emb = Embedding(
+    messages = (await db.execute(query)).all()
+    if not messages:
+        return None
+
+    lines = [
+        f"{m.role}: {(m.content or '')[:MAX_MESSAGE_CHARS]}"
+        for m in messages
+        if m.content
+    ]
+
+    summary = await map_reduce_summary(lines, previous=ctx.summary if ctx else None)
+    if not summary:
+        return None
+
+    if not ctx:
+        ctx = ChatContext(id=uuid4(), chat_session_id=chat_session_id)
+        db.add(ctx)
+
+    ctx.summary = summary
+    ctx.token_count = len(summary.split())
+    ctx.confidence = 1.0
+    ctx.summarized_until = messages[-1].created_at
+
+    # one embedding per ChatContext: replace, don't accumulate
+    vector = await embed_text(summary)
+    await db.execute(
+        delete(Embedding).where(
+            Embedding.source_type == "chat_summary",
+            Embedding.source_id == ctx.id,
+        )
+    )
+    embedding = Embedding(
         id=uuid4(),
         source_type="chat_summary",
         source_id=ctx.id,
-        embedding=await embed_text(summary),
+        embedding=vector,
     )
-    db.add(emb)
+    db.add(embedding)
+    await db.flush()
+
+    # link the context to its (current) embedding
+    ctx.embedding_id = embedding.id
 
-    await db.commit()
+    return ctx
@@ -11,6 +11,7 @@ from app.models.enums import (
 )
 from app.schema.enums import ComplaintStatus
 from app.utils.api_error import not_found, bad_request
+from app.services.cache_service import invalidate_order_timeline
 
 
 # ---------- FSM ----------
@@ -40,6 +41,8 @@ async def create(
     db.add(complaint)
     await db.commit()
     await db.refresh(complaint)
+
+    await invalidate_order_timeline(order_id)
     return complaint
 
 
@@ -83,6 +86,7 @@ async def update_complaint_status(
         AgentAction(
             id=uuid4(),
             conversation_id=conversation_id,
+            order_id=c.order_id,
             action_type="update_complaint_status",
             payload={
                 "complaint_id": str(complaint_id),
@@ -97,6 +101,8 @@ async def update_complaint_status(
 
     await db.commit()
     await db.refresh(c)
+
+    await invalidate_order_timeline(c.order_id)
     return c
 
 
@@ -2,14 +2,15 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 from uuid import UUID, uuid4
 from datetime import datetime
 
 from app.models.models import Delivery, Order, OrderItem
+from app.schema.rows import DeliveryAdminRow
 from app.schema.enums import DeliveryStatus, OrderStatus
 from app.utils.api_error import not_found, bad_request
 from app.services.agent_action_service import log_agent_action
+from app.services.kpi_service import apply_order_kpis
 
 
 DELIVERY_TRANSITIONS = {
@@ -93,6 +94,12 @@ async def update_delivery(
 
     if new_status in ORDER_SYNC:
         order = await db.get(Order, delivery.order_id)
+        # counts like an order cancel, once
+        if (
+            new_status == DeliveryStatus.cancelled
+            and order.status != OrderStatus.cancelled.value
+        ):
+            await apply_order_kpis(db, order=order, cancelled=1)
         order.status = ORDER_SYNC[new_status].value
 
     await db.commit()
@@ -108,6 +115,7 @@ async def update_delivery(
             "to": new_status.value,
         },
         confidence=0.9,
+        order_id=delivery.order_id,
     )
 
     return delivery
@@ -131,10 +139,18 @@ async def get_delivery_for_order(
     return delivery
 
 
-async def list_deliveries_admin(db: AsyncSession):
+async def list_deliveries_admin(db: AsyncSession) -> list[DeliveryAdminRow]:
     res = await db.execute(
-        select(Delivery)
-        .options(selectinload(Delivery.order))
+        select(
+            Delivery.id,
+            Delivery.order_id,
+            Delivery.user_id,
+            Delivery.address_id,
+            Delivery.status,
+            Delivery.eta,
+            Delivery.created_at,
+            Delivery.updated_at,
+        )
         .order_by(Delivery.created_at.desc())
     )
-    return res.scalars().all()
+    return [DeliveryAdminRow(*r) for r in res]
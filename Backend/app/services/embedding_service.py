@@ -5,19 +5,13 @@ from typing import Optional, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from google import genai
 from google.genai import types
 from app.models.models import Embedding
-from app.core.config import settings
+from app.core.gemini import get_gemini_client
+from app.core.metrics import observe_llm
 from app.utils.api_error import internal_error
 
 
-# =====================================================
-# GEMINI CLIENT (NEW SDK)
-# =====================================================
-
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
-
 EMBEDDING_MODEL = "gemini-embedding-001"
 EMBEDDING_DIM = 768  # must match VECTOR(768)
 
@@ -37,11 +31,12 @@ async def generate_text_embedding(text: str) -> List[float]:
     - chat context
     """
     try:
-        result = client.models.embed_content(
-            model=EMBEDDING_MODEL,
-            contents=text,
-            config=types.EmbedContentConfig(output_dimensionality=768)
-        )
+        with observe_llm("embed_content", "embedding"):
+            result = await get_gemini_client().aio.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=text,
+                config=types.EmbedContentConfig(output_dimensionality=768)
+            )
 
         embedding = result.embeddings[0].values
 
@@ -56,6 +51,36 @@ async def generate_text_embedding(text: str) -> List[float]:
         internal_error(f"Gemini text embedding failed: {e}")
 
 
+async def generate_text_embeddings(texts: List[str]) -> List[List[float]]:
+    """
+    One request for many texts (bulk jobs). Keep batches at <= 100.
+    """
+    try:
+        with observe_llm("embed_content", "embedding"):
+            result = await get_gemini_client().aio.models.embed_content(
+                model=EMBEDDING_MODEL,
+                contents=texts,
+                config=types.EmbedContentConfig(output_dimensionality=768)
+            )
+
+        embeddings = [e.values for e in result.embeddings]
+
+        if len(embeddings) != len(texts):
+            internal_error(
+                f"Embedding count mismatch: {len(embeddings)} != {len(texts)}"
+            )
+        for embedding in embeddings:
+            if len(embedding) != EMBEDDING_DIM:
+                internal_error(
+                    f"Embedding dimension mismatch: {len(embedding)} != {EMBEDDING_DIM}"
+                )
+
+        return embeddings
+
+    except Exception as e:
+        internal_error(f"Gemini text embedding failed: {e}")
+
+
 async def generate_image_embedding(image_url: str) -> List[float]:
     """
     Gemini does not expose public image embeddings yet.
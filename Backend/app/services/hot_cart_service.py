@@ -0,0 +1,407 @@
+# app/services/hot_cart_service.py
+#
+# Hot cart: every active cart lives in one Redis hash, kept current by
+# Lua scripts so line totals / subtotal are always precomputed.
+#
+#   cart:{user_id} → cart_id, version, subtotal, count   (money in cents)
+#                    q:{pid} qty, p:{pid} price, n:{pid} name, l:{pid} line
+#                    order_id (set when checkout consumed the cart)
+#   carts:dirty    → set of user_ids changed since the last flush
+#
+# Reads are one HGETALL. Postgres (carts / cart_items) is written behind
+# in batches by the worker; `version` keeps an older snapshot from ever
+# overwriting a newer one.
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import cache_hit
+from app.core.redis import redis_client
+from app.models.models import Cart, CartItem, Product
+
+CART_TTL_SECONDS = 7 * 24 * 3600
+DIRTY_KEY = "carts:dirty"
+FLUSH_BATCH = 500
+ITEM_INSERT_CHUNK = 5000
+
+NOT_LOADED = -1
+NO_ITEM = -2
+CONFLICT = -3
+
+
+def cart_key(user_id) -> str:
+    return f"cart:{user_id}"
+
+
+def to_cents(price) -> int:
+    return int((Decimal(str(price or 0)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+# =====================================================
+# LUA (ATOMIC PER CART)
+# =====================================================
+
+# KEYS: cart, dirty   ARGV: pid, delta, price_cents, name, ttl, user_id
+_ADD = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local pid = ARGV[1]
+local delta = tonumber(ARGV[2])
+local qty = tonumber(redis.call('HGET', KEYS[1], 'q:' .. pid) or '0') + delta
+local old_line = tonumber(redis.call('HGET', KEYS[1], 'l:' .. pid) or '0')
+local line = qty * tonumber(ARGV[3])
+redis.call('HSET', KEYS[1], 'q:' .. pid, qty, 'p:' .. pid, ARGV[3], 'n:' .. pid, ARGV[4], 'l:' .. pid, line)
+redis.call('HINCRBY', KEYS[1], 'subtotal', line - old_line)
+redis.call('HINCRBY', KEYS[1], 'count', delta)
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[5])
+redis.call('SADD', KEYS[2], ARGV[6])
+return qty
+""")
+
+# KEYS: cart, dirty   ARGV: pid, qty (<= 0 removes), ttl, user_id
+_SET = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local pid = ARGV[1]
+local old_qty = redis.call('HGET', KEYS[1], 'q:' .. pid)
+if not old_qty then return -2 end
+old_qty = tonumber(old_qty)
+local old_line = tonumber(redis.call('HGET', KEYS[1], 'l:' .. pid))
+local qty = tonumber(ARGV[2])
+local line = 0
+if qty <= 0 then
+  qty = 0
+  redis.call('HDEL', KEYS[1], 'q:' .. pid, 'p:' .. pid, 'n:' .. pid, 'l:' .. pid)
+else
+  line = qty * tonumber(redis.call('HGET', KEYS[1], 'p:' .. pid))
+  redis.call('HSET', KEYS[1], 'q:' .. pid, qty, 'l:' .. pid, line)
+end
+redis.call('HINCRBY', KEYS[1], 'subtotal', line - old_line)
+redis.call('HINCRBY', KEYS[1], 'count', qty - old_qty)
+redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[4])
+return qty
+""")
+
+# KEYS: cart, dirty   ARGV: ttl, user_id
+_CLEAR = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+local cart_id = redis.call('HGET', KEYS[1], 'cart_id')
+local version = tonumber(redis.call('HGET', KEYS[1], 'version')) + 1
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'cart_id', cart_id, 'version', version, 'subtotal', 0, 'count', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('SADD', KEYS[2], ARGV[2])
+return version
+""")
+
+# Checkout: empties the cart for one order iff it is still at the
+# version the order was priced from. A consumed (or edited) version
+# can't be consumed again.
+# KEYS: cart, dirty   ARGV: version, order_id, ttl, user_id
+_CONSUME = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 0 then return -1 end
+if redis.call('HGET', KEYS[1], 'version') ~= ARGV[1] then return -3 end
+local cart_id = redis.call('HGET', KEYS[1], 'cart_id')
+local version = tonumber(ARGV[1]) + 1
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'cart_id', cart_id, 'version', version, 'subtotal', 0, 'count', 0, 'order_id', ARGV[2])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[4])
+return version
+""")
+
+# Undo _CONSUME when the order didn't commit; only if nothing touched
+# the cart since.
+# KEYS: cart, dirty   ARGV: version, order_id, ttl, user_id, then (pid, qty, price_cents, name)*
+_RESTORE = redis_client.register_script("""
+if redis.call('HGET', KEYS[1], 'order_id') ~= ARGV[2] then return 0 end
+if redis.call('HGET', KEYS[1], 'version') ~= ARGV[1] then return 0 end
+local cart_id = redis.call('HGET', KEYS[1], 'cart_id')
+local subtotal, count = 0, 0
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], 'cart_id', cart_id, 'version', tonumber(ARGV[1]) + 1)
+for i = 5, #ARGV, 4 do
+  local pid, qty, price = ARGV[i], tonumber(ARGV[i + 1]), tonumber(ARGV[i + 2])
+  local line = qty * price
+  redis.call('HSET', KEYS[1], 'q:' .. pid, qty, 'p:' .. pid, price, 'n:' .. pid, ARGV[i + 3], 'l:' .. pid, line)
+  subtotal = subtotal + line
+  count = count + qty
+end
+redis.call('HSET', KEYS[1], 'subtotal', subtotal, 'count', count)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('SADD', KEYS[2], ARGV[4])
+return 1
+""")
+
+# KEYS: cart   ARGV: ttl, cart_id, version, then (pid, qty, price_cents, name)*
+_LOAD = redis_client.register_script("""
+if redis.call('EXISTS', KEYS[1]) == 1 then return 0 end
+local subtotal, count = 0, 0
+redis.call('HSET', KEYS[1], 'cart_id', ARGV[2], 'version', ARGV[3])
+for i = 4, #ARGV, 4 do
+  local pid, qty, price = ARGV[i], tonumber(ARGV[i + 1]), tonumber(ARGV[i + 2])
+  local line = qty * price
+  redis.call('HSET', KEYS[1], 'q:' .. pid, qty, 'p:' .. pid, price, 'n:' .. pid, ARGV[i + 3], 'l:' .. pid, line)
+  subtotal = subtotal + line
+  count = count + qty
+end
+redis.call('HSET', KEYS[1], 'subtotal', subtotal, 'count', count)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+""")
+
+
+# =====================================================
+# LOAD-THROUGH
+# =====================================================
+
+async def _load_from_db(db: AsyncSession, user_id: UUID):
+    """
+    Cache miss: seed the hash from Postgres. No-op if another request
+    loaded it first.
+    """
+    res = await db.execute(
+        select(
+            Cart.id,
+            Cart.version,
+            CartItem.product_id,
+            CartItem.quantity,
+            Product.name,
+            Product.price,
+        )
+        .select_from(Cart)
+        .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+        .outerjoin(Product, Product.id == CartItem.product_id)
+        .where(Cart.user_id == user_id)
+    )
+    rows = res.all()
+
+    cart_id = rows[0].id if rows else uuid4()
+    version = rows[0].version if rows else 0
+
+    args = [CART_TTL_SECONDS, str(cart_id), version]
+    for r in rows:
+        if r.product_id:
+            args += [str(r.product_id), r.quantity, to_cents(r.price), r.name or ""]
+
+    await _LOAD(keys=[cart_key(user_id)], args=args)
+
+
+async def _run(db: AsyncSession, user_id: UUID, script, args: list) -> int:
+    keys = [cart_key(user_id), DIRTY_KEY]
+
+    result = await script(keys=keys, args=args)
+    cache_hit("hot_cart", result != NOT_LOADED)
+    if result == NOT_LOADED:
+        await _load_from_db(db, user_id)
+        result = await script(keys=keys, args=args)
+    return int(result)
+
+
+# =====================================================
+# READ (ONE REDIS CALL WHEN HOT)
+# =====================================================
+
+def _parse(raw: dict) -> dict:
+    items = []
+    for field, qty in raw.items():
+        if not field.startswith("q:"):
+            continue
+        pid = field[2:]
+        price = int(raw[f"p:{pid}"])
+        items.append(
+            {
+                "product_id": UUID(pid),
+                "name": raw.get(f"n:{pid}"),
+                "price": price / 100,
+                "quantity": int(qty),
+                "line_total": int(raw[f"l:{pid}"]) / 100,
+            }
+        )
+    items.sort(key=lambda i: i["product_id"])
+
+    return {
+        "cart_id": UUID(raw["cart_id"]),
+        "version": int(raw.get("version") or 0),
+        "subtotal": int(raw.get("subtotal") or 0) / 100,
+        "count": int(raw.get("count") or 0),
+        "items": items,
+    }
+
+
+async def get_hot_cart(db: AsyncSession, user_id: UUID) -> dict:
+    key = cart_key(user_id)
+
+    raw = await redis_client.hgetall(key)
+    cache_hit("hot_cart", bool(raw))
+    if not raw:
+        await _load_from_db(db, user_id)
+        raw = await redis_client.hgetall(key)
+
+    return _parse(raw)
+
+
+# =====================================================
+# WRITES (LUA, NO DB)
+# =====================================================
+
+async def hot_add(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    product: Product,
+    quantity: int,
+) -> int:
+    return await _run(
+        db,
+        user_id,
+        _ADD,
+        [
+            str(product.id),
+            quantity,
+            to_cents(product.price),
+            product.name or "",
+            CART_TTL_SECONDS,
+            str(user_id),
+        ],
+    )
+
+
+async def hot_set_quantity(
+    db: AsyncSession,
+    *,
+    user_id: UUID,
+    product_id: UUID,
+    quantity: int,
+) -> int:
+    """
+    Returns the new quantity, or NO_ITEM if the product is not in the cart.
+    """
+    return await _run(
+        db,
+        user_id,
+        _SET,
+        [str(product_id), quantity, CART_TTL_SECONDS, str(user_id)],
+    )
+
+
+async def hot_clear(db: AsyncSession, user_id: UUID):
+    await _run(db, user_id, _CLEAR, [CART_TTL_SECONDS, str(user_id)])
+
+
+# =====================================================
+# CHECKOUT (CONSUME BEFORE COMMIT)
+# =====================================================
+
+async def hot_consume(*, user_id: UUID, version: int, order_id: UUID) -> int:
+    """
+    Empties the cart for `order_id` if it is still at `version`.
+    Returns the new version, or CONFLICT (cart changed, already checked
+    out, or expired) — the caller must not commit the order then.
+    """
+    result = await _CONSUME(
+        keys=[cart_key(user_id), DIRTY_KEY],
+        args=[version, str(order_id), CART_TTL_SECONDS, str(user_id)],
+    )
+    return CONFLICT if result == NOT_LOADED else int(result)
+
+
+async def hot_restore(*, user_id: UUID, cart: dict, order_id: UUID, version: int) -> bool:
+    """
+    Puts `cart` (as read by get_hot_cart) back after hot_consume when
+    the order failed to commit. No-op if the cart moved on since.
+    """
+    args = [version, str(order_id), CART_TTL_SECONDS, str(user_id)]
+    for i in cart["items"]:
+        args += [str(i["product_id"]), i["quantity"], to_cents(i["price"]), i["name"] or ""]
+
+    return bool(await _RESTORE(keys=[cart_key(user_id), DIRTY_KEY], args=args))
+
+
+# =====================================================
+# WRITE-BEHIND FLUSH (WORKER)
+# =====================================================
+
+async def flush_dirty_carts(db: AsyncSession, *, batch: int = FLUSH_BATCH) -> int:
+    """
+    Persists up to `batch` changed carts in one transaction:
+    one upsert into carts, one delete + one insert into cart_items.
+    Returns the number of carts written.
+    """
+    user_ids = await redis_client.spop(DIRTY_KEY, batch)
+    if not user_ids:
+        return 0
+
+    pipe = redis_client.pipeline(transaction=False)
+    for uid in user_ids:
+        pipe.hgetall(cart_key(uid))
+    snapshots = await pipe.execute()
+
+    now = datetime.utcnow()
+    carts = {}
+    for uid, raw in zip(user_ids, snapshots):
+        if raw:  # expired → nothing left to persist
+            carts[UUID(uid)] = _parse(raw)
+
+    if not carts:
+        return 0
+
+    try:
+        stmt = insert(Cart).values(
+            [
+                {
+                    "id": c["cart_id"],
+                    "user_id": user_id,
+                    "version": c["version"],
+                    "updated_at": now,
+                }
+                for user_id, c in carts.items()
+            ]
+        )
+        res = await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id"],
+                set_={
+                    "version": stmt.excluded.version,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+                # only move forward
+                where=Cart.version < stmt.excluded.version,
+            ).returning(Cart.id, Cart.user_id)
+        )
+        written = {row.user_id: row.id for row in res}
+
+        if written:
+            await db.execute(
+                delete(CartItem).where(CartItem.cart_id.in_(written.values()))
+            )
+
+            rows = [
+                {
+                    "cart_id": cart_id,
+                    "product_id": item["product_id"],
+                    "quantity": item["quantity"],
+                }
+                for user_id, cart_id in written.items()
+                for item in carts[user_id]["items"]
+            ]
+            # asyncpg caps bind params at 32767 per statement
+            for i in range(0, len(rows), ITEM_INSERT_CHUNK):
+                await db.execute(
+                    insert(CartItem).values(rows[i:i + ITEM_INSERT_CHUNK])
+                )
+
+        await db.commit()
+
+    except Exception:
+        await db.rollback()
+        # try again next round
+        await redis_client.sadd(DIRTY_KEY, *user_ids)
+        raise
+
+    return len(written)
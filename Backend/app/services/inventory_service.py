@@ -26,8 +26,16 @@ async def release_inventory_for_order(
     if not order:
         not_found("Order")
 
+    res = await db.execute(
+        select(GlobalInventory)
+        .where(GlobalInventory.product_id.in_([i.product_id for i in order.items]))
+        .order_by(GlobalInventory.product_id)
+        .with_for_update()
+    )
+    global_stock = {gi.product_id: gi for gi in res.scalars()}
+
     for item in order.items:
-        gi = await db.get(GlobalInventory, item.product_id, with_for_update=True)
+        gi = global_stock[item.product_id]
         gi.reserved_stock = max(0, gi.reserved_stock - item.quantity)
 
         db.add(
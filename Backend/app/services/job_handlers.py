@@ -0,0 +1,86 @@
+# app/services/job_handlers.py
+#
+# One coroutine per JobType: (db, payload) -> None.
+# Raising marks the attempt failed; the worker retries with backoff.
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import ChatSession, User
+from app.schema.enums import JobType
+from app.services.chat_context_service import summarize_chat_session
+from app.services.job_service import enqueue_job, PRIORITY_LOW
+from app.services.kpi_service import reconcile_kpis
+from app.services.product_embedding_service import embed_product, embed_products
+from app.services.user_embedding_service import rebuild_user_embedding
+from app.services.user_event_service import recompute_user_preferences
+
+
+async def handle_embed_product(db: AsyncSession, payload: dict):
+    await embed_product(db, UUID(payload["product_id"]))
+
+
+async def handle_embed_products(db: AsyncSession, payload: dict):
+    await embed_products(db, [UUID(p) for p in payload["product_ids"]])
+
+
+async def handle_rebuild_user_embedding(db: AsyncSession, payload: dict):
+    await rebuild_user_embedding(db, UUID(payload["user_id"]))
+    await db.commit()
+
+
+async def handle_rebuild_user_profile(db: AsyncSession, payload: dict):
+    await recompute_user_preferences(db, UUID(payload["user_id"]))
+
+
+async def handle_summarize_session(db: AsyncSession, payload: dict):
+    chat_session_id = UUID(payload["chat_session_id"])
+
+    session = await db.get(ChatSession, chat_session_id)
+    if not session:
+        return
+
+    # incremental: only messages after the last summarized one
+    ctx = await summarize_chat_session(db, chat_session_id=chat_session_id)
+    if not ctx:
+        return
+
+    user = await db.get(User, session.user_id)
+    if user:
+        prefs = dict(user.preferences or {})
+        prefs.update(
+            {
+                "last_session_summary": ctx.summary,
+                "last_session_date": datetime.utcnow().isoformat(),
+            }
+        )
+        user.preferences = prefs
+
+    # the user vector reads chat summaries → rebuild after this one
+    # lands; same transaction as the summary, so neither commits alone
+    await enqueue_job(
+        db,
+        job_type=JobType.rebuild_user_embedding,
+        payload={"user_id": str(session.user_id)},
+        dedupe_key=f"{JobType.rebuild_user_embedding.value}:{session.user_id}",
+        priority=PRIORITY_LOW,
+        commit=False,
+    )
+    await db.commit()
+
+
+async def handle_reconcile_kpis(db: AsyncSession, payload: dict):
+    drift = await reconcile_kpis(db)
+    if drift:
+        print("KPI rollups corrected:", drift)
+
+
+HANDLERS = {
+    JobType.embed_product: handle_embed_product,
+    JobType.embed_products: handle_embed_products,
+    JobType.summarize_session: handle_summarize_session,
+    JobType.rebuild_user_embedding: handle_rebuild_user_embedding,
+    JobType.rebuild_user_profile: handle_rebuild_user_profile,
+    JobType.reconcile_kpis: handle_reconcile_kpis,
+}
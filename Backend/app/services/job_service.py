@@ -0,0 +1,180 @@
+# app/services/job_service.py
+#
+# Postgres-backed job queue. Handlers enqueue inside their own
+# transaction and return; app/worker.py claims with FOR UPDATE SKIP LOCKED.
+import random
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Job
+from app.schema.enums import JobStatus, JobType
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 1800
+
+# a running job whose worker died is handed out again after this
+LOCK_TIMEOUT_SECONDS = 600
+
+
+# =====================================================
+# ENQUEUE
+# =====================================================
+
+async def enqueue_job(
+    db: AsyncSession,
+    *,
+    job_type: JobType,
+    payload: dict,
+    dedupe_key: str | None = None,
+    priority: int = PRIORITY_NORMAL,
+    delay_seconds: int = 0,
+    max_attempts: int = 5,
+    commit: bool = True,
+):
+    """
+    Adds a job. With a dedupe_key, a second enqueue while one is still
+    queued is a no-op, so bursts (e.g. many events for one user)
+    collapse into a single run. commit=False joins the caller's
+    transaction: the job exists only if the caller's writes do.
+    """
+    await db.execute(
+        insert(Job)
+        .values(
+            id=uuid4(),
+            job_type=JobType(job_type).value,
+            payload=payload,
+            priority=priority,
+            status=JobStatus.queued.value,
+            max_attempts=max_attempts,
+            run_at=datetime.utcnow() + timedelta(seconds=delay_seconds),
+            dedupe_key=dedupe_key,
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Job.dedupe_key],
+            # inlined: a bound parameter can't be matched against the
+            # partial index predicate, and Postgres rejects the insert
+            index_where=Job.status == literal_column(f"'{JobStatus.queued.value}'"),
+        )
+    )
+
+    if commit:
+        await db.commit()
+
+
+# =====================================================
+# WORKER SIDE
+# =====================================================
+
+async def claim_jobs(
+    db: AsyncSession,
+    *,
+    job_type: JobType,
+    limit: int,
+) -> list:
+    """
+    Marks up to `limit` due jobs as running and returns them.
+    SKIP LOCKED lets any number of workers poll the same table.
+    """
+    now = datetime.utcnow()
+
+    due = (
+        select(Job.id)
+        .where(
+            Job.job_type == JobType(job_type).value,
+            Job.status == JobStatus.queued.value,
+            Job.run_at <= now,
+        )
+        .order_by(Job.priority, Job.run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    res = await db.execute(
+        update(Job)
+        .where(Job.id.in_(due))
+        .values(
+            status=JobStatus.running.value,
+            locked_at=now,
+            attempts=Job.attempts + 1,
+        )
+        .returning(Job.id, Job.job_type, Job.payload, Job.attempts, Job.max_attempts)
+    )
+    jobs = res.all()
+    await db.commit()
+    return jobs
+
+
+async def complete_job(db: AsyncSession, *, job_id: UUID):
+    await db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            status=JobStatus.done.value,
+            locked_at=None,
+            last_error=None,
+            finished_at=datetime.utcnow(),
+        )
+    )
+    await db.commit()
+
+
+def backoff_seconds(attempts: int) -> float:
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay + random.uniform(0, delay / 4)
+
+
+async def fail_job(
+    db: AsyncSession,
+    *,
+    job_id: UUID,
+    attempts: int,
+    max_attempts: int,
+    error: str,
+):
+    """
+    Re-queues with exponential backoff, or parks the job as failed
+    once it has used all its attempts.
+    """
+    now = datetime.utcnow()
+
+    if attempts >= max_attempts:
+        values = {"status": JobStatus.failed.value, "finished_at": now}
+    else:
+        values = {
+            "status": JobStatus.queued.value,
+            "run_at": now + timedelta(seconds=backoff_seconds(attempts)),
+        }
+
+    # a newer queued copy with the same dedupe_key may exist by now;
+    # drop our key so the partial unique index cannot reject the re-queue
+    await db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(locked_at=None, last_error=error[:2000], dedupe_key=None, **values)
+    )
+    await db.commit()
+
+
+async def release_stale_jobs(db: AsyncSession) -> int:
+    """
+    Jobs left 'running' by a crashed worker go back to the queue.
+    """
+    res = await db.execute(
+        update(Job)
+        .where(
+            Job.status == JobStatus.running.value,
+            Job.locked_at < datetime.utcnow() - timedelta(seconds=LOCK_TIMEOUT_SECONDS),
+        )
+        .values(status=JobStatus.queued.value, locked_at=None, dedupe_key=None)
+    )
+    await db.commit()
+    return res.rowcount
@@ -0,0 +1,294 @@
+# app/services/kpi_service.py
+#
+# Admin KPI rollups. Writers call the apply_* helpers inside their own
+# transaction (no commit here), so a rollup only moves if the order /
+# stock change commits. reconcile_kpis rebuilds everything from the
+# source tables and runs nightly as a job to correct any drift.
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from sqlalchemy import select, func, delete, distinct, case, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import (
+    KpiGlobal,
+    KpiDaily,
+    KpiStore,
+    InventoryRollup,
+    GlobalInventory,
+    Order,
+    Payment,
+    Product,
+    Refund,
+)
+from app.schema.enums import OrderStatus, PaymentStatus, RefundStatus
+from app.services.store_dashboard_service import reconcile_pickup_rollups
+
+LOW_STOCK_THRESHOLD = 10
+
+ORDER_KPI_FIELDS = (
+    "orders_count",
+    "gross_revenue",
+    "paid_orders",
+    "paid_revenue",
+    "cancelled_orders",
+    "cancelled_revenue",
+    "refunded_orders",
+    "refunded_revenue",
+)
+
+
+# =====================================================
+# INCREMENTAL (TRANSACTIONAL)
+# =====================================================
+
+async def _bump(db: AsyncSession, model, key: dict, deltas: dict):
+    table = model.__table__
+    now = datetime.utcnow()
+
+    stmt = insert(model).values(**key, **deltas, updated_at=now)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={
+                **{k: table.c[k] + stmt.excluded[k] for k in deltas},
+                "updated_at": now,
+            },
+        )
+    )
+
+
+async def apply_order_kpis(
+    db: AsyncSession,
+    *,
+    order: Order,
+    orders: int = 0,
+    paid: int = 0,
+    cancelled: int = 0,
+    refunded: int = 0,
+):
+    """
+    Counts are attributed to the day / store the order was placed in,
+    so reconciliation can group source rows the same way.
+    Pass -1 to undo a transition.
+    """
+    amount = Decimal(str(order.total or 0))
+
+    deltas = {
+        "orders_count": orders,
+        "gross_revenue": amount * orders,
+        "paid_orders": paid,
+        "paid_revenue": amount * paid,
+        "cancelled_orders": cancelled,
+        "cancelled_revenue": amount * cancelled,
+        "refunded_orders": refunded,
+        "refunded_revenue": amount * refunded,
+    }
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+
+    day = (order.created_at or datetime.utcnow()).date()
+
+    await _bump(db, KpiGlobal, {"scope": "all"}, deltas)
+    await _bump(db, KpiDaily, {"day": day}, deltas)
+    if order.store_id:
+        await _bump(db, KpiStore, {"store_id": order.store_id}, deltas)
+
+
+async def apply_inventory_kpis(
+    db: AsyncSession,
+    *,
+    old_stock: int,
+    new_stock: int,
+    old_price,
+    new_price,
+    new_product: bool = False,
+):
+    """
+    One product's stock and/or price changed (or it was just created
+    with old_stock == new_stock == 0 and new_product=True).
+    """
+    old_value = Decimal(str(old_price or 0)) * old_stock
+    new_value = Decimal(str(new_price or 0)) * new_stock
+
+    was_low = old_stock < LOW_STOCK_THRESHOLD and not new_product
+    is_low = new_stock < LOW_STOCK_THRESHOLD
+
+    deltas = {
+        "total_items": new_stock - old_stock,
+        "total_value": new_value - old_value,
+        "low_stock_products": int(is_low) - int(was_low),
+    }
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not deltas:
+        return
+
+    await _bump(db, InventoryRollup, {"scope": "all"}, deltas)
+
+
+# =====================================================
+# READS (O(1) ROWS)
+# =====================================================
+
+def _order_kpis(row) -> dict:
+    return {
+        k: (float(getattr(row, k) or 0) if "revenue" in k else int(getattr(row, k) or 0))
+        for k in ORDER_KPI_FIELDS
+    }
+
+
+async def get_kpi_summary(db: AsyncSession) -> dict:
+    row = await db.get(KpiGlobal, "all")
+    kpis = _order_kpis(row) if row else dict.fromkeys(ORDER_KPI_FIELDS, 0)
+    kpis["updated_at"] = row.updated_at if row else None
+    return kpis
+
+
+async def get_daily_kpis(db: AsyncSession, *, start: date, end: date) -> list[dict]:
+    res = await db.execute(
+        select(KpiDaily)
+        .where(KpiDaily.day >= start, KpiDaily.day <= end)
+        .order_by(KpiDaily.day)
+    )
+    return [{"day": r.day, **_order_kpis(r)} for r in res.scalars()]
+
+
+async def get_store_kpis(db: AsyncSession, *, store_id: UUID) -> dict:
+    row = await db.get(KpiStore, store_id)
+    kpis = _order_kpis(row) if row else dict.fromkeys(ORDER_KPI_FIELDS, 0)
+    return {"store_id": store_id, **kpis}
+
+
+async def get_inventory_kpis(db: AsyncSession) -> dict:
+    row = await db.get(InventoryRollup, "all")
+    return {
+        "total_value": float(row.total_value or 0) if row else 0.0,
+        "low_stock_products": row.low_stock_products if row else 0,
+        "total_items": row.total_items if row else 0,
+    }
+
+
+# =====================================================
+# NIGHTLY RECONCILIATION
+# =====================================================
+
+def _order_facts():
+    """
+    One row per order with 0/1 flags per KPI, computed from source tables.
+    """
+    paid = (
+        select(literal(1))
+        .where(
+            Payment.order_id == Order.id,
+            Payment.status == PaymentStatus.success.value,
+        )
+        .exists()
+    )
+    refunded = (
+        select(literal(1))
+        .where(
+            Refund.order_id == Order.id,
+            Refund.status == RefundStatus.completed.value,
+        )
+        .exists()
+    )
+
+    return select(
+        Order.id,
+        Order.store_id,
+        func.date(Order.created_at).label("day"),
+        func.coalesce(Order.total, 0).label("total"),
+        case((paid, 1), else_=0).label("paid"),
+        case((Order.status == OrderStatus.cancelled.value, 1), else_=0).label("cancelled"),
+        case((refunded, 1), else_=0).label("refunded"),
+    ).subquery()
+
+
+def _aggregates(facts):
+    return [
+        func.count(distinct(facts.c.id)).label("orders_count"),
+        func.coalesce(func.sum(facts.c.total), 0).label("gross_revenue"),
+        func.coalesce(func.sum(facts.c.paid), 0).label("paid_orders"),
+        func.coalesce(func.sum(facts.c.total * facts.c.paid), 0).label("paid_revenue"),
+        func.coalesce(func.sum(facts.c.cancelled), 0).label("cancelled_orders"),
+        func.coalesce(func.sum(facts.c.total * facts.c.cancelled), 0).label("cancelled_revenue"),
+        func.coalesce(func.sum(facts.c.refunded), 0).label("refunded_orders"),
+        func.coalesce(func.sum(facts.c.total * facts.c.refunded), 0).label("refunded_revenue"),
+    ]
+
+
+async def rebuild_inventory_rollup(db: AsyncSession):
+    """
+    Full recompute of the inventory row; no commit. For bulk writers
+    (catalog import) where per-product deltas would cost more.
+    """
+    await db.execute(delete(InventoryRollup))
+    await db.execute(
+        insert(InventoryRollup).from_select(
+            ["scope", "total_items", "total_value", "low_stock_products", "updated_at"],
+            select(
+                literal("all"),
+                func.coalesce(func.sum(GlobalInventory.total_stock), 0),
+                func.coalesce(func.sum(GlobalInventory.total_stock * Product.price), 0),
+                func.count().filter(GlobalInventory.total_stock < LOW_STOCK_THRESHOLD),
+                literal(datetime.utcnow()),
+            ).select_from(GlobalInventory)
+            .join(Product, Product.id == GlobalInventory.product_id),
+        )
+    )
+
+
+async def reconcile_kpis(db: AsyncSession) -> dict:
+    """
+    Rebuilds every rollup from source tables in one transaction.
+    The DELETEs lock every rollup row up front and the locks are held
+    until the single commit, so checkout, payment, cancel and stock
+    writers wait for the whole rebuild (hence the 02:00 schedule). That
+    wait is what keeps it exact: a writer's delta lands on the rebuilt
+    row after the commit instead of being overwritten by it.
+    Returns the global drift that was corrected.
+    """
+    before = await get_kpi_summary(db)
+    now = datetime.utcnow()
+    facts = _order_facts()
+
+    await db.execute(delete(KpiDaily))
+    await db.execute(delete(KpiStore))
+    await db.execute(delete(KpiGlobal))
+
+    await db.execute(
+        insert(KpiGlobal).from_select(
+            ["scope", *ORDER_KPI_FIELDS, "updated_at"],
+            select(literal("all"), *_aggregates(facts), literal(now)),
+        )
+    )
+    await db.execute(
+        insert(KpiDaily).from_select(
+            ["day", *ORDER_KPI_FIELDS, "updated_at"],
+            select(facts.c.day, *_aggregates(facts), literal(now))
+            .where(facts.c.day.is_not(None))
+            .group_by(facts.c.day),
+        )
+    )
+    await db.execute(
+        insert(KpiStore).from_select(
+            ["store_id", *ORDER_KPI_FIELDS, "updated_at"],
+            select(facts.c.store_id, *_aggregates(facts), literal(now))
+            .where(facts.c.store_id.is_not(None))
+            .group_by(facts.c.store_id),
+        )
+    )
+
+    # ---------------- inventory ----------------
+    await rebuild_inventory_rollup(db)
+
+    # ---------------- store pickup days ----------------
+    await reconcile_pickup_rollups(db)
+
+    await db.commit()
+
+    after = await get_kpi_summary(db)
+    return {k: after[k] - before[k] for k in ORDER_KPI_FIELDS if after[k] != before[k]}
@@ -0,0 +1,225 @@
+# app/services/offer_engine.py
+#
+# In-memory offer engine. Active + upcoming offers are loaded once,
+# compiled to Decimals and kept priority-sorted; a single loop timer
+# flips offers live / expired at starts_at / ends_at. Admin writes
+# publish on Redis and every process reloads, so the cart path never
+# touches the offers table.
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis import redis_client
+from app.models.models import Offer
+
+INVALIDATION_CHANNEL = "offers:invalidate"
+RESUBSCRIBE_BACKOFF_SECONDS = 5
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+
+
+def to_decimal(value) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value or 0))
+
+
+# =====================================================
+# COMPILED OFFER
+# =====================================================
+
+@dataclass(frozen=True, slots=True)
+class CompiledOffer:
+    id: UUID
+    title: str
+    description: str | None
+
+    min_cart_value: Decimal
+    percentage_off: Decimal | None
+    amount_off: Decimal | None
+    max_discount: Decimal | None
+
+    priority: int
+    stackable: bool
+
+    starts_at: datetime
+    ends_at: datetime
+    is_active: bool
+    created_at: datetime
+
+    # precomputed percentage_off / 100
+    rate: Decimal | None = None
+
+    @classmethod
+    def from_row(cls, o: Offer) -> "CompiledOffer":
+        pct = to_decimal(o.percentage_off) if o.percentage_off else None
+        return cls(
+            id=o.id,
+            title=o.title,
+            description=o.description,
+            min_cart_value=to_decimal(o.min_cart_value),
+            percentage_off=pct,
+            amount_off=to_decimal(o.amount_off) if o.amount_off else None,
+            max_discount=to_decimal(o.max_discount) if o.max_discount else None,
+            priority=o.priority or 0,
+            stackable=bool(o.stackable),
+            starts_at=o.starts_at,
+            ends_at=o.ends_at,
+            is_active=bool(o.is_active),
+            created_at=o.created_at or datetime.min,
+            rate=pct / 100 if pct else None,
+        )
+
+    def discount(self, subtotal: Decimal) -> Decimal:
+        """
+        Discount amount (NOT final price), rounded to cents.
+        """
+        if subtotal <= ZERO:
+            return ZERO
+        if self.min_cart_value and subtotal < self.min_cart_value:
+            return ZERO
+
+        if self.rate is not None:
+            amount = subtotal * self.rate
+        elif self.amount_off is not None:
+            amount = self.amount_off
+        else:
+            amount = ZERO
+
+        if self.max_discount is not None:
+            amount = min(amount, self.max_discount)
+
+        return min(amount, subtotal).quantize(CENT, rounding=ROUND_HALF_UP)
+
+    def live_at(self, now: datetime) -> bool:
+        return self.is_active and self.starts_at <= now <= self.ends_at
+
+
+# =====================================================
+# ENGINE
+# =====================================================
+
+class OfferEngine:
+    def __init__(self):
+        self._offers: list[CompiledOffer] = []   # active + upcoming, sorted
+        self._live: tuple[CompiledOffer, ...] = ()
+        self._timer: asyncio.TimerHandle | None = None
+        self._listener: asyncio.Task | None = None
+        self._loaded = asyncio.Event()
+        self._reload_lock = asyncio.Lock()
+
+    # ---------------- lifecycle ----------------
+
+    async def start(self):
+        await self.reload()
+        if not self._listener:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+    # ---------------- loading ----------------
+
+    async def reload(self):
+        """
+        Full reload of active + upcoming offers (one query). Runs at
+        startup and on invalidation, never on the request path.
+        """
+        async with self._reload_lock:
+            now = datetime.utcnow()
+            async with AsyncSessionLocal() as db:
+                res = await db.execute(
+                    select(Offer).where(
+                        Offer.is_active.is_(True),
+                        Offer.ends_at >= now,
+                    )
+                )
+                rows = res.scalars().all()
+
+            offers = [CompiledOffer.from_row(o) for o in rows]
+            # priority desc, newest first (same order as the old query)
+            offers.sort(key=lambda o: (-o.priority, -o.created_at.timestamp()))
+
+            self._offers = offers
+            self._reschedule()
+            self._loaded.set()
+
+    # ---------------- schedule ----------------
+
+    def _reschedule(self):
+        now = datetime.utcnow()
+
+        self._offers = [o for o in self._offers if o.ends_at >= now]
+        self._live = tuple(o for o in self._offers if o.live_at(now))
+
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        # next moment the live set changes: an offer starts or one expires
+        upcoming = [o.starts_at for o in self._offers if o.starts_at > now]
+        upcoming += [o.ends_at for o in self._live]
+        if not upcoming:
+            return
+
+        delay = max((min(upcoming) - now).total_seconds(), 0) + 0.001
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_at(loop.time() + delay, self._reschedule)
+
+    # ---------------- invalidation ----------------
+
+    async def _listen(self):
+        reconnect = False
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                if reconnect:
+                    # messages may have been missed while disconnected
+                    await self.reload()
+                reconnect = True
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Offer invalidation listener failed:", e)
+                reconnect = True
+                await asyncio.sleep(RESUBSCRIBE_BACKOFF_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    # ---------------- reads (no I/O once loaded) ----------------
+
+    async def live_offers(self) -> tuple[CompiledOffer, ...]:
+        if not self._loaded.is_set():
+            # no lifespan (scripts, tests): load on first use
+            await self.reload()
+        return self._live
+
+
+offer_engine = OfferEngine()
+
+
+async def publish_offer_change(offer_id: UUID | None = None):
+    """
+    Call after committing an offer write. Reloads this process right
+    away; others reload when the Redis message arrives.
+    """
+    await offer_engine.reload()
+    try:
+        await redis_client.publish(INVALIDATION_CHANNEL, str(offer_id or ""))
+    except Exception as e:
+        print("Offer invalidation publish failed:", e)
@@ -5,7 +5,15 @@ from sqlalchemy import select
 from uuid import UUID, uuid4
 from datetime import datetime, timezone
 
+from decimal import Decimal
+
 from app.models.models import Offer
+from app.services.offer_engine import (
+    CompiledOffer,
+    offer_engine,
+    publish_offer_change,
+    to_decimal,
+)
 from app.utils.api_error import not_found, bad_request
 
 
@@ -27,22 +35,12 @@ def to_utc_naive(dt: datetime) -> datetime:
 # PUBLIC
 # =====================================================
 
-async def list_active_offers(db: AsyncSession):
-    now = utcnow()
-
-    res = await db.execute(
-        select(Offer)
-        .where(
-            Offer.is_active.is_(True),
-            Offer.starts_at <= now,
-            Offer.ends_at >= now,
-        )
-        .order_by(
-            Offer.priority.desc(),
-            Offer.created_at.desc(),
-        )
-    )
-    return res.scalars().all()
+async def list_active_offers(db: AsyncSession | None = None):
+    """
+    Live offers from the in-memory engine, priority-sorted.
+    `db` is unused (kept for callers); no query is issued.
+    """
+    return await offer_engine.live_offers()
 
 
 # =====================================================
@@ -50,49 +48,32 @@ async def list_active_offers(db: AsyncSession):
 # =====================================================
 
 def evaluate_offer(
-    offer: Offer,
+    offer: CompiledOffer,
     *,
-    subtotal: float,
+    subtotal: float | Decimal,
 ) -> float:
     """
     Returns discount amount (NOT final price)
     """
-
-    if subtotal <= 0:
-        return 0.0
-
-    if offer.min_cart_value and subtotal < float(offer.min_cart_value):
-        return 0.0
-
-    discount = 0.0
-
-    if offer.percentage_off:
-        discount = subtotal * (float(offer.percentage_off) / 100)
-
-    elif offer.amount_off:
-        discount = float(offer.amount_off)
-
-    if offer.max_discount:
-        discount = min(discount, float(offer.max_discount))
-
-    return round(min(discount, subtotal), 2)
+    return float(offer.discount(to_decimal(subtotal)))
 
 
 def apply_offers(
     *,
-    offers: list[Offer],
-    subtotal: float,
+    offers: list[CompiledOffer],
+    subtotal: float | Decimal,
 ) -> dict:
     """
     Applies offers in priority order.
     Respects stackable flag.
     """
+    subtotal = to_decimal(subtotal)
 
     applied = []
-    discount_total = 0.0
+    discount_total = Decimal(0)
 
     for offer in offers:
-        discount = evaluate_offer(offer, subtotal=subtotal)
+        discount = offer.discount(subtotal)
 
         if discount <= 0:
             continue
@@ -101,7 +82,7 @@ def apply_offers(
             {
                 "offer_id": offer.id,
                 "title": offer.title,
-                "discount": discount,
+                "discount": float(discount),
             }
         )
 
@@ -110,24 +91,36 @@ def apply_offers(
         if not offer.stackable:
             break  # 🚫 HARD STOP
 
-    discount_total = round(min(discount_total, subtotal), 2)
+    discount_total = min(discount_total, subtotal)
 
     return {
-        "discount_total": discount_total,
+        "discount_total": float(discount_total),
         "applied_offers": applied,
     }
 
 
+def best_offer_discount(
+    offers: list[CompiledOffer],
+    *,
+    subtotal: float | Decimal,
+) -> Decimal:
+    """
+    Largest single-offer discount (what checkout charges).
+    """
+    subtotal = to_decimal(subtotal)
+    return max((o.discount(subtotal) for o in offers), default=Decimal(0))
+
+
 # =====================================================
 # PREVIEW (CART / CHAT / CHECKOUT)
 # =====================================================
 
 async def preview_offers(
-    db: AsyncSession,
+    db: AsyncSession | None = None,
     *,
     subtotal: float,
 ):
-    offers = await list_active_offers(db)
+    offers = await list_active_offers()
     return apply_offers(offers=offers, subtotal=subtotal)
 
 
@@ -166,6 +159,8 @@ async def create_offer(
     db.add(offer)
     await db.commit()
     await db.refresh(offer)
+
+    await publish_offer_change(offer.id)
     return offer
 
 
@@ -190,6 +185,8 @@ async def update_offer(
 
     await db.commit()
     await db.refresh(offer)
+
+    await publish_offer_change(offer.id)
     return offer
 
 
@@ -203,3 +200,5 @@ async def deactivate_offer(
 
     offer.is_active = False
     await db.commit()
+
+    await publish_offer_change(offer_id)
@@ -0,0 +1,218 @@
+# app/services/offer_simulator.py
+#
+# What-if cost of a proposed offer set over historical orders.
+#
+# Orders are loaded as (subtotal, count) pairs — grouped in SQL, so a
+# few million orders arrive as a few hundred thousand distinct values —
+# and every offer is evaluated as one NumPy expression over that array.
+# Semantics match CompiledOffer.discount / apply_offers (mode="stack")
+# and checkout's single best offer (mode="best").
+import asyncio
+import csv
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import select, func, cast, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Order
+from app.schema.enums import OrderStatus
+from app.schema.schemas import SimulatedOffer
+
+DEFAULT_CSV = (
+    Path(__file__).resolve().parents[3]
+    / "Resources"
+    / "dbms mockdata"
+    / "orders.csv"
+)
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# =====================================================
+# LOADERS → (subtotals, counts)
+# =====================================================
+
+async def load_order_subtotals(
+    db: AsyncSession,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pre-discount subtotal of every non-cancelled order, grouped by value.
+    """
+    subtotal = cast(func.coalesce(Order.subtotal, Order.total), Float)
+
+    stmt = (
+        select(subtotal, func.count())
+        .where(Order.status != OrderStatus.cancelled.value)
+        .group_by(subtotal)
+    )
+    if start:
+        stmt = stmt.where(Order.created_at >= start)
+    if end:
+        stmt = stmt.where(Order.created_at < end)
+
+    rows = (await db.execute(stmt)).all()
+
+    values = np.fromiter((r[0] or 0.0 for r in rows), dtype=np.float64, count=len(rows))
+    counts = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+    return values, counts
+
+
+def load_csv_subtotals(path: Path = DEFAULT_CSV) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mock data: orders.csv `total_amount` column.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        values = np.fromiter(
+            (float(r["total_amount"] or 0) for r in reader),
+            dtype=np.float64,
+        )
+    return np.unique(values, return_counts=True)
+
+
+# =====================================================
+# VECTORIZED EVALUATION
+# =====================================================
+
+def _round_cents(x: np.ndarray) -> np.ndarray:
+    # ROUND_HALF_UP, like CompiledOffer.discount (np.round is half-even)
+    return np.floor(x * 100 + 0.5) / 100
+
+
+def offer_discounts(offer: SimulatedOffer, subtotals: np.ndarray) -> np.ndarray:
+    """
+    CompiledOffer.discount over an array of subtotals.
+    """
+    eligible = subtotals > 0
+    if offer.min_cart_value:
+        eligible &= subtotals >= offer.min_cart_value
+
+    if offer.percentage_off:
+        amount = subtotals * (offer.percentage_off / 100)
+    elif offer.amount_off:
+        amount = np.full_like(subtotals, offer.amount_off)
+    else:
+        amount = np.zeros_like(subtotals)
+
+    # 0 / None = no cap, as in CompiledOffer.from_row
+    if offer.max_discount:
+        amount = np.minimum(amount, offer.max_discount)
+
+    amount = _round_cents(np.minimum(amount, subtotals))
+    return np.where(eligible, amount, 0.0)
+
+
+def _percentiles(values: np.ndarray, weights: np.ndarray) -> dict:
+    if not values.size:
+        return {f"p{q}": 0.0 for q in PERCENTILES} | {"max": 0.0}
+
+    points = np.percentile(values, PERCENTILES, weights=weights, method="inverted_cdf")
+    return {
+        **{f"p{q}": round(float(p), 2) for q, p in zip(PERCENTILES, points)},
+        "max": round(float(values.max()), 2),
+    }
+
+
+def simulate(
+    offers: list[SimulatedOffer],
+    subtotals: np.ndarray,
+    counts: np.ndarray,
+    *,
+    mode: str = "stack",
+) -> dict:
+    """
+    mode="stack": apply_offers — priority order, stack until the first
+    non-stackable offer that actually applies.
+    mode="best": checkout — the single largest discount.
+    """
+    started = time.perf_counter()
+
+    # stable: equal priorities keep request order
+    ordered = sorted(offers, key=lambda o: -o.priority)
+
+    total = np.zeros_like(subtotals)
+    per_offer = []
+
+    if mode == "best":
+        matrix = np.stack([offer_discounts(o, subtotals) for o in ordered])
+        winner = matrix.argmax(axis=0)
+        total = matrix.max(axis=0)
+
+        for i, offer in enumerate(ordered):
+            won = (winner == i) & (total > 0)
+            per_offer.append(
+                {
+                    "title": offer.title,
+                    "applied_orders": int(counts[won].sum()),
+                    "discount": round(float((total[won] * counts[won]).sum()), 2),
+                }
+            )
+    else:
+        open_ = np.ones(subtotals.shape, dtype=bool)
+
+        for offer in ordered:
+            d = np.where(open_, offer_discounts(offer, subtotals), 0.0)
+            applied = d > 0
+            total += d
+
+            per_offer.append(
+                {
+                    "title": offer.title,
+                    "applied_orders": int(counts[applied].sum()),
+                    "discount": round(float((d * counts).sum()), 2),
+                }
+            )
+
+            if not offer.stackable:
+                open_ &= ~applied  # 🚫 HARD STOP for these orders
+
+        total = np.minimum(total, subtotals)
+
+    affected = total > 0
+    orders = int(counts.sum())
+    gross = float((subtotals * counts).sum())
+    discount = float((total * counts).sum())
+
+    return {
+        "mode": mode,
+        "orders": orders,
+        "gross_revenue": round(gross, 2),
+        "total_discount": round(discount, 2),
+        "discount_rate": round(discount / gross, 4) if gross else 0.0,
+        "affected_orders": int(counts[affected].sum()),
+        "affected_share": round(float(counts[affected].sum()) / orders, 4) if orders else 0.0,
+        # distribution over orders that got a discount
+        "discount_percentiles": _percentiles(total[affected], counts[affected]),
+        "offers": per_offer,
+        "compute_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+# =====================================================
+# ENTRY
+# =====================================================
+
+async def simulate_offers(
+    db: AsyncSession,
+    *,
+    offers: list[SimulatedOffer],
+    source: str = "orders",
+    start: datetime | None = None,
+    end: datetime | None = None,
+    mode: str = "stack",
+) -> dict:
+    if source == "csv":
+        subtotals, counts = await asyncio.to_thread(load_csv_subtotals)
+    else:
+        subtotals, counts = await load_order_subtotals(db, start=start, end=end)
+
+    # NumPy releases the GIL for the heavy parts; keep the loop free
+    result = await asyncio.to_thread(simulate, offers, subtotals, counts, mode=mode)
+    result["source"] = source
+    return result
@@ -1,7 +1,9 @@
 # app/services/order_service.py
+from itertools import chain
 from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, literal, text
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from sqlalchemy.orm import selectinload
 
 from app.models.models import (
@@ -17,6 +19,12 @@ from app.models.models import (
 )
 from app.schema.enums import OrderStatus
 from app.services.inventory_service import release_inventory_for_order
+from app.services.kpi_service import apply_order_kpis
+from app.services.cache_service import (
+    cache_order_timeline,
+    get_cached_order_timeline,
+    invalidate_order_timeline,
+)
 from app.utils.api_error import bad_request, not_found
 
 
@@ -39,7 +47,7 @@ async def get_order(db: AsyncSession, user_id: UUID, order_id: UUID):
         order_id,
         options=[selectinload(Order.items)],
     )
-    if not order or order.user_id != user_id:
+    if not order or str(order.user_id) != str(user_id):
         not_found("Order")
     return order
 
@@ -50,16 +58,22 @@ async def cancel_order(
     user_id: UUID,
     order_id: UUID,
 ):
-    order = await db.get(Order, order_id)
-    if not order or order.user_id != user_id:
+    # items loaded here: release_inventory_for_order gets this same
+    # instance back from the identity map
+    order = await db.get(Order, order_id, options=[selectinload(Order.items)])
+    if not order or str(order.user_id) != str(user_id):
         not_found("Order")
 
     if order.status not in CANCELLABLE:
         bad_request("Order cannot be cancelled")
 
     order.status = OrderStatus.cancelled.value
+    await apply_order_kpis(db, order=order, cancelled=1)
+
+    # commits the status, KPI and inventory changes together
     await release_inventory_for_order(db, order_id)
     await db.commit()
+    await invalidate_order_timeline(order_id)
 
     return {"status": "cancelled"}
 
@@ -112,38 +126,75 @@ async def get_order_detail(
     }
 
 
+def _json_row(model):
+    """
+    The model's columns as one jsonb object, keyed like the ORM
+    attributes (same shape the timeline always returned).
+    """
+    return func.jsonb_build_object(
+        *chain.from_iterable((literal(c.name), c) for c in model.__table__.columns),
+        type_=JSONB,
+    )
+
+
+def _one(model, order_id: UUID):
+    return (
+        select(_json_row(model))
+        .where(model.order_id == order_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _many(model, order_id: UUID, order_by=None):
+    row = _json_row(model)
+    agg = func.jsonb_agg(aggregate_order_by(row, order_by) if order_by is not None else row)
+    return (
+        select(func.coalesce(agg, text("'[]'::jsonb"), type_=JSONB))
+        .where(model.order_id == order_id)
+        .scalar_subquery()
+    )
+
+
 async def get_order_timeline(
     db: AsyncSession,
     *,
     order_id: UUID,
     user_id: UUID,
 ):
-    order = await db.get(Order, order_id)
-    if not order or order.user_id != user_id:
-        not_found("Order")
+    """
+    Served from the Redis read model when present. Otherwise built in
+    one statement on `db` (the order row plus one indexed subquery per
+    part, aggregated to JSON in Postgres) and cached until the next
+    order-affecting write invalidates it.
+    """
+    cached = await get_cached_order_timeline(order_id)
+    if cached:
+        if str(cached["order"]["user_id"]) != str(user_id):
+            not_found("Order")
+        return cached
 
-    history = await db.execute(
-        select(OrderStatusHistory)
-        .where(OrderStatusHistory.order_id == order_id)
-        .order_by(OrderStatusHistory.created_at)
+    res = await db.execute(
+        select(
+            _json_row(Order).label("order"),
+            _many(OrderStatusHistory, order_id, OrderStatusHistory.created_at).label("history"),
+            _many(Payment, order_id).label("payments"),
+            _one(Delivery, order_id).label("delivery"),
+            _one(Pickup, order_id).label("pickup"),
+            _many(Refund, order_id).label("refunds"),
+            _many(Complaint, order_id).label("complaints"),
+            _many(AgentAction, order_id, AgentAction.created_at).label("agent_actions"),
+        )
+        .where(Order.id == order_id, Order.user_id == user_id)
     )
+    row = res.first()
+    if not row:
+        not_found("Order")
 
-    return {
-        "order": order,
-        "history": history.scalars().all(),
-        "payments": (await db.execute(select(Payment).where(Payment.order_id == order_id))).scalars().all(),
-        "delivery": (await db.execute(select(Delivery).where(Delivery.order_id == order_id))).scalar_one_or_none(),
-        "pickup": (await db.execute(select(Pickup).where(Pickup.order_id == order_id))).scalar_one_or_none(),
-        "refunds": (await db.execute(select(Refund).where(Refund.order_id == order_id))).scalars().all(),
-        "complaints": (await db.execute(select(Complaint).where(Complaint.order_id == order_id))).scalars().all(),
-        "agent_actions": (
-            await db.execute(
-                select(AgentAction)
-                .where(AgentAction.payload["order_id"].astext == str(order_id))
-                .order_by(AgentAction.created_at)
-            )
-        ).scalars().all(),
-    }
+    timeline = dict(row._mapping)
+
+    await cache_order_timeline(order_id, timeline)
+    return timeline
 
 
 async def log_order_status(db, order_id, status):
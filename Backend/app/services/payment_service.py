@@ -7,6 +7,8 @@ from sqlalchemy import select
 from app.models.models import Payment, Order
 from app.models.enums import payment_status_enum, order_status_enum
 from app.utils.api_error import not_found, bad_request
+from app.services.kpi_service import apply_order_kpis
+from app.services.cache_service import invalidate_order_timeline
 
 
 # Order must be pending to pay
@@ -47,7 +49,9 @@ async def process_dummy_payment(
     order.status = "paid"
 
     db.add(payment)
+    await apply_order_kpis(db, order=order, paid=1)
     await db.commit()
     await db.refresh(payment)
 
+    await invalidate_order_timeline(order_id)
     return payment
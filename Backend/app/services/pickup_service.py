@@ -19,6 +19,11 @@ from app.models.models import (
 from app.models.enums import order_status_enum
 from app.utils.api_error import not_found, bad_request
 from app.schema.enums import PickupStatus
+from app.services.cache_service import invalidate_order_timeline
+from app.services.store_dashboard_service import (
+    apply_pickup_rollup,
+    publish_store_dashboard,
+)
 
 
 # =====================================================
@@ -99,8 +104,16 @@ async def update_pickup_status(
         if pickup.order:
             pickup.order.status = order_status_enum.completed
 
+    pickup.updated_at = datetime.utcnow()
+    dashboard = await apply_pickup_rollup(
+        db, pickup=pickup, old_status=current, new_status=status
+    )
+
     await db.commit()
     await db.refresh(pickup)
+
+    await publish_store_dashboard(dashboard)
+    await invalidate_order_timeline(pickup.order_id)
     return pickup
 
 
@@ -1,24 +1,19 @@
 # app/services/product_embedding_service.py
 from uuid import UUID
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.models import Product
+from app.models.models import Embedding, Product
 from app.services.embedding_service import (
     generate_text_embedding,
+    generate_text_embeddings,
     store_embedding,
 )
 from app.utils.api_error import not_found
 
 
-async def embed_product(
-    db: AsyncSession,
-    product_id: UUID,
-):
-    product = await db.get(Product, product_id)
-    if not product:
-        not_found("Product")
-
-    text = " | ".join(
+def product_embedding_text(product) -> str:
+    return " | ".join(
         filter(
             None,
             [
@@ -31,7 +26,16 @@ async def embed_product(
         )
     )
 
-    embedding = await generate_text_embedding(text)
+
+async def embed_product(
+    db: AsyncSession,
+    product_id: UUID,
+):
+    product = await db.get(Product, product_id)
+    if not product:
+        not_found("Product")
+
+    embedding = await generate_text_embedding(product_embedding_text(product))
 
     await store_embedding(
         db=db,
@@ -40,3 +44,44 @@ async def embed_product(
         embedding=embedding,
         metadata={"kind": "product"},
     )
+
+
+async def embed_products(
+    db: AsyncSession,
+    product_ids: list[UUID],
+):
+    """
+    Bulk-import counterpart of embed_product: one embedding request and
+    one insert for the whole batch. Products deleted since are skipped.
+    """
+    res = await db.execute(
+        select(
+            Product.id,
+            Product.name,
+            Product.description,
+            Product.category,
+            Product.price,
+            Product.images,
+        ).where(Product.id.in_(product_ids))
+    )
+    products = res.all()
+    if not products:
+        return
+
+    embeddings = await generate_text_embeddings(
+        [product_embedding_text(p) for p in products]
+    )
+
+    await db.execute(
+        insert(Embedding),
+        [
+            {
+                "source_type": "product",
+                "source_id": p.id,
+                "embedding": embedding,
+                "event_metadata": {"kind": "product"},
+            }
+            for p, embedding in zip(products, embeddings)
+        ],
+    )
+    await db.commit()
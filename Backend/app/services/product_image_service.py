@@ -1,14 +1,148 @@
 # app/services/product_image_service.py
-from sqlalchemy.ext.asyncio import AsyncSession
+#
+# Product image upload:
+#
+#   1. stream: the upload is copied to a temp file CHUNK_SIZE at a time
+#      (sha256 and size cap computed on the way), never read whole
+#   2. dedupe: an image with the same hash is reused; for this product
+#      it's returned as-is, for another one its stored objects are
+#      linked without uploading anything
+#   3. variants: Pillow renders thumb / small / large WebP in a process
+#      pool (app/utils/image_variants.py)
+#   4. store: original + variants go to content-addressed keys
+#      (<hash[:2]>/<hash>/...) in parallel on the storage thread pool
+#      (app/core/storage.py: Supabase, or a local directory)
+#   5. primary: is_primary=True demotes the product's other images in
+#      the same transaction (list cards show the primary)
+#
+# Lists show small_url (fallback: the original); detail views can pick
+# large_url or the original.
+import asyncio
+import hashlib
+import multiprocessing
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from uuid import UUID, uuid4
+
 from fastapi import UploadFile
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.models import Product
-from app.services.product_embedding_service import embed_product
+from app.core.config import settings
+from app.core.storage import get_storage
+from app.models.models import Product, ProductImage
+from app.services.product_service import queue_product_embedding
 from app.utils.api_error import not_found, bad_request
-from app.core.supabase import supabase
+from app.utils.image_variants import render_variants
 
 BUCKET = "product_image"
+CHUNK_SIZE = 1024 * 1024
+
+_image_pool: ProcessPoolExecutor | None = None
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _image_pool
+    if _image_pool is None:
+        # forkserver, not fork: this process has threads (storage pool,
+        # to_thread), and a forked child can inherit their held locks
+        _image_pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+    return _image_pool
+
+
+def shutdown_image_pool():
+    global _image_pool
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=False, cancel_futures=True)
+        _image_pool = None
+
+
+# =====================================================
+# STREAMING
+# =====================================================
+
+def _write_chunk(out, digest, chunk: bytes):
+    digest.update(chunk)
+    out.write(chunk)
+
+
+async def _spool(file: UploadFile, path: Path) -> tuple[str, int]:
+    """
+    Copies the upload to path; returns (sha256 hex, size).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "wb") as out:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > settings.IMAGE_MAX_BYTES:
+                bad_request(f"Image larger than {settings.IMAGE_MAX_BYTES // (1024 * 1024)} MB")
+            await asyncio.to_thread(_write_chunk, out, digest, chunk)
+
+    if not size:
+        bad_request("Empty file")
+    return digest.hexdigest(), size
+
+
+async def _store(workdir: Path, source: Path, content_hash: str) -> dict:
+    try:
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            _pool(), render_variants, str(source), str(workdir)
+        )
+    except ValueError as e:
+        bad_request(str(e))
+
+    storage = get_storage(BUCKET)
+    prefix = f"{content_hash[:2]}/{content_hash}"
+    original, *variant_urls = await asyncio.gather(
+        storage.put(
+            f"{prefix}/original.{rendered['extension']}",
+            source,
+            content_type=rendered["content_type"],
+            immutable=True,
+        ),
+        *(
+            storage.put(
+                f"{prefix}/{name}.webp",
+                path,
+                content_type="image/webp",
+                immutable=True,
+            )
+            for name, path in rendered["variants"].items()
+        ),
+    )
+
+    return {
+        "image_url": original,
+        **{
+            f"{name}_url": url
+            for name, url in zip(rendered["variants"], variant_urls)
+        },
+        "content_type": rendered["content_type"],
+        "width": rendered["width"],
+        "height": rendered["height"],
+    }
+
+
+# =====================================================
+# UPLOAD / DELETE
+# =====================================================
+
+async def _demote_other_primaries(db: AsyncSession, product_id: UUID, keep: UUID):
+    await db.execute(
+        update(ProductImage)
+        .where(
+            ProductImage.product_id == product_id,
+            ProductImage.id != keep,
+            ProductImage.is_primary.is_(True),
+        )
+        .values(is_primary=False)
+    )
 
 
 async def upload_product_image(
@@ -16,30 +150,70 @@ async def upload_product_image(
     *,
     product_id: UUID,
     file: UploadFile,
-):
+    is_primary: bool = False,
+) -> ProductImage:
     if not file.content_type or not file.content_type.startswith("image/"):
         bad_request("Only image files allowed")
+    if file.size is not None and file.size > settings.IMAGE_MAX_BYTES:
+        bad_request(f"Image larger than {settings.IMAGE_MAX_BYTES // (1024 * 1024)} MB")
 
     product = await db.get(Product, product_id)
     if not product:
         not_found("Product")
 
-    filename = f"{product_id}/{uuid4()}-{file.filename}"
-    content = await file.read()
+    workdir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix="product-image-"))
+    try:
+        source = workdir / "source"
+        content_hash, size = await _spool(file, source)
 
-    supabase.storage.from_(BUCKET).upload(
-        filename,
-        content,
-        {"content-type": file.content_type},
-    )
+        # this product's own copy first
+        res = await db.execute(
+            select(ProductImage)
+            .where(ProductImage.content_hash == content_hash)
+            .order_by((ProductImage.product_id == product_id).desc())
+            .limit(1)
+        )
+        existing = res.scalar_one_or_none()
 
-    public_url = supabase.storage.from_(BUCKET).get_public_url(filename)
+        if existing and existing.product_id == product_id:
+            if is_primary and not existing.is_primary:
+                await _demote_other_primaries(db, product_id, existing.id)
+                existing.is_primary = True
+                await db.commit()
+            return existing
+
+        if existing:
+            stored = {
+                "image_url": existing.image_url,
+                "thumb_url": existing.thumb_url,
+                "small_url": existing.small_url,
+                "large_url": existing.large_url,
+                "content_type": existing.content_type,
+                "width": existing.width,
+                "height": existing.height,
+            }
+        else:
+            stored = await _store(workdir, source, content_hash)
+    finally:
+        await asyncio.to_thread(shutil.rmtree, workdir, True)
+
+    image = ProductImage(
+        id=uuid4(),
+        product_id=product_id,
+        content_hash=content_hash,
+        byte_size=size,
+        is_primary=is_primary,
+        **stored,
+    )
+    db.add(image)
+    if is_primary:
+        await _demote_other_primaries(db, product_id, image.id)
 
-    product.images = (product.images or []) + [public_url]
+    product.images = (product.images or []) + [stored["image_url"]]
+    await queue_product_embedding(db, product.id)
     await db.commit()
 
-    await embed_product(db, product.id)
-    return {"image_url": public_url}
+    return image
 
 
 async def delete_product_image(
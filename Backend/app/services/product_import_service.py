@@ -0,0 +1,331 @@
+# app/services/product_import_service.py
+#
+# Bulk catalog import (CSV or NDJSON in the shape of products.csv).
+#
+#   1. rows are parsed in a worker thread, READ_BATCH at a time, and
+#      streamed into a temp staging table with asyncpg COPY
+#      (copy_records_to_table) — the file is never fully in memory
+#   2. one set-based statement upserts products on external_id (the
+#      file's product_id), upserts global stock, and enqueues one
+#      embed_products job per EMBED_BATCH new or changed products
+#   3. the inventory rollup is rebuilt, and everything commits together
+#
+# Rows that fail validation are skipped and reported (first MAX_ERRORS).
+# Within a file the last row for an external_id wins. Unchanged rows
+# are not touched, so re-importing the same file is cheap and enqueues
+# nothing.
+import asyncio
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schema.enums import JobStatus, JobType
+from app.services.job_service import PRIORITY_LOW
+from app.services.kpi_service import rebuild_inventory_rollup
+from app.utils.api_error import bad_request
+
+READ_BATCH = 5000
+EMBED_BATCH = 100
+MAX_ERRORS = 100
+
+STAGING_COLUMNS = (
+    "line",
+    "external_id",
+    "name",
+    "description",
+    "category",
+    "price",
+    "stock",
+    "rating",
+    "images",
+)
+
+CREATE_STAGING = text("""
+    CREATE TEMP TABLE product_import_staging (
+        line integer NOT NULL,
+        external_id text NOT NULL,
+        name text NOT NULL,
+        description text,
+        category text,
+        price numeric NOT NULL,
+        stock integer,
+        rating numeric,
+        images text[]
+    ) ON COMMIT DROP
+""")
+
+# products: UPDATE existing (only if something differs) + INSERT new;
+# stock: only rows that carry one (new products default to 0);
+# jobs: changed ids chunked into EMBED_BATCH-sized payloads
+UPSERT = text("""
+    WITH src AS (
+        SELECT DISTINCT ON (external_id) *
+        FROM product_import_staging
+        ORDER BY external_id, line DESC
+    ),
+    updated AS (
+        UPDATE products p
+        SET name = s.name,
+            description = s.description,
+            category = s.category,
+            price = s.price,
+            rating = coalesce(s.rating, p.rating),
+            images = coalesce(s.images, p.images),
+            is_active = true
+        FROM src s
+        WHERE p.external_id = s.external_id
+          AND (p.name, p.description, p.category, p.price,
+               p.rating, p.images, p.is_active)
+              IS DISTINCT FROM
+              (s.name, s.description, s.category, s.price,
+               coalesce(s.rating, p.rating), coalesce(s.images, p.images), true)
+        RETURNING p.id
+    ),
+    inserted AS (
+        INSERT INTO products
+            (id, external_id, name, description, category, price, rating, images, is_active, created_at)
+        SELECT gen_random_uuid(), s.external_id, s.name, s.description, s.category,
+               s.price, coalesce(s.rating, 0), coalesce(s.images, '{}'), true, :now
+        FROM src s
+        WHERE NOT EXISTS (SELECT 1 FROM products p WHERE p.external_id = s.external_id)
+        -- a concurrent import got there first; its row stands
+        ON CONFLICT (external_id) DO NOTHING
+        RETURNING id, external_id
+    ),
+    stock AS (
+        INSERT INTO global_inventory (product_id, total_stock, updated_at)
+        SELECT coalesce(i.id, p.id), coalesce(s.stock, 0), :now
+        FROM src s
+        LEFT JOIN inserted i ON i.external_id = s.external_id
+        -- statement snapshot: only products that existed before
+        LEFT JOIN products p ON p.external_id = s.external_id
+        WHERE coalesce(i.id, p.id) IS NOT NULL
+          AND (i.id IS NOT NULL OR s.stock IS NOT NULL)
+        ON CONFLICT (product_id) DO UPDATE
+        SET total_stock = excluded.total_stock,
+            updated_at = excluded.updated_at
+        WHERE global_inventory.total_stock IS DISTINCT FROM excluded.total_stock
+        RETURNING product_id
+    ),
+    changed AS (
+        SELECT id, (row_number() OVER () - 1) / :embed_batch AS chunk
+        FROM (SELECT id FROM updated UNION ALL SELECT id FROM inserted) c
+    ),
+    jobs AS (
+        INSERT INTO jobs (id, job_type, payload, priority, status, max_attempts, run_at)
+        SELECT gen_random_uuid(), :job_type,
+               jsonb_build_object('product_ids', jsonb_agg(id)),
+               :priority, :queued, 5, :now
+        FROM changed
+        GROUP BY chunk
+        RETURNING id
+    )
+    SELECT
+        (SELECT count(*) FROM src) AS products,
+        (SELECT count(*) FROM inserted) AS inserted,
+        (SELECT count(*) FROM updated) AS updated,
+        (SELECT count(*) FROM stock) AS stock_updated,
+        (SELECT count(*) FROM jobs) AS embedding_jobs
+""")
+
+
+# =====================================================
+# PARSING
+# =====================================================
+
+class RowError(ValueError):
+    pass
+
+
+def _decimal(value, field: str, *, required: bool = False):
+    if value in (None, ""):
+        if required:
+            raise RowError(f"{field} is required")
+        return None
+    try:
+        number = Decimal(str(value))
+    except InvalidOperation:
+        raise RowError(f"{field} is not a number: {value!r}")
+    if not number.is_finite() or number < 0:
+        raise RowError(f"{field} must be >= 0")
+    return number
+
+
+def _images(raw: dict) -> list[str] | None:
+    if isinstance(raw.get("images"), list):
+        return [str(i) for i in raw["images"] if i]
+    url = (raw.get("image_url") or "").strip()
+    return [url] if url else None
+
+
+def parse_row(line: int, raw: dict) -> tuple:
+    """
+    products.csv columns (product_id, name, description, category,
+    price, stock, rating, image_url); NDJSON may use external_id and an
+    images list instead. created_at / updated_at are ignored.
+    """
+    external_id = str(raw.get("external_id") or raw.get("product_id") or "").strip()
+    if not external_id:
+        raise RowError("product_id is required")
+
+    name = str(raw.get("name") or "").strip()
+    if not name:
+        raise RowError("name is required")
+
+    price = _decimal(raw.get("price"), "price", required=True)
+    rating = _decimal(raw.get("rating"), "rating")
+    if rating is not None and rating > 5:
+        raise RowError("rating must be <= 5")
+
+    stock = _decimal(raw.get("stock"), "stock")
+    if stock is not None and stock != int(stock):
+        raise RowError("stock must be an integer")
+
+    return (
+        line,
+        external_id,
+        name,
+        (raw.get("description") or None),
+        (raw.get("category") or None),
+        price,
+        int(stock) if stock is not None else None,
+        rating,
+        _images(raw),
+    )
+
+
+def _raw_rows(fileobj, fmt: str):
+    """
+    Yields (line, dict | None, error | None). Runs in a worker thread.
+    """
+    stream = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for raw in reader:
+                yield reader.line_num, raw, None
+        else:
+            for line, chunk in enumerate(stream, start=1):
+                if not chunk.strip():
+                    continue
+                try:
+                    raw = json.loads(chunk)
+                except json.JSONDecodeError as e:
+                    yield line, None, f"invalid JSON: {e.msg}"
+                    continue
+                if not isinstance(raw, dict):
+                    yield line, None, "expected a JSON object"
+                    continue
+                yield line, raw, None
+    finally:
+        # leave the caller's file open
+        stream.detach()
+
+
+def detect_format(filename: str | None, fmt: str | None) -> str:
+    if fmt:
+        fmt = fmt.lower()
+    elif filename and filename.lower().endswith((".ndjson", ".jsonl")):
+        fmt = "ndjson"
+    else:
+        fmt = "csv"
+
+    if fmt not in ("csv", "ndjson"):
+        bad_request("format must be csv or ndjson")
+    return fmt
+
+
+# =====================================================
+# IMPORT
+# =====================================================
+
+async def import_products(
+    db: AsyncSession,
+    *,
+    fileobj,
+    fmt: str,
+) -> dict:
+    """
+    fileobj: binary file-like (UploadFile.file, open(path, "rb")).
+    Commits on success; nothing is written if the upsert fails.
+    """
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    errors: list[dict] = []
+    error_count = 0
+    staged = 0
+
+    await db.execute(CREATE_STAGING)
+    # same transaction as the temp table (the session began it above)
+    conn = await db.connection()
+    pg = (await conn.get_raw_connection()).driver_connection
+
+    rows = _raw_rows(fileobj, fmt)
+
+    async def records():
+        nonlocal error_count, staged
+        while True:
+            batch = await asyncio.to_thread(lambda: list(islice(rows, READ_BATCH)))
+            if not batch:
+                return
+            for line, raw, error in batch:
+                if error is None:
+                    try:
+                        record = parse_row(line, raw)
+                    except RowError as e:
+                        error = str(e)
+                if error is not None:
+                    error_count += 1
+                    if len(errors) < MAX_ERRORS:
+                        errors.append({"line": line, "error": error})
+                    continue
+                staged += 1
+                yield record
+
+    try:
+        await pg.copy_records_to_table(
+            "product_import_staging",
+            records=records(),
+            columns=list(STAGING_COLUMNS),
+        )
+    except (UnicodeDecodeError, csv.Error) as e:
+        await db.rollback()
+        bad_request(f"Unreadable file: {e}")
+
+    result = (
+        await db.execute(
+            UPSERT,
+            {
+                "now": now,
+                "embed_batch": EMBED_BATCH,
+                "job_type": JobType.embed_products.value,
+                "priority": PRIORITY_LOW,
+                "queued": JobStatus.queued.value,
+            },
+        )
+    ).one()
+
+    if result.inserted or result.updated or result.stock_updated:
+        await rebuild_inventory_rollup(db)
+
+    await db.commit()
+
+    return {
+        "rows": staged + error_count,
+        "products": result.products,
+        "inserted": result.inserted,
+        "updated": result.updated,
+        "unchanged": result.products - result.inserted - result.updated,
+        "stock_updated": result.stock_updated,
+        "embedding_jobs": result.embedding_jobs,
+        "error_count": error_count,
+        "errors": errors,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -1,13 +1,28 @@
 # app/services/product_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from uuid import UUID, uuid4
 
-from app.models.models import Product, GlobalInventory
+from app.models.models import Product, GlobalInventory, ProductImage
+from app.schema.rows import ProductListRow
 from app.services.user_event_service import record_event
-from app.services.product_embedding_service import embed_product
+from app.services.job_service import enqueue_job
+from app.services.kpi_service import apply_inventory_kpis
 from app.utils.api_error import not_found
-from app.schema.enums import UserEventType
+from app.schema.enums import UserEventType, JobType
+
+
+async def queue_product_embedding(db: AsyncSession, product_id: UUID):
+    """
+    Joins the caller's transaction; the worker embeds after commit.
+    """
+    await enqueue_job(
+        db,
+        job_type=JobType.embed_product,
+        payload={"product_id": str(product_id)},
+        dedupe_key=f"{JobType.embed_product.value}:{product_id}",
+        commit=False,
+    )
 
 
 async def list_products(
@@ -32,6 +47,31 @@ async def list_products(
     return products
 
 
+async def list_product_rows(db: AsyncSession) -> list[ProductListRow]:
+    """
+    GET /products/ fast path: Core tuples, no ORM objects. The card
+    image is the primary (else first) upload's small WebP, falling back
+    to the first legacy URL in products.images.
+    """
+    card_image = (
+        select(func.coalesce(ProductImage.small_url, ProductImage.image_url))
+        .where(ProductImage.product_id == Product.id)
+        .order_by(ProductImage.is_primary.desc(), ProductImage.created_at)
+        .limit(1)
+        .scalar_subquery()
+    )
+    res = await db.execute(
+        select(
+            Product.id,
+            Product.name,
+            Product.category,
+            Product.description,
+            func.coalesce(card_image, Product.images[1]),
+        ).where(Product.is_active.is_(True))
+    )
+    return [ProductListRow(*r) for r in res]
+
+
 async def get_product(
     db: AsyncSession,
     *,
@@ -83,11 +123,14 @@ async def create_product(
             reserved_stock=0,
         )
     )
+    await apply_inventory_kpis(
+        db, old_stock=0, new_stock=0, old_price=price, new_price=price, new_product=True
+    )
+
+    await queue_product_embedding(db, product.id)
 
     await db.commit()
     await db.refresh(product)
-
-    await embed_product(db, product.id)
     return product
 
 
@@ -97,19 +140,30 @@ async def update_product(
     product_id: UUID,
     data: dict,
 ):
-    product = await db.get(Product, product_id)
+    # locked: the price branch takes a KPI delta from product.price
+    product = await db.get(Product, product_id, with_for_update=True)
     if not product:
         not_found("Product")
 
+    if "price" in data and data["price"] != product.price:
+        gi = await db.get(GlobalInventory, product_id, with_for_update=True)
+        if gi:
+            await apply_inventory_kpis(
+                db,
+                old_stock=gi.total_stock,
+                new_stock=gi.total_stock,
+                old_price=product.price,
+                new_price=data["price"],
+            )
+
     for k, v in data.items():
         setattr(product, k, v)
 
-    await db.commit()
-    await db.refresh(product)
-
     if {"name", "description", "category"} & data.keys():
-        await embed_product(db, product.id)
+        await queue_product_embedding(db, product.id)
 
+    await db.commit()
+    await db.refresh(product)
     return product
 
 
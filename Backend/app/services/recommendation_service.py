@@ -2,7 +2,7 @@
 # app/services/recommendation_service.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import bindparam, select, text
 from uuid import UUID
 
 from app.models.models import Product, Embedding
@@ -52,7 +52,7 @@ async def recommend_for_user(
         WHERE p.is_active = true
         ORDER BY e.embedding <=> :user_embedding
         LIMIT :limit
-    """)
+    """).bindparams(bindparam("user_embedding", type_=Embedding.embedding.type))
 
     res = await db.execute(
         stmt,
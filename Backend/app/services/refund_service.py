@@ -1,14 +1,17 @@
 # app/services/refund_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, cast, Float
 from sqlalchemy.orm import selectinload
 from uuid import uuid4, UUID
 from decimal import Decimal
 from app.services.inventory_service import release_inventory_for_order
+from app.services.kpi_service import apply_order_kpis
 from app.schema.enums import RefundStatus
 from app.models.models import Refund, Order, AgentAction
+from app.schema.rows import RefundAdminRow
 from app.models.enums import agent_action_status_enum
 from app.utils.api_error import not_found, bad_request
+from app.services.cache_service import invalidate_order_timeline
 
 
 # ---------- Order states that allow refund ----------
@@ -48,6 +51,8 @@ async def create(
     db.add(refund)
     await db.commit()
     await db.refresh(refund)
+
+    await invalidate_order_timeline(order_id)
     return refund
 
 
@@ -76,12 +81,16 @@ async def update_status(
 
     # 🔥 inventory is restored ONLY on completed
     if new_status == RefundStatus.completed:
+        order = await db.get(Order, refund.order_id)
+        if order:
+            await apply_order_kpis(db, order=order, refunded=1)
         await release_inventory_for_order(db, refund.order_id)
 
     db.add(
         AgentAction(
             id=uuid4(),
             conversation_id=conversation_id,
+            order_id=refund.order_id,
             action_type="update_refund_status",
             payload={
                 "refund_id": str(refund_id),
@@ -96,16 +105,25 @@ async def update_status(
 
     await db.commit()
     await db.refresh(refund)
+
+    await invalidate_order_timeline(refund.order_id)
     return refund
 
 # ---------- Admin: list refunds ----------
 async def list_refunds(
     db: AsyncSession,
     status: str | None = None,
-):
+) -> list[RefundAdminRow]:
     q = (
-        select(Refund)
-        .options(selectinload(Refund.order))
+        select(
+            Refund.id,
+            Refund.order_id,
+            Refund.reason,
+            Refund.status,
+            cast(Order.total, Float),
+            Refund.created_at,
+        )
+        .join(Order, Order.id == Refund.order_id)
         .order_by(Refund.created_at.desc())
     )
 
@@ -113,19 +131,7 @@ async def list_refunds(
         q = q.where(Refund.status == status)
 
     res = await db.execute(q)
-    refunds = res.scalars().all()
-
-    return [
-        {
-            "id": r.id,
-            "order_id": r.order_id,
-            "reason": r.reason,
-            "status": r.status,
-            "created_at": r.created_at,
-            "amount": float(r.order.total),
-        }
-        for r in refunds
-    ]
+    return [RefundAdminRow(*r) for r in res]
 
 
 # ---------- User refunds ----------
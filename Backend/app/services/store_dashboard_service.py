@@ -1,44 +1,191 @@
 # app/services/store_dashboard_service.py
+#
+# Per-store, per-day pickup counters (store_pickup_daily), keyed by the
+# store's local date. Updated in the same transaction as the pickup
+# write; the dashboard reads one row and gets pushed on every change.
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete, literal, case
+from sqlalchemy.dialects.postgresql import insert
 from uuid import UUID
-from datetime import date
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
 
-from app.models.models import Pickup, Order
+from app.core.metrics import cache_hit
+from app.core.ws_manager import ws_manager
+from app.models.models import Pickup, Store, StorePickupDaily
+from app.schema.enums import PickupStatus
 
+DEFAULT_TIMEZONE = "Asia/Kolkata"
+
+# store_id → tz name; a store's timezone practically never changes
+_store_timezones: dict[UUID, str] = {}
+
+
+# =====================================================
+# STORE-LOCAL DATES
+# =====================================================
+
+async def store_timezone(db: AsyncSession, store_id: UUID) -> ZoneInfo:
+    name = _store_timezones.get(store_id)
+    cache_hit("store_timezone", name is not None)
+    if not name:
+        res = await db.execute(select(Store.timezone).where(Store.id == store_id))
+        name = res.scalar_one_or_none() or DEFAULT_TIMEZONE
+        _store_timezones[store_id] = name
+    return ZoneInfo(name)
+
+
+async def load_store_timezones(db: AsyncSession) -> int:
+    """
+    Startup warm-up: every store's zone in one query.
+    """
+    res = await db.execute(select(Store.id, Store.timezone))
+    for store_id, name in res:
+        _store_timezones[store_id] = name or DEFAULT_TIMEZONE
+    return len(_store_timezones)
+
+
+def local_day(ts_utc: datetime, tz: ZoneInfo) -> date:
+    # timestamps are stored as naive UTC
+    return ts_utc.replace(tzinfo=timezone.utc).astimezone(tz).date()
+
+
+# =====================================================
+# ROLLUP (TRANSACTIONAL, NO COMMIT)
+# =====================================================
+
+def _dashboard(store_id: UUID, day: date, row) -> dict:
+    return {
+        "store_id": str(store_id),
+        "date": day.isoformat(),
+        "total_pickups": row.total_pickups if row else 0,
+        "completed": row.completed if row else 0,
+        "pending": row.pending if row else 0,
+        "cancelled": row.cancelled if row else 0,
+        "revenue": float(row.revenue or 0) if row else 0.0,
+    }
+
+
+async def apply_pickup_rollup(
+    db: AsyncSession,
+    *,
+    pickup: Pickup,
+    old_status: PickupStatus | None,
+    new_status: PickupStatus,
+) -> dict:
+    """
+    old_status=None → pickup was just created.
+    Counts go to the store-local day the pickup was created, so one
+    pickup always lives in one row. Returns that row's counts.
+    """
+    tz = await store_timezone(db, pickup.store_id)
+    day = local_day(pickup.created_at or datetime.utcnow(), tz)
+    amount = Decimal(str(pickup.amount or 0))
+
+    column = {
+        PickupStatus.ready: "pending",
+        PickupStatus.picked_up: "completed",
+        PickupStatus.cancelled: "cancelled",
+    }
+
+    deltas = {"total_pickups": 0, "pending": 0, "completed": 0, "cancelled": 0, "revenue": Decimal(0)}
+    if old_status is None:
+        deltas["total_pickups"] += 1
+    else:
+        deltas[column[old_status]] -= 1
+        if old_status == PickupStatus.picked_up:
+            deltas["revenue"] -= amount
+
+    deltas[column[new_status]] += 1
+    if new_status == PickupStatus.picked_up:
+        deltas["revenue"] += amount
+
+    table = StorePickupDaily.__table__
+    now = datetime.utcnow()
+
+    stmt = insert(StorePickupDaily).values(
+        store_id=pickup.store_id, day=day, updated_at=now, **deltas
+    )
+    res = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["store_id", "day"],
+            set_={
+                **{k: table.c[k] + stmt.excluded[k] for k in deltas},
+                "updated_at": now,
+            },
+        ).returning(*(table.c[k] for k in deltas))
+    )
+    return _dashboard(pickup.store_id, day, res.one())
+
+
+async def publish_store_dashboard(counts: dict):
+    """
+    Call after commit. Pushed on the same channel as pickup updates.
+    """
+    try:
+        await ws_manager.broadcast(
+            channel=f"store:{counts['store_id']}:pickups",
+            payload={"type": "dashboard", **counts},
+        )
+    except Exception as e:
+        # log only, the write already committed
+        print("Dashboard broadcast failed:", e)
+
+
+# =====================================================
+# READ
+# =====================================================
 
 async def get_store_dashboard(
     db: AsyncSession,
     store_id: UUID,
 ):
-    today = date.today()
+    tz = await store_timezone(db, store_id)
+    today = local_day(datetime.utcnow(), tz)
 
-    res = await db.execute(
-        select(
-            func.count(Pickup.id).label("total_pickups"),
-            func.count().filter(Pickup.status == "picked_up").label("completed"),
-            func.count().filter(Pickup.status == "ready").label("pending"),
-            func.count().filter(Pickup.status == "cancelled").label("cancelled"),
-            func.coalesce(
-                func.sum(Pickup.amount).filter(Pickup.status == "picked_up"),
-                0
-            ).label("revenue"),
-        )
-        .join(Order, Order.id == Pickup.order_id)
-        .where(
-            Pickup.store_id == store_id,
-            func.date(Order.created_at) == today,
-        )
+    row = await db.get(StorePickupDaily, {"store_id": store_id, "day": today})
+    return _dashboard(store_id, today, row)
+
+
+# =====================================================
+# RECONCILIATION
+# =====================================================
+
+async def reconcile_pickup_rollups(db: AsyncSession):
+    """
+    Rebuilds store_pickup_daily from pickups (runs with the nightly KPI
+    reconcile). Caller commits.
+    """
+    local_date = func.date(
+        func.timezone(Store.timezone, func.timezone("UTC", Pickup.created_at))
     )
 
-    r = res.one()
+    def status_count(status: PickupStatus):
+        return func.count().filter(Pickup.status == status.value)
 
-    return {
-        "date": today.isoformat(),
-        "total_pickups": r.total_pickups,
-        "completed": r.completed,
-        "pending": r.pending,
-        "cancelled": r.cancelled,
-        "revenue": float(r.revenue),
-    }
+    await db.execute(delete(StorePickupDaily))
+    await db.execute(
+        insert(StorePickupDaily).from_select(
+            ["store_id", "day", "total_pickups", "pending", "completed", "cancelled", "revenue", "updated_at"],
+            select(
+                Pickup.store_id,
+                local_date,
+                func.count(Pickup.id),
+                status_count(PickupStatus.ready),
+                status_count(PickupStatus.picked_up),
+                status_count(PickupStatus.cancelled),
+                func.coalesce(
+                    func.sum(
+                        case((Pickup.status == PickupStatus.picked_up.value, Pickup.amount), else_=0)
+                    ),
+                    0,
+                ),
+                literal(datetime.utcnow()),
+            )
+            .join(Store, Store.id == Pickup.store_id)
+            .where(Pickup.created_at.is_not(None))
+            .group_by(Pickup.store_id, local_date),
+        )
+    )
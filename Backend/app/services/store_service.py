@@ -2,7 +2,7 @@
 # app/services/store_service.py
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, select, delete, func
+from sqlalchemy import text, select, delete, func, cast, Float
 from uuid import uuid4, UUID
 from datetime import datetime
 
@@ -16,8 +16,10 @@ from app.models.models import (
 )
 
 from app.schema.schemas import StoreHourCreate
+from app.schema.rows import CatalogStockRow
 from app.utils.api_error import not_found, bad_request
 from app.models.enums import fulfillment_target_enum
+from app.services.kpi_service import apply_inventory_kpis
 
 
 # =====================================================
@@ -274,31 +276,26 @@ async def get_store_inventory(db: AsyncSession, store_id: UUID):
 # ADMIN
 # =====================================================
 
-async def admin_catalog(db: AsyncSession):
+async def admin_catalog(db: AsyncSession) -> list[CatalogStockRow]:
+    """
+    Stock per product (also /admin/products/stock). Price and available
+    stock are computed in SQL so rows map onto CatalogStockRow as-is.
+    """
     res = await db.execute(
         select(
             Product.id,
             Product.name,
-            Product.price,
+            cast(Product.price, Float),
             GlobalInventory.total_stock,
             GlobalInventory.allocated_stock,
             GlobalInventory.reserved_stock,
+            GlobalInventory.total_stock
+            - GlobalInventory.allocated_stock
+            - GlobalInventory.reserved_stock,
         )
         .join(GlobalInventory, GlobalInventory.product_id == Product.id)
     )
-
-    return [
-        {
-            "product_id": r.id,
-            "name": r.name,
-            "price": float(r.price),
-            "total_stock": r.total_stock,
-            "allocated_stock": r.allocated_stock,
-            "reserved_stock": r.reserved_stock,
-            "available_stock": r.total_stock - r.allocated_stock - r.reserved_stock,
-        }
-        for r in res
-    ]
+    return [CatalogStockRow(*r) for r in res]
 
 
 async def update_global_stock(
@@ -307,13 +304,24 @@ async def update_global_stock(
     product_id: UUID,
     total_stock: int,
 ):
-    gi = await db.get(GlobalInventory, product_id)
+    # both rows locked before the KPI deltas are taken from them; same
+    # order as update_product (product, then stock)
+    product = await db.get(Product, product_id, with_for_update=True)
+    gi = await db.get(GlobalInventory, product_id, with_for_update=True)
     if not gi:
         not_found("Global inventory")
 
     if total_stock < gi.allocated_stock + gi.reserved_stock:
         bad_request("Below allocated/reserved")
 
+    await apply_inventory_kpis(
+        db,
+        old_stock=gi.total_stock,
+        new_stock=total_stock,
+        old_price=product.price,
+        new_price=product.price,
+    )
+
     gi.total_stock = total_stock
     await db.commit()
     return gi
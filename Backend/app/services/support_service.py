@@ -2,20 +2,22 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID, uuid4
-from sqlalchemy import select, desc,update
+from sqlalchemy import select, desc,update, insert
 from datetime import datetime
 
 from app.models.enums import (
     message_role_enum,
     conversation_status_enum,
 )
-from app.models.models import Conversation, Message, ChatSession, User, AgentAction,Embedding
+from app.models.models import Conversation, Message, ChatSession, AgentAction, UserEvent
+from app.schema.enums import UserEventType, MessageRole, JobType
+from app.services.job_service import enqueue_job
+from app.services.agent_action_service import owned_order_id
+from app.services.user_even_jobs import rebuild_user_profile
+from app.services.cache_service import invalidate_order_timeline
 from app.utils.api_error import not_found, forbidden
-from app.services.chat_context_service import summarize_chat_session
 from app.models.enums import conversation_status_enum
-from app.services.chat_context_service import summarize_chat_session
 from app.llm.memory import AgentMemory
-from app.services.user_embedding_service import rebuild_user_embedding
 # =========================
 # CONVERSATION MANAGEMENT
 # =========================
@@ -48,7 +50,7 @@ async def get_or_create_active_conversation(
         select(Conversation)
         .where(
             Conversation.chat_session_id == session.id, 
-            Conversation.status == conversation_status_enum.active,
+            Conversation.status == "active",
         )
         .order_by(desc(Conversation.last_message_at))
     )
@@ -83,7 +85,7 @@ async def add_message(
         not_found("Conversation")
 
     # Security check
-    if role == message_role_enum.user and convo.user_id != user_id:
+    if role == MessageRole.user.value and convo.user_id != user_id:
         forbidden()
 
     # Ensure session linkage
@@ -101,6 +103,114 @@ async def add_message(
     await db.refresh(msg)
     return msg
 
+async def get_conversation_for_user(
+    db: AsyncSession,
+    conversation_id: UUID,
+    user_id: UUID,
+) -> Conversation:
+    convo = await db.get(Conversation, conversation_id)
+    if not convo:
+        not_found("Conversation")
+    if str(convo.user_id) != str(user_id):
+        forbidden()
+    return convo
+
+
+# =========================
+# CHAT TURN (ONE TRANSACTION)
+# =========================
+
+async def persist_chat_turn(
+    db: AsyncSession,
+    *,
+    conversation_id: UUID,
+    user_id: UUID,
+    user_message: str,
+    assistant_message: str,
+    received_at: datetime,
+    action_type: str,
+    action_payload: dict,
+    confidence: float | None,
+):
+    """
+    Writes a whole chat turn with a single commit:
+    - user + assistant Message (one multi-row INSERT)
+    - AgentAction
+    - UserEvent (chat_message)
+    - Conversation.last_message_at (one UPDATE)
+    """
+    now = datetime.utcnow()
+
+    res = await db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(last_message_at=now)
+        .returning(Conversation.user_id, Conversation.chat_session_id)
+    )
+    row = res.first()
+    if not row:
+        not_found("Conversation")
+    if str(row.user_id) != str(user_id):
+        await db.rollback()
+        forbidden()
+
+    # explicit timestamps: now() is constant inside one transaction
+    await db.execute(
+        insert(Message).values(
+            [
+                {
+                    "id": uuid4(),
+                    "conversation_id": conversation_id,
+                    "chat_session_id": row.chat_session_id,
+                    "role": MessageRole.user.value,
+                    "content": user_message,
+                    "created_at": received_at,
+                },
+                {
+                    "id": uuid4(),
+                    "conversation_id": conversation_id,
+                    "chat_session_id": row.chat_session_id,
+                    "role": MessageRole.assistant.value,
+                    "content": assistant_message,
+                    "created_at": now,
+                },
+            ]
+        )
+    )
+
+    # set when the turn acted on one of the user's orders (indexed,
+    # feeds the timeline); model-supplied ids are checked first
+    order_id = await owned_order_id(db, action_payload.get("order_id"), user_id=user_id)
+
+    await db.execute(
+        insert(AgentAction).values(
+            id=uuid4(),
+            conversation_id=conversation_id,
+            order_id=order_id,
+            action_type=action_type,
+            payload=action_payload,
+            status="executed",
+            confidence=confidence,
+        )
+    )
+
+    await db.execute(
+        insert(UserEvent).values(
+            id=uuid4(),
+            user_id=user_id,
+            event_type=UserEventType.chat_message.value,
+            event_metadata={"source": "ai_chat"},
+        )
+    )
+
+    # preference recompute calls the LLM → queued with the turn
+    await rebuild_user_profile(db, user_id, commit=False)
+
+    await db.commit()
+
+    await invalidate_order_timeline(order_id)
+
+
 # =========================
 # END SESSION & SUMMARIZE
 # =========================
@@ -112,11 +222,12 @@ async def end_session_for_user(
 ):
     """
     Ends the active ChatSession:
-    - summarizes conversation
-    - stores ChatContext + Embedding
-    - updates user preferences
-    - closes conversations
+    - closes conversations + session
     - clears Redis memory
+    - queues summarization (ChatContext + linked Embedding, user vector)
+
+    The returned "summary" is the recent transcript; the LLM summary
+    lands on the ChatContext (and user preferences) when the job runs.
     """
 
     # 1. Get active session
@@ -132,82 +243,55 @@ async def end_session_for_user(
     if not session:
         not_found("No active session")
 
-    # 2. Fetch messages
+    # 2. Recent messages (newest first)
     res_msgs = await db.execute(
-        select(Message)
+        select(Message.role, Message.content)
         .where(Message.chat_session_id == session.id)
-        .order_by(Message.created_at.asc())
+        .order_by(Message.created_at.desc())
+        .limit(10)
     )
-    messages = res_msgs.scalars().all()
+    recent = res_msgs.all()
+
+    now = datetime.utcnow()
 
     # 3. If empty session → close cleanly
-    if not messages:
+    if not recent:
         session.is_active = False
-        session.last_activity_at = datetime.utcnow()
+        session.last_activity_at = now
         await db.commit()
         return {"status": "ended_empty"}
 
-    # 4. Generate summary (MVP logic)
-    summary_text = "\n".join(
-        f"{m.role}: {m.content}" for m in messages[-10:]
-    )
-
-    # 5. Persist ChatContext + Embedding
-    ctx = await summarize_chat_session(
-        db=db,
-        chat_session_id=session.id,
-        summary=summary_text,
-        token_count=len(summary_text.split()),
-        confidence=1.0,
-    )
+    summary_text = "\n".join(f"{m.role}: {m.content}" for m in reversed(recent))
 
-    await rebuild_user_embedding(db, user_id)
-
-    # 🔥 Link embedding_id explicitly (IMPORTANT)
-    embedding = await db.execute(
-        select(Embedding)
-        .where(
-            Embedding.source_type == "chat_summary",
-            Embedding.source_id == ctx.id,
-        )
-        .order_by(Embedding.created_at.desc())
-    )
-    embedding = embedding.scalar_one_or_none()
-
-    if embedding:
-        ctx.embedding_id = embedding.id
-
-    # 6. Update user preferences
-    user = await db.get(User, user_id)
-    prefs = dict(user.preferences or {})
-    prefs.update(
-        {
-            "last_session_summary": summary_text,
-            "last_session_date": datetime.utcnow().isoformat(),
-        }
-    )
-    user.preferences = prefs
-
-    # 7. Close ALL conversations for this session
+    # 4. Close ALL conversations for this session
     await db.execute(
         update(Conversation)
         .where(Conversation.chat_session_id == session.id)
         .values(
-            status=conversation_status_enum.closed,
-            last_message_at=datetime.utcnow(),
+            status="closed",
+            last_message_at=now,
         )
     )
 
-    # 8. Close session
+    # 5. Close session
     session.is_active = False
-    session.last_activity_at = datetime.utcnow()
+    session.last_activity_at = now
 
-    # 9. Clear Redis memory
-    memory = AgentMemory(chat_session_id=str(session.id))
-    await memory.clear()
+    # 6. Summary + embeddings run in the worker
+    await enqueue_job(
+        db,
+        job_type=JobType.summarize_session,
+        payload={"chat_session_id": str(session.id), "user_id": str(user_id)},
+        dedupe_key=f"{JobType.summarize_session.value}:{session.id}",
+        commit=False,
+    )
 
     await db.commit()
 
+    # 7. Clear Redis memory
+    memory = AgentMemory(chat_session_id=str(session.id))
+    await memory.clear()
+
     return {
         "status": "ended",
         "summary": summary_text,
@@ -1,9 +1,30 @@
-from app.services.user_event_service import recompute_user_preferences
+# app/services/user_even_jobs.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from uuid import UUID, uuid4
-async def rebuild_user_profile(db: AsyncSession, user_id: UUID):
-    try:
-        await recompute_user_preferences(db, user_id)
-    except Exception as e:
-        # log only, never crash user flow
-        print("Preference rebuild failed:", e)
\ No newline at end of file
+from uuid import UUID
+
+from app.schema.enums import JobType
+from app.services.job_service import enqueue_job, PRIORITY_LOW
+
+# events arriving within this window share one rebuild
+PROFILE_REBUILD_DELAY_SECONDS = 30
+
+
+async def rebuild_user_profile(
+    db: AsyncSession,
+    user_id: UUID,
+    *,
+    commit: bool = True,
+):
+    """
+    Queues a preference recompute (LLM) + user vector rebuild.
+    Runs in app/worker.py, never on the request path.
+    """
+    await enqueue_job(
+        db,
+        job_type=JobType.rebuild_user_profile,
+        payload={"user_id": str(user_id)},
+        dedupe_key=f"{JobType.rebuild_user_profile.value}:{user_id}",
+        priority=PRIORITY_LOW,
+        delay_seconds=PROFILE_REBUILD_DELAY_SECONDS,
+        commit=commit,
+    )
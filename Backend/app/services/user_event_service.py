@@ -9,6 +9,7 @@ from app.schema.enums import UserEventType
 from app.services.user_preference_llm_service import generate_preferences_from_events
 from app.services.embedding_service import generate_text_embedding, store_embedding
 from app.services.user_embedding_service import rebuild_user_embedding
+from app.services.user_even_jobs import rebuild_user_profile
 
 
 # =====================================================
@@ -23,6 +24,7 @@ async def record_event(
     variant_id: UUID | None = None,
     order_id: UUID | None = None,
     metadata: dict | None = None,
+    commit: bool = True,
 ):
     event = UserEvent(
         id=uuid4(),
@@ -35,9 +37,11 @@ async def record_event(
     )
 
     db.add(event)
-    await db.commit()
 
-    await recompute_user_preferences(db, user_id)
+    # recompute calls the LLM → queued, committed with the event
+    await rebuild_user_profile(db, user_id, commit=False)
+    if commit:
+        await db.commit()
 
 
 
@@ -2,14 +2,8 @@
 from typing import List, Dict
 import json
 
-from google import genai
-from app.core.config import settings
-
-# --------------------------------------------------
-# CLIENT SETUP (NEW SDK)
-# --------------------------------------------------
-
-client = genai.Client(api_key=settings.GEMINI_API_KEY)
+from app.core.gemini import get_gemini_client
+from app.core.metrics import observe_llm, record_llm_usage
 
 MODEL = "gemini-2.5-flash"
 
@@ -44,10 +38,12 @@ Return STRICT JSON ONLY in the following format:
 """
 
     try:
-        response = client.models.generate_content(
-            model=MODEL,
-            contents=prompt,
-        )
+        with observe_llm("generate_content", "preferences"):
+            response = await get_gemini_client().aio.models.generate_content(
+                model=MODEL,
+                contents=prompt,
+            )
+        record_llm_usage("generate_content", "preferences", response)
 
         # SDK guarantees text aggregation
         text = response.text.strip()
@@ -0,0 +1,62 @@
+# app/utils/image_variants.py
+#
+# Pillow work for product images. Runs in a process pool
+# (product_image_service): decoding and resizing are CPU-bound and
+# would stall the event loop. Imports nothing from the app, so spawned
+# workers start quickly.
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+# name → longest edge in px (never upscaled); all WebP
+VARIANTS = {
+    "thumb": 160,
+    "small": 480,
+    "large": 1600,
+}
+WEBP_QUALITY = 82
+
+FORMATS = {
+    "JPEG": ("image/jpeg", "jpg"),
+    "PNG": ("image/png", "png"),
+    "WEBP": ("image/webp", "webp"),
+    "GIF": ("image/gif", "gif"),
+}
+
+
+def render_variants(src: str, out_dir: str) -> dict:
+    """
+    Decodes src fully (corrupt or truncated files fail here) and writes
+    <out_dir>/<variant>.webp. Any unreadable input raises ValueError.
+    """
+    try:
+        with Image.open(src) as img:
+            fmt = img.format
+            if fmt not in FORMATS:
+                raise ValueError(f"Unsupported image format: {fmt}")
+            img.load()
+            # phone photos: apply EXIF rotation before resizing
+            img = ImageOps.exif_transpose(img)
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Unreadable image: {e}") from None
+
+    if img.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {}
+    for name, edge in VARIANTS.items():
+        variant = img.copy()
+        variant.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        path = Path(out_dir) / f"{name}.webp"
+        variant.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+        variants[name] = str(path)
+
+    content_type, extension = FORMATS[fmt]
+    return {
+        "content_type": content_type,
+        "extension": extension,
+        "width": img.width,
+        "height": img.height,
+        "variants": variants,
+    }
@@ -0,0 +1,217 @@
+# app/warmup.py
+#
+# Startup warm-up for API workers, and readiness.
+#
+# The lifespan starts the offer engine (needed for correct carts) and
+# then runs warm_up() in the background. While it runs, /health answers
+# (the process is alive) but /ready returns 503, so a load balancer
+# only routes here once the first requests won't pay for:
+#
+#   db_pool        DB_POOL_PREFILL connections per engine, opened at once
+#   redis_pool     REDIS_POOL_PREFILL connections (concurrent PINGs)
+#   catalog/stores the hot list queries, once: compiled-statement cache,
+#                  Postgres buffers
+#   store_tz       every store's timezone (store dashboard)
+#   intents        intent-router centroids (Redis, else embedded once)
+#   llm_prefix     provider cache handle for system prompt + tool schema
+#
+# db_pool and redis_pool must succeed: a worker that can't reach
+# Postgres or Redis stays out of rotation, retrying them every
+# REQUIRED_RETRY_SECONDS. The other steps are best-effort: a failure
+# is logged and shown in /ready, but everything they warm also loads
+# lazily on first use.
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import ReadSessionLocal, engine, read_engine
+from app.core.redis import redis_client
+from app.llm.intent_router import load_centroids
+from app.llm.llm import get_context_cache
+from app.services.offer_engine import offer_engine
+from app.services.product_image_service import shutdown_image_pool
+from app.services.product_service import list_product_rows
+from app.services.store_dashboard_service import load_store_timezones
+from app.services.store_service import list_stores
+
+state = {
+    "ready": False,
+    "draining": False,
+    "steps": {},
+    "started_at": None,
+    "finished_at": None,
+}
+
+_task: asyncio.Task | None = None
+
+
+# =====================================================
+# STEPS
+# =====================================================
+
+async def _prefill_engine(db_engine, n: int) -> int:
+    n = min(n, db_engine.pool.size())
+    results = await asyncio.gather(
+        *(db_engine.connect() for _ in range(n)), return_exceptions=True
+    )
+    conns = [c for c in results if not isinstance(c, BaseException)]
+    try:
+        await asyncio.gather(*(c.execute(text("SELECT 1")) for c in conns))
+    finally:
+        # back to the pool, which keeps them open
+        await asyncio.gather(*(c.close() for c in conns))
+
+    errors = [e for e in results if isinstance(e, BaseException)]
+    if errors:
+        raise errors[0]
+    return len(conns)
+
+
+async def warm_db_pool() -> int:
+    opened = await _prefill_engine(engine, settings.DB_POOL_PREFILL)
+    if read_engine is not engine:
+        opened += await _prefill_engine(read_engine, settings.DB_POOL_PREFILL)
+    return opened
+
+
+async def warm_redis_pool() -> int:
+    await asyncio.gather(
+        *(redis_client.ping() for _ in range(settings.REDIS_POOL_PREFILL))
+    )
+    return settings.REDIS_POOL_PREFILL
+
+
+async def warm_catalog() -> int:
+    async with ReadSessionLocal() as db:
+        return len(await list_product_rows(db))
+
+
+async def warm_stores() -> int:
+    async with ReadSessionLocal() as db:
+        return len(await list_stores(db))
+
+
+async def warm_store_timezones() -> int:
+    async with ReadSessionLocal() as db:
+        return await load_store_timezones(db)
+
+
+async def warm_intents() -> int:
+    return len(await load_centroids())
+
+
+async def warm_llm_prefix() -> bool:
+    # None when disabled or the provider call failed (already logged)
+    return await get_context_cache() is not None
+
+
+REQUIRED = ("db_pool", "redis_pool")
+REQUIRED_RETRY_SECONDS = 5
+
+# connections first: later steps reuse them
+STEPS = (
+    ("db_pool", warm_db_pool),
+    ("redis_pool", warm_redis_pool),
+    ("catalog", warm_catalog),
+    ("stores", warm_stores),
+    ("store_tz", warm_store_timezones),
+    ("intents", warm_intents),
+    ("llm_prefix", warm_llm_prefix),
+)
+
+
+# =====================================================
+# RUN / READINESS
+# =====================================================
+
+async def _run_step(name: str, step) -> dict:
+    started = time.perf_counter()
+    try:
+        result = {"ok": True, "result": await step()}
+    except Exception as e:
+        print(f"Warm-up step {name} failed:", e)
+        result = {"ok": False, "error": str(e)[:200]}
+    result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def _run_all():
+    # pools first, then the rest side by side
+    for name, step in STEPS[:2]:
+        state["steps"][name] = await _run_step(name, step)
+    results = await asyncio.gather(
+        *(_run_step(name, step) for name, step in STEPS[2:])
+    )
+    state["steps"].update({name: r for (name, _), r in zip(STEPS[2:], results)})
+
+
+def _failed_required() -> list[str]:
+    return [n for n in REQUIRED if not state["steps"].get(n, {}).get("ok")]
+
+
+async def warm_up():
+    state["started_at"] = time.time()
+    try:
+        await asyncio.wait_for(_run_all(), settings.WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        print(f"Warm-up timed out after {settings.WARMUP_TIMEOUT_SECONDS}s")
+        state["steps"]["timeout"] = {"ok": False, "ms": settings.WARMUP_TIMEOUT_SECONDS * 1000}
+
+    # not ready without Postgres and Redis; cancelled by shutdown()
+    while failed := _failed_required():
+        await asyncio.sleep(REQUIRED_RETRY_SECONDS)
+        for name in failed:
+            state["steps"][name] = await _run_step(name, dict(STEPS)[name])
+
+    state["finished_at"] = time.time()
+    state["ready"] = not state["draining"]
+
+
+def readiness() -> tuple[bool, dict]:
+    took = (
+        round(state["finished_at"] - state["started_at"], 3)
+        if state["finished_at"] and state["started_at"]
+        else None
+    )
+    ready = state["ready"] and not state["draining"]
+    return ready, {
+        "status": "ready" if ready else ("draining" if state["draining"] else "warming"),
+        "warmup_seconds": took,
+        "steps": state["steps"],
+    }
+
+
+# =====================================================
+# LIFESPAN HOOKS
+# =====================================================
+
+async def startup():
+    global _task
+    await offer_engine.start()
+    _task = asyncio.create_task(warm_up())
+
+
+async def shutdown():
+    state["draining"] = True
+    state["ready"] = False
+
+    if _task and not _task.done():
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+
+    await offer_engine.stop()
+    shutdown_image_pool()
+
+    try:
+        await redis_client.aclose()
+    except Exception as e:
+        print("Redis close failed:", e)
+
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
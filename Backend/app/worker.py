@@ -0,0 +1,229 @@
+# app/worker.py
+#
+# Background job worker.
+#
+#   cd Backend
+#   python -m app.worker
+#   python -m app.worker --only embed_product summarize_session
+#
+# Run as many processes as needed: claims use FOR UPDATE SKIP LOCKED,
+# so workers never pick up the same job. With PROMETHEUS_MULTIPROC_DIR
+# shared with the API on the same host, LLM / DB metrics from jobs show
+# up on the API's /metrics too.
+import argparse
+import asyncio
+import contextlib
+import signal
+import traceback
+from datetime import datetime, time, timedelta
+
+from app.core.database import AsyncSessionLocal, engine
+from app.core.metrics import mark_process_dead
+from app.schema.enums import JobType
+from app.services.hot_cart_service import flush_dirty_carts
+from app.services.job_handlers import HANDLERS
+from app.services.job_service import (
+    claim_jobs,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    release_stale_jobs,
+)
+
+# max jobs of each type running at once in this process.
+# LLM-bound types stay low to respect provider rate limits.
+CONCURRENCY = {
+    JobType.embed_product: 4,
+    JobType.embed_products: 2,
+    JobType.summarize_session: 2,
+    JobType.rebuild_user_embedding: 4,
+    JobType.rebuild_user_profile: 2,
+    JobType.reconcile_kpis: 1,
+}
+
+# job type → UTC time of day it runs
+NIGHTLY = {
+    JobType.reconcile_kpis: time(2, 0),
+}
+
+POLL_INTERVAL_SECONDS = 1.0
+IDLE_INTERVAL_SECONDS = 5.0
+STALE_SWEEP_SECONDS = 60
+SCHEDULE_CHECK_SECONDS = 300
+CART_FLUSH_SECONDS = 2.0
+
+
+async def run_job(job, slots: asyncio.Semaphore):
+    try:
+        async with AsyncSessionLocal() as db:
+            await HANDLERS[JobType(job.job_type)](db, job.payload or {})
+
+        async with AsyncSessionLocal() as db:
+            await complete_job(db, job_id=job.id)
+
+    except Exception as e:
+        print(f"Job {job.job_type} {job.id} failed (attempt {job.attempts}):", e)
+        async with AsyncSessionLocal() as db:
+            await fail_job(
+                db,
+                job_id=job.id,
+                attempts=job.attempts,
+                max_attempts=job.max_attempts,
+                error="".join(traceback.format_exception(e)),
+            )
+    finally:
+        slots.release()
+
+
+async def poll_type(job_type: JobType, stop: asyncio.Event):
+    limit = CONCURRENCY[job_type]
+    slots = asyncio.Semaphore(limit)
+    running: set[asyncio.Task] = set()
+
+    while not stop.is_set():
+        # wait for at least one free slot, then claim as many as are free
+        await slots.acquire()
+        if stop.is_set():
+            # stopped while every slot was busy: claim nothing more
+            slots.release()
+            break
+        free = 1
+        while free < limit and not slots.locked():
+            await slots.acquire()
+            free += 1
+
+        try:
+            async with AsyncSessionLocal() as db:
+                jobs = await claim_jobs(db, job_type=job_type, limit=free)
+        except Exception as e:
+            print(f"Claim {job_type.value} failed:", e)
+            jobs = []
+
+        for _ in range(free - len(jobs)):
+            slots.release()
+
+        for job in jobs:
+            task = asyncio.create_task(run_job(job, slots))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        await wait_or_stop(stop, POLL_INTERVAL_SECONDS if jobs else IDLE_INTERVAL_SECONDS)
+
+    # drain: claimed jobs finish (or fail) instead of waiting for the sweep
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def sweep_stale(stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            async with AsyncSessionLocal() as db:
+                released = await release_stale_jobs(db)
+            if released:
+                print(f"Re-queued {released} stale jobs")
+        except Exception as e:
+            print("Stale job sweep failed:", e)
+        await asyncio.sleep(STALE_SWEEP_SECONDS)
+
+
+async def flush_carts(stop: asyncio.Event):
+    """
+    Write-behind for hot carts. Drains the dirty set in batches, then
+    waits; one final drain runs on shutdown.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                while await flush_dirty_carts(db):
+                    pass
+        except Exception as e:
+            print("Cart flush failed:", e)
+
+        if stop.is_set():
+            return
+        await wait_or_stop(stop, CART_FLUSH_SECONDS)
+
+
+async def wait_or_stop(stop: asyncio.Event, seconds: float):
+    """
+    asyncio.sleep that returns early once `stop` is set.
+    """
+    try:
+        await asyncio.wait_for(stop.wait(), seconds)
+    except asyncio.TimeoutError:
+        pass
+
+
+def seconds_until(at: time) -> int:
+    now = datetime.utcnow()
+    run = datetime.combine(now.date(), at)
+    if run <= now:
+        run += timedelta(days=1)
+    return int((run - now).total_seconds())
+
+
+async def schedule_nightly(stop: asyncio.Event):
+    """
+    Keeps the next nightly run queued. The dedupe key makes this a
+    no-op while one is already waiting, so every worker can run it.
+    """
+    while not stop.is_set():
+        for job_type, at in NIGHTLY.items():
+            try:
+                async with AsyncSessionLocal() as db:
+                    await enqueue_job(
+                        db,
+                        job_type=job_type,
+                        payload={"trigger": "nightly"},
+                        dedupe_key=f"{job_type.value}:nightly",
+                        delay_seconds=seconds_until(at),
+                    )
+            except Exception as e:
+                print(f"Scheduling {job_type.value} failed:", e)
+        await asyncio.sleep(SCHEDULE_CHECK_SECONDS)
+
+
+async def main(job_types: list[JobType]):
+    stop = asyncio.Event()
+
+    # SIGTERM (deploys) and Ctrl+C stop claiming and let in-flight jobs
+    # finish; otherwise they sit in `running` until the stale sweep.
+    # Not available on Windows: Ctrl+C there still interrupts.
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop.set)
+
+    pollers = [asyncio.create_task(poll_type(t, stop)) for t in job_types]
+    sweeper = asyncio.create_task(sweep_stale(stop))
+    scheduler = asyncio.create_task(schedule_nightly(stop))
+    flusher = asyncio.create_task(flush_carts(stop))
+
+    try:
+        await asyncio.gather(*pollers)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        stop.set()
+        sweeper.cancel()
+        scheduler.cancel()
+        await asyncio.gather(flusher, return_exceptions=True)
+        await engine.dispose()
+        mark_process_dead()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=[t.value for t in JobType],
+        help="job types to process (default: all)",
+    )
+    args = parser.parse_args()
+
+    types = [JobType(t) for t in args.only] if args.only else list(JobType)
+    try:
+        asyncio.run(main(types))
+    except KeyboardInterrupt:
+        pass
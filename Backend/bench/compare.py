@@ -0,0 +1,89 @@
+# bench/compare.py
+#
+# Side-by-side of two bench.run result files.
+#
+#   python -m bench.compare bench/results/base.json bench/results/head.json
+#
+# Latency deltas are (head - base) / base; a change beyond --threshold
+# (default 10%) in the worse direction is flagged, and --fail makes the
+# exit status non-zero so it can gate CI. Record both files on the same
+# machine against the same bench.seed database; no baseline is committed.
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# metric → True if higher is better
+METRICS = {
+    "throughput_rps": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "error_rate": False,
+    "db_queries_mean": False,
+}
+
+
+def _delta(base, head) -> float | None:
+    if base in (None, 0) or head is None:
+        return None
+    return (head - base) / base
+
+
+def compare(base: dict, head: dict, *, threshold: float) -> tuple[list[str], int]:
+    lines = [
+        f"base {base['meta'].get('commit', '?')[:10]}  →  head {head['meta'].get('commit', '?')[:10]}"
+        + ("  (head dirty)" if head["meta"].get("dirty") else ""),
+        "",
+        f"{'scenario':<16} {'metric':<16} {'base':>10} {'head':>10} {'delta':>8}",
+    ]
+    regressions = 0
+
+    for name in sorted(set(base["scenarios"]) | set(head["scenarios"])):
+        b = base["scenarios"].get(name)
+        h = head["scenarios"].get(name)
+        if not b or not h:
+            lines.append(f"{name:<16} only in {'head' if h else 'base'}")
+            continue
+
+        for metric, higher_is_better in METRICS.items():
+            bv, hv = b.get(metric), h.get(metric)
+            if bv is None and hv is None:
+                continue
+            d = _delta(bv, hv)
+            flag = ""
+            if d is not None and (d < -threshold if higher_is_better else d > threshold):
+                flag = "  REGRESSION"
+                regressions += 1
+            elif metric == "error_rate" and not bv and hv:
+                flag = "  REGRESSION"
+                regressions += 1
+            pct = f"{d * 100:+.1f}%" if d is not None else "-"
+            lines.append(f"{name:<16} {metric:<16} {bv!s:>10} {hv!s:>10} {pct:>8}{flag}")
+        lines.append("")
+
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("base", type=Path)
+    parser.add_argument("head", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--fail", action="store_true", help="exit 1 on any regression")
+    args = parser.parse_args()
+
+    lines, regressions = compare(
+        json.loads(args.base.read_text()),
+        json.loads(args.head.read_text()),
+        threshold=args.threshold,
+    )
+    print("\n".join(lines))
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+
+    if args.fail and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
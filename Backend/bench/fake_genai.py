@@ -0,0 +1,188 @@
+# bench/fake_genai.py
+#
+# Deterministic, offline stand-in for google.genai.Client.
+#
+# install() swaps google.genai.Client before any app module is imported;
+# everything else (types, errors) stays the real SDK, so the app code
+# runs unchanged. Responses are built from real `types` objects.
+#
+#   generate_content → sleeps BENCH_LLM_MS (± jitter), then either calls
+#                      a tool picked from keywords in the last user turn
+#                      or answers in text (always text after a tool result)
+#   embed_content    → sleeps BENCH_EMBED_MS, returns a unit vector seeded
+#                      by the text hash (same text → same vector)
+#   caches.create    → returns a fake cached-content handle
+import asyncio
+import hashlib
+import os
+import random
+import time
+
+import numpy as np
+from google import genai
+from google.genai import types
+
+EMBEDDING_DIM = 768
+
+# first keyword found in the user message → tool the "model" calls
+TOOL_KEYWORDS = (
+    ("recommend", "recommend_products"),
+    ("suggest", "recommend_products"),
+    ("cart", "view_cart"),
+    ("address", "list_addresses"),
+    ("preference", "get_user_preferences"),
+    ("product", "list_products"),
+)
+
+PREFERENCES_JSON = (
+    '{"preferred_categories": ["Electronics"], '
+    '"preferred_price_range": {"min": 500, "max": 5000}, '
+    '"preferred_brands": []}'
+)
+
+
+class LatencyModel:
+    def __init__(self, mean_ms: float, jitter: float, seed: int):
+        self.mean_ms = mean_ms
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    def seconds(self) -> float:
+        if self.mean_ms <= 0:
+            return 0.0
+        spread = self.mean_ms * self.jitter
+        return max(self.mean_ms + self._rng.uniform(-spread, spread), 0) / 1000
+
+
+_config = {
+    "llm": LatencyModel(float(os.environ.get("BENCH_LLM_MS", 800)), 0.25, 1),
+    "embed": LatencyModel(float(os.environ.get("BENCH_EMBED_MS", 60)), 0.25, 2),
+}
+
+
+def configure(*, llm_ms: float, embed_ms: float, jitter: float = 0.25, seed: int = 0):
+    _config["llm"] = LatencyModel(llm_ms, jitter, seed + 1)
+    _config["embed"] = LatencyModel(embed_ms, jitter, seed + 2)
+
+
+# =====================================================
+# DETERMINISTIC PAYLOADS
+# =====================================================
+
+def pseudo_embedding(text: str) -> list[float]:
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+    vec = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+def _tokens(value) -> int:
+    return max(len(str(value)) // 4, 1)
+
+
+def _last_user_parts(contents) -> list:
+    if isinstance(contents, str):
+        return [types.Part(text=contents)]
+    for content in reversed(contents or []):
+        if getattr(content, "role", "user") == "user":
+            return content.parts or []
+    return []
+
+
+def _pick_tool(text: str) -> str | None:
+    lowered = text.lower()
+    for keyword, tool in TOOL_KEYWORDS:
+        if keyword in lowered:
+            return tool
+    return None
+
+
+def _response(contents, config) -> types.GenerateContentResponse:
+    parts = _last_user_parts(contents)
+    after_tool = any(p.function_response for p in parts)
+    text = " ".join(p.text for p in parts if p.text)
+
+    tools_enabled = bool(
+        config
+        and (getattr(config, "tools", None) or getattr(config, "cached_content", None))
+    )
+    tool = None if after_tool or not tools_enabled else _pick_tool(text)
+
+    if tool:
+        out = [types.Part(function_call=types.FunctionCall(name=tool, args={}))]
+    elif tools_enabled:
+        out = [types.Part(text="Here is what I found for you.")]
+    elif "STRICT JSON" in text:
+        # preference inference
+        out = [types.Part(text=PREFERENCES_JSON)]
+    else:
+        # session / rolling summaries
+        out = [types.Part(text=f"Summary of {_tokens(text)} tokens of conversation.")]
+
+    return types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(content=types.Content(role="model", parts=out))
+        ],
+        usage_metadata=types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=_tokens(contents),
+            candidates_token_count=_tokens(out),
+            cached_content_token_count=(
+                1200 if config and getattr(config, "cached_content", None) else 0
+            ),
+        ),
+    )
+
+
+def _embed_response(contents) -> types.EmbedContentResponse:
+    texts = contents if isinstance(contents, list) else [contents]
+    return types.EmbedContentResponse(
+        embeddings=[types.ContentEmbedding(values=pseudo_embedding(str(t))) for t in texts]
+    )
+
+
+# =====================================================
+# CLIENT SURFACE (only what the app uses)
+# =====================================================
+
+class _Models:
+    def generate_content(self, *, model, contents, config=None):
+        time.sleep(_config["llm"].seconds())
+        return _response(contents, config)
+
+    def embed_content(self, *, model, contents, config=None):
+        time.sleep(_config["embed"].seconds())
+        return _embed_response(contents)
+
+
+class _AsyncModels:
+    async def generate_content(self, *, model, contents, config=None):
+        await asyncio.sleep(_config["llm"].seconds())
+        return _response(contents, config)
+
+    async def embed_content(self, *, model, contents, config=None):
+        await asyncio.sleep(_config["embed"].seconds())
+        return _embed_response(contents)
+
+
+class _AsyncCaches:
+    async def create(self, *, model, config=None):
+        digest = hashlib.sha256(repr(config).encode()).hexdigest()[:12]
+        return types.CachedContent(name=f"cachedContents/bench-{digest}", model=model)
+
+
+class _Aio:
+    def __init__(self):
+        self.models = _AsyncModels()
+        self.caches = _AsyncCaches()
+
+
+class FakeClient:
+    def __init__(self, *args, **kwargs):
+        self.models = _Models()
+        self.aio = _Aio()
+
+
+def install():
+    """
+    Must run before anything under `app` is imported.
+    """
+    genai.Client = FakeClient
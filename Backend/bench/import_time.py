@@ -0,0 +1,125 @@
+# bench/import_time.py
+#
+# Cold-start budget: how long `import app.main` takes in a fresh
+# interpreter, and which modules account for it (python -X importtime).
+#
+#   cd Backend
+#   python -m bench.import_time
+#   python -m bench.import_time --runs 10 --top 30 --out bench/results/import.json
+#   python -m bench.import_time --budget-ms 1500      # exit 1 if over
+#
+# Every run is a new process (nothing cached in sys.modules); .pyc
+# files are warmed by one discarded run first, as on a deployed image.
+# Reported wall time covers interpreter start + import; the per-module
+# table is from the median run.
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench import env
+from bench.meta import git_meta
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+# "import time:       123 |       4567 |     package.module"
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def one_run(target: str) -> tuple[float, list[tuple[str, int, int, int]]]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.splitlines()[-20:])
+        raise SystemExit(f"import {target} failed:\n{tail}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            # nesting depth: two spaces per level
+            modules.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return wall, modules
+
+
+def top_level_packages(modules) -> dict[str, int]:
+    """
+    Self time summed per top-level package (google, sqlalchemy, app, ...).
+    """
+    totals: dict[str, int] = {}
+    for name, self_us, _, _ in modules:
+        root = name.split(".")[0]
+        totals[root] = totals.get(root, 0) + self_us
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float)
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args()
+
+    env.setup()
+
+    one_run(args.target)  # warm .pyc
+    runs = [one_run(args.target) for _ in range(args.runs)]
+    walls = sorted(w for w, _ in runs)
+    median_wall = statistics.median(walls)
+    _, modules = min(runs, key=lambda r: abs(r[0] - median_wall))
+
+    slowest = sorted(modules, key=lambda m: -m[2])[: args.top]
+    packages = top_level_packages(modules)
+    import_ms = sum(m[2] for m in modules if m[3] == 0) / 1000
+
+    print(f"import {args.target}: median {median_wall * 1000:.0f}ms wall "
+          f"(min {walls[0] * 1000:.0f}, max {walls[-1] * 1000:.0f}), "
+          f"{import_ms:.0f}ms in imports, {len(modules)} modules")
+    print(f"\n{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us, depth in slowest:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {'  ' * depth}{name}")
+    print(f"\n{'self ms':>9}  package")
+    for name, self_us in list(packages.items())[: args.top]:
+        print(f"{self_us / 1000:>9.1f}  {name}")
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps({
+            "meta": {**git_meta(), "target": args.target, "runs": args.runs},
+            "wall_ms": {
+                "median": round(median_wall * 1000, 1),
+                "min": round(walls[0] * 1000, 1),
+                "max": round(walls[-1] * 1000, 1),
+            },
+            "import_ms": round(import_ms, 1),
+            "modules": len(modules),
+            "slowest": [
+                {"module": n, "cumulative_ms": c / 1000, "self_ms": s / 1000}
+                for n, s, c, _ in slowest
+            ],
+            "packages_self_ms": {k: v / 1000 for k, v in packages.items()},
+        }, indent=2))
+        print("Wrote", args.out)
+
+    if args.budget_ms and median_wall * 1000 > args.budget_ms:
+        print(f"Over budget: {median_wall * 1000:.0f}ms > {args.budget_ms:.0f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
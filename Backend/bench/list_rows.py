@@ -0,0 +1,316 @@
+# bench/list_rows.py
+#
+# Per-row CPU cost of the large read-only lists, before and after the
+# Core select → slotted row → orjson fast path (app/schema/rows.py).
+#
+#   cd Backend
+#   python -m bench.seed
+#   python -m bench.list_rows --rows 10000 --repeat 7 --out bench/results/list_rows.json
+#
+# --rows fixture rows per list (products + global stock, orders +
+# refunds, deliveries) are inserted in one transaction that is rolled
+# back at the end. Lists also return whatever is already in the
+# database, so costs are divided by the rows actually returned.
+#
+# "before" replays the previous request path: ORM entities loaded into
+# the session, then the route's response_model validated from
+# attributes (pydantic TypeAdapter, as FastAPI does) or
+# jsonable_encoder for dict routes, then JSONResponse (json.dumps).
+# "after" is the service function + ORJSONResponse.
+#
+# CPU is this process only (time.process_time: driver decoding, ORM,
+# validation, serialization), median of --repeat runs; Postgres time
+# shows up in wall only. Both bodies are decoded and compared, so a
+# speedup never hides a change in the payload.
+from bench import env
+
+env.setup()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import gc  # noqa: E402
+import json  # noqa: E402
+import statistics  # noqa: E402
+import time  # noqa: E402
+from pathlib import Path  # noqa: E402
+from uuid import uuid4  # noqa: E402
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, engine  # noqa: E402
+from app.core.responses import ORJSONResponse  # noqa: E402
+from app.models.models import (  # noqa: E402
+    Delivery,
+    GlobalInventory,
+    Order,
+    Product,
+    Refund,
+    User,
+)
+from app.schema.schemas import DeliveryAdminOut, ProductOut, RefundAdminOut  # noqa: E402
+from app.services.delivery_service import list_deliveries_admin  # noqa: E402
+from app.services.product_service import list_product_rows  # noqa: E402
+from app.services.refund_service import list_refunds  # noqa: E402
+from app.services.store_service import admin_catalog  # noqa: E402
+from bench.meta import git_meta  # noqa: E402
+
+BATCH = 2000
+
+products_out = TypeAdapter(list[ProductOut])
+refunds_out = TypeAdapter(list[RefundAdminOut])
+deliveries_out = TypeAdapter(list[DeliveryAdminOut])
+
+
+def _render_model(adapter: TypeAdapter, content) -> bytes:
+    # response_model route: validate, dump to JSON-able python, json.dumps
+    value = adapter.validate_python(content, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json")).body
+
+
+def _render_plain(content) -> bytes:
+    # no response_model: jsonable_encoder, json.dumps
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+# =====================================================
+# BEFORE (previous implementations)
+# =====================================================
+
+async def products_before(db):
+    res = await db.execute(select(Product).where(Product.is_active.is_(True)))
+    products = res.scalars().all()
+    return len(products), _render_model(products_out, products)
+
+
+async def catalog_before(db):
+    res = await db.execute(
+        select(
+            Product.id,
+            Product.name,
+            Product.price,
+            GlobalInventory.total_stock,
+            GlobalInventory.allocated_stock,
+            GlobalInventory.reserved_stock,
+        )
+        .join(GlobalInventory, GlobalInventory.product_id == Product.id)
+    )
+    rows = [
+        {
+            "product_id": r.id,
+            "name": r.name,
+            "price": float(r.price),
+            "total_stock": r.total_stock,
+            "allocated_stock": r.allocated_stock,
+            "reserved_stock": r.reserved_stock,
+            "available_stock": r.total_stock - r.allocated_stock - r.reserved_stock,
+        }
+        for r in res
+    ]
+    return len(rows), _render_plain(rows)
+
+
+async def refunds_before(db):
+    # the old selectinload(Refund.order) named a relationship Refund
+    # doesn't have; loading both entities is the working equivalent
+    res = await db.execute(
+        select(Refund, Order)
+        .join(Order, Order.id == Refund.order_id)
+        .order_by(Refund.created_at.desc())
+    )
+    rows = [
+        {
+            "id": r.id,
+            "order_id": r.order_id,
+            "reason": r.reason,
+            "status": r.status,
+            "created_at": r.created_at,
+            "amount": float(o.total),
+        }
+        for r, o in res
+    ]
+    return len(rows), _render_model(refunds_out, rows)
+
+
+async def deliveries_before(db):
+    res = await db.execute(
+        select(Delivery)
+        .options(selectinload(Delivery.order))
+        .order_by(Delivery.created_at.desc())
+    )
+    deliveries = res.scalars().all()
+    return len(deliveries), _render_model(deliveries_out, deliveries)
+
+
+# =====================================================
+# AFTER
+# =====================================================
+
+async def products_after(db):
+    rows = await list_product_rows(db)
+    return len(rows), ORJSONResponse(rows).body
+
+
+async def catalog_after(db):
+    rows = await admin_catalog(db)
+    return len(rows), ORJSONResponse(rows).body
+
+
+async def refunds_after(db):
+    rows = await list_refunds(db)
+    return len(rows), ORJSONResponse(rows).body
+
+
+async def deliveries_after(db):
+    rows = await list_deliveries_admin(db)
+    return len(rows), ORJSONResponse(rows).body
+
+
+LISTS = {
+    "products": (products_before, products_after),
+    "admin_catalog": (catalog_before, catalog_after),
+    "refunds_admin": (refunds_before, refunds_after),
+    "deliveries_admin": (deliveries_before, deliveries_after),
+}
+
+
+# =====================================================
+# FIXTURE / MEASURE
+# =====================================================
+
+async def _insert(db, model, rows: list[dict]):
+    for i in range(0, len(rows), BATCH):
+        await db.execute(insert(model), rows[i:i + BATCH])
+
+
+async def add_fixture(db, n: int):
+    user = uuid4()
+    products = [uuid4() for _ in range(n)]
+    orders = [uuid4() for _ in range(n)]
+
+    await _insert(db, User, [{"id": user, "name": "List Bench"}])
+    await _insert(db, Product, [
+        {
+            "id": p,
+            "name": f"List bench product {i}",
+            "description": "Fixture row for bench.list_rows " * 3,
+            "category": ("Electronics", "Home", "Books", "Toys")[i % 4],
+            "price": 10 + (i % 500) + 0.99,
+        }
+        for i, p in enumerate(products)
+    ])
+    await _insert(db, GlobalInventory, [
+        {"product_id": p, "total_stock": 100 + i % 50, "allocated_stock": i % 7, "reserved_stock": i % 3}
+        for i, p in enumerate(products)
+    ])
+    await _insert(db, Order, [
+        {"id": o, "user_id": user, "subtotal": 100 + i % 900, "total": 100 + i % 900}
+        for i, o in enumerate(orders)
+    ])
+    await _insert(db, Refund, [
+        {"id": uuid4(), "order_id": o, "reason": "Damaged on arrival", "status": "initiated"}
+        for o in orders
+    ])
+    await _insert(db, Delivery, [
+        {"id": uuid4(), "order_id": o, "user_id": user, "status": "pending"}
+        for o in orders
+    ])
+
+
+# added to the payload after the baseline: the ORM path has no value
+# for them, so they're left out of the comparison
+NEW_FIELDS = {"image_url"}
+
+
+def _decoded(body: bytes) -> list:
+    rows = [
+        {k: v for k, v in r.items() if k not in NEW_FIELDS}
+        for r in json.loads(body)
+    ]
+    return sorted(rows, key=lambda r: json.dumps(r, sort_keys=True))
+
+
+async def measure(db, fn, repeat: int) -> dict:
+    cpu, wall = [], []
+    for _ in range(repeat):
+        # fresh identity map per run, as per request
+        db.expunge_all()
+        gc.collect()
+        c0, w0 = time.process_time(), time.perf_counter()
+        rows, body = await fn(db)
+        cpu.append(time.process_time() - c0)
+        wall.append(time.perf_counter() - w0)
+
+    cpu_s = statistics.median(cpu)
+    return {
+        "rows": rows,
+        "bytes": len(body),
+        "cpu_ms": round(cpu_s * 1000, 2),
+        "wall_ms": round(statistics.median(wall) * 1000, 2),
+        "cpu_us_per_row": round(cpu_s * 1e6 / rows, 3) if rows else None,
+        "body": body,
+    }
+
+
+async def run(args) -> dict:
+    results = {}
+    async with AsyncSessionLocal() as db:
+        try:
+            await add_fixture(db, args.rows)
+            for name, (before_fn, after_fn) in LISTS.items():
+                if args.only and name not in args.only:
+                    continue
+                # one unmeasured call each: plan + statement caches
+                await before_fn(db)
+                await after_fn(db)
+
+                before = await measure(db, before_fn, args.repeat)
+                after = await measure(db, after_fn, args.repeat)
+                same = _decoded(before.pop("body")) == _decoded(after.pop("body"))
+                results[name] = {
+                    "before": before,
+                    "after": after,
+                    "speedup": (
+                        round(before["cpu_ms"] / after["cpu_ms"], 2)
+                        if after["cpu_ms"] else None
+                    ),
+                    "same_output": same,
+                }
+        finally:
+            await db.rollback()
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000, help="fixture rows per list")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--only", nargs="*", choices=list(LISTS))
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"{'list':<18} {'rows':>7} {'before µs/row':>14} {'after µs/row':>13} "
+          f"{'speedup':>8} {'KiB':>7}  same")
+    for name, r in results.items():
+        b, a = r["before"], r["after"]
+        print(f"{name:<18} {a['rows']:>7} {b['cpu_us_per_row']!s:>14} "
+              f"{a['cpu_us_per_row']!s:>13} {r['speedup']!s:>7}x "
+              f"{a['bytes'] / 1024:>7.0f}  {'yes' if r['same_output'] else 'NO'}")
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps({
+            "meta": {**git_meta(), "rows": args.rows, "repeat": args.repeat},
+            "lists": results,
+        }, indent=2))
+        print("Wrote", args.out)
+
+
+if __name__ == "__main__":
+    main()
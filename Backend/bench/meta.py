@@ -0,0 +1,19 @@
+# bench/meta.py
+#
+# Run metadata stamped into every result file.
+import subprocess
+
+
+def git_meta() -> dict:
+    def git(*cmd):
+        try:
+            return subprocess.run(
+                ["git", *cmd], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except Exception:
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+    }
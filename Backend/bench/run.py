@@ -0,0 +1,348 @@
+# bench/run.py
+#
+# Drives the API at a fixed concurrency and writes latency percentiles
+# to JSON, so runs can be compared across commits (bench.compare).
+#
+#   cd Backend
+#   python -m bench.seed
+#   python -m bench.run --concurrency 20 --requests 500 --out bench/results/$(git rev-parse --short HEAD).json
+#
+# By default the app runs in-process (httpx ASGITransport, lifespan
+# included) with the fake Gemini client. --base-url targets a server
+# started with `python -m bench.serve` instead (same fake, same env).
+#
+# Each scenario has an untimed `prepare` (e.g. fill the cart) and a
+# timed `call`. Every concurrent worker is its own seeded user, and
+# scenarios never share users, so carts don't interfere.
+from bench import env, fake_genai
+
+env.setup()
+fake_genai.install()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import json  # noqa: E402
+import platform  # noqa: E402
+import random  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+
+from bench.meta import git_meta  # noqa: E402
+from bench.seed import BENCH_NAMESPACE, admin_id, user_id  # noqa: E402
+from uuid import uuid5  # noqa: E402
+
+CHAT_MESSAGES = (
+    "Can you recommend a good laptop?",
+    "What's in my cart?",
+    "Show me some products under 2000",
+    "Which address will my order go to?",
+    "Hi, how are you?",
+)
+
+
+def product_id(n: int):
+    return uuid5(BENCH_NAMESPACE, f"product-{n}")
+
+
+def address_id(n: int):
+    return uuid5(BENCH_NAMESPACE, f"address-{n}")
+
+
+def store_id(n: int):
+    return uuid5(BENCH_NAMESPACE, f"store-{n}")
+
+
+class Worker:
+    def __init__(self, n: int, *, role: str = "customer", seed: int = 0):
+        self.n = n
+        self.user_id = admin_id() if role == "admin" else user_id(n)
+        self.headers = {"Authorization": f"Bearer {env.token(self.user_id, role=role)}"}
+        self.rng = random.Random(seed * 100_003 + n)
+        self.state: dict = {}
+
+
+# =====================================================
+# SCENARIOS
+# =====================================================
+
+class Scenario:
+    name = ""
+    role = "customer"
+
+    def __init__(self, args):
+        self.args = args
+
+    async def setup(self, client: httpx.AsyncClient, w: Worker):
+        pass
+
+    async def prepare(self, client: httpx.AsyncClient, w: Worker):
+        pass
+
+    async def call(self, client: httpx.AsyncClient, w: Worker) -> httpx.Response:
+        raise NotImplementedError
+
+    def _stocked(self, w: Worker) -> str:
+        return str(product_id(w.rng.randrange(self.args.store_products)))
+
+
+class CartScenario(Scenario):
+    name = "cart"
+
+    async def setup(self, client, w):
+        await client.delete("/cart/", headers=w.headers)
+
+    async def call(self, client, w):
+        op = w.rng.random()
+        if op < 0.5:
+            return await client.post(
+                "/cart/items",
+                json={"product_id": self._stocked(w), "quantity": 1},
+                headers=w.headers,
+            )
+        if op < 0.8:
+            return await client.get("/cart/", headers=w.headers)
+        return await client.get("/cart/offers", headers=w.headers)
+
+
+class CheckoutScenario(Scenario):
+    name = "checkout"
+
+    async def prepare(self, client, w):
+        for _ in range(w.rng.randint(1, 3)):
+            await client.post(
+                "/cart/items",
+                json={"product_id": self._stocked(w), "quantity": 1},
+                headers=w.headers,
+            )
+
+    async def call(self, client, w):
+        if w.rng.random() < 0.3:
+            payload = {
+                "fulfillment_type": "pickup",
+                "store_id": str(store_id(w.rng.randrange(self.args.stores))),
+            }
+        else:
+            payload = {"fulfillment_type": "delivery", "address_id": str(address_id(w.n))}
+        return await client.post("/cart/checkout", json=payload, headers=w.headers)
+
+
+class ChatScenario(Scenario):
+    name = "chat"
+
+    async def setup(self, client, w):
+        res = await client.post("/support/conversations", headers=w.headers)
+        res.raise_for_status()
+        w.state["conversation_id"] = res.json()["conversation_id"]
+
+    async def call(self, client, w):
+        return await client.post(
+            f"/support/conversations/{w.state['conversation_id']}/messages",
+            json={"content": w.rng.choice(CHAT_MESSAGES)},
+            headers=w.headers,
+        )
+
+
+class RecommendationsScenario(Scenario):
+    name = "recommendations"
+
+    async def call(self, client, w):
+        return await client.get("/recommendations/", headers=w.headers)
+
+
+class StoreSearchScenario(Scenario):
+    name = "store_search"
+
+    async def setup(self, client, w):
+        await client.delete("/cart/", headers=w.headers)
+        await client.post(
+            "/cart/items",
+            json={"product_id": self._stocked(w), "quantity": 1},
+            headers=w.headers,
+        )
+
+    async def call(self, client, w):
+        if w.rng.random() < 0.5:
+            return await client.get("/cart/pickup/stores", headers=w.headers)
+        return await client.get(
+            f"/stores/{store_id(w.rng.randrange(self.args.stores))}/inventory",
+            headers=w.headers,
+        )
+
+
+class AdminKpisScenario(Scenario):
+    name = "admin_kpis"
+    role = "admin"
+
+    async def call(self, client, w):
+        op = w.rng.random()
+        if op < 0.4:
+            return await client.get("/admin/summary", headers=w.headers)
+        if op < 0.7:
+            return await client.get("/admin/kpis/daily", headers=w.headers)
+        if op < 0.9:
+            return await client.get(
+                f"/admin/kpis/stores/{store_id(w.rng.randrange(self.args.stores))}",
+                headers=w.headers,
+            )
+        return await client.get("/admin/inventory/stats", headers=w.headers)
+
+
+SCENARIOS = {
+    s.name: s
+    for s in (
+        CartScenario,
+        CheckoutScenario,
+        ChatScenario,
+        RecommendationsScenario,
+        StoreSearchScenario,
+        AdminKpisScenario,
+    )
+}
+
+
+# =====================================================
+# RUNNER
+# =====================================================
+
+def summarize(latencies: list[float], errors: int, wall: float, db_queries: list[int]) -> dict:
+    ms = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    total = len(latencies) + errors
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+        "mean_ms": round(float(ms.mean()), 2),
+        "max_ms": round(float(ms.max()), 2),
+        # X-DB-Queries is only sent with APP_ENV=dev
+        "db_queries_mean": round(float(np.mean(db_queries)), 2) if db_queries else None,
+    }
+
+
+async def run_scenario(client, scenario: Scenario, *, offset: int) -> dict:
+    args = scenario.args
+    workers = [
+        Worker(offset + i, role=scenario.role, seed=args.seed)
+        for i in range(args.concurrency)
+    ]
+    for w in workers:
+        await scenario.setup(client, w)
+
+    remaining = args.warmup + args.requests
+    latencies: list[float] = []
+    db_queries: list[int] = []
+    errors = 0
+    started = None
+
+    async def loop(w: Worker):
+        nonlocal remaining, errors, started
+        while remaining > 0:
+            remaining -= 1
+            measured = remaining < args.requests
+            if measured and started is None:
+                started = time.perf_counter()
+
+            await scenario.prepare(client, w)
+            t0 = time.perf_counter()
+            try:
+                res = await scenario.call(client, w)
+                ok = res.status_code < 400
+            except Exception as e:
+                print(f"{scenario.name} failed:", e)
+                res, ok = None, False
+            elapsed = time.perf_counter() - t0
+
+            if not measured:
+                continue
+            if ok:
+                latencies.append(elapsed)
+                if "x-db-queries" in res.headers:
+                    db_queries.append(int(res.headers["x-db-queries"]))
+            else:
+                errors += 1
+                if res is not None and errors <= 3:
+                    print(f"{scenario.name} {res.status_code}:", res.text[:300])
+
+    await asyncio.gather(*(loop(w) for w in workers))
+    wall = time.perf_counter() - started if started else 0.0
+    return summarize(latencies, errors, wall, db_queries)
+
+
+async def run(args) -> dict:
+    fake_genai.configure(llm_ms=args.llm_ms, embed_ms=args.embed_ms, seed=args.seed)
+
+    results = {
+        "meta": {
+            **git_meta(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "mode": "remote" if args.base_url else "in-process",
+            "args": vars(args),
+        },
+        "scenarios": {},
+    }
+
+    async def drive(client):
+        for i, name in enumerate(args.scenarios):
+            scenario = SCENARIOS[name](args)
+            # disjoint user ranges per scenario
+            summary = await run_scenario(client, scenario, offset=i * args.concurrency)
+            results["scenarios"][name] = summary
+            print(
+                f"{name:<16} {summary['throughput_rps']:>8} rps  "
+                f"p50 {summary['p50_ms']:>8}  p95 {summary['p95_ms']:>8}  "
+                f"p99 {summary['p99_ms']:>8}  errors {summary['errors']}"
+            )
+
+    timeout = httpx.Timeout(args.timeout)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout) as client:
+            await drive(client)
+    else:
+        from app.main import app
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=timeout
+            ) as client:
+                await drive(client)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    # in-process only; with --base-url pass them to bench.serve
+    parser.add_argument("--llm-ms", type=float, default=800)
+    parser.add_argument("--embed-ms", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60)
+    # must match the seed
+    parser.add_argument("--stores", type=int, default=50)
+    parser.add_argument("--store-products", type=int, default=200)
+    parser.add_argument("--base-url")
+    parser.add_argument("--out", type=Path)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, indent=2, default=str))
+        print("Wrote", args.out)
+
+
+if __name__ == "__main__":
+    main()
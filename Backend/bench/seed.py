@@ -0,0 +1,307 @@
+# bench/seed.py
+#
+# Rebuilds the benchmark database from scratch, deterministically.
+#
+#   cd Backend
+#   python -m bench.seed --users 2000 --products 5000 --stores 50 --orders 20000
+#
+# Needs a local Postgres with PostGIS and pgvector, e.g.
+#   docker run -p 5432:5432 -e POSTGRES_PASSWORD=postgres -e POSTGRES_DB=bench \
+#       ankane/pgvector (+ postgis) / imresamu/postgis-pgvector
+#
+# Product names / categories / price ranges come from
+# Resources/dbms mockdata/products.csv, cycled and jittered up to
+# --products. Embeddings are the fake client's pseudo-embeddings, so
+# vector search returns the same neighbours on every run.
+#
+# User ids are uuid5(BENCH_NAMESPACE, "user-<n>"): bench.run derives
+# the same ids (and tokens) without reading the database.
+from bench import env, fake_genai
+
+env.setup()
+fake_genai.install()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import csv  # noqa: E402
+import random  # noqa: E402
+import time  # noqa: E402
+from datetime import datetime, timedelta, time as dtime  # noqa: E402
+from pathlib import Path  # noqa: E402
+from uuid import NAMESPACE_URL, uuid5  # noqa: E402
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.models.models import (  # noqa: E402
+    Address,
+    Embedding,
+    GlobalInventory,
+    Offer,
+    Order,
+    OrderItem,
+    Product,
+    Store,
+    StoreInventory,
+    StoreWorkingHour,
+    User,
+)
+from app.services.kpi_service import reconcile_kpis  # noqa: E402
+
+BENCH_NAMESPACE = uuid5(NAMESPACE_URL, "https://bench.local/")
+MOCKDATA = Path(__file__).resolve().parents[2] / "Resources" / "dbms mockdata"
+BATCH = 2000
+
+CITIES = (
+    ("Mumbai", "Maharashtra", 19.076, 72.877),
+    ("Pune", "Maharashtra", 18.520, 73.856),
+    ("Nagpur", "Maharashtra", 21.146, 79.088),
+    ("Nashik", "Maharashtra", 19.997, 73.789),
+    ("Bengaluru", "Karnataka", 12.972, 77.594),
+    ("Delhi", "Delhi", 28.704, 77.102),
+)
+
+ORDER_STATUSES = (
+    ("delivered", 0.55),
+    ("paid", 0.20),
+    ("shipped", 0.10),
+    ("pending", 0.08),
+    ("cancelled", 0.07),
+)
+
+
+def user_id(n: int):
+    return uuid5(BENCH_NAMESPACE, f"user-{n}")
+
+
+def admin_id():
+    return uuid5(BENCH_NAMESPACE, "admin")
+
+
+def _point(lat: float, lon: float) -> str:
+    return f"SRID=4326;POINT({lon:.6f} {lat:.6f})"
+
+
+def _templates() -> list[dict]:
+    with open(MOCKDATA / "products.csv", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+# =====================================================
+# SCHEMA
+# =====================================================
+
+async def reset_schema():
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS postgis"))
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _insert(db, model, rows: list[dict]):
+    for i in range(0, len(rows), BATCH):
+        await db.execute(insert(model), rows[i:i + BATCH])
+
+
+# =====================================================
+# DATA
+# =====================================================
+
+def build(rng: random.Random, args) -> dict[type, list[dict]]:
+    now = datetime.utcnow().replace(microsecond=0)
+    data: dict[type, list[dict]] = {}
+
+    # ----- users / addresses -----
+    users = [{"id": admin_id(), "name": "Bench Admin", "role": "admin", "location": None}]
+    addresses = []
+    for n in range(args.users):
+        city, state, lat, lon = rng.choice(CITIES)
+        uid = user_id(n)
+        users.append({
+            "id": uid,
+            "name": f"Bench User {n}",
+            "role": "customer",
+            "location": _point(lat + rng.uniform(-0.1, 0.1), lon + rng.uniform(-0.1, 0.1)),
+        })
+        addresses.append({
+            "id": uuid5(BENCH_NAMESPACE, f"address-{n}"),
+            "user_id": uid,
+            "label": "Home",
+            "address_line1": f"{n} Bench Road",
+            "city": city,
+            "state": state,
+            "pincode": f"{400000 + n % 99999}",
+            "is_default": True,
+        })
+    data[User] = users
+    data[Address] = addresses
+
+    # ----- products -----
+    templates = _templates()
+    products, global_inventory = [], []
+    for n in range(args.products):
+        t = templates[n % len(templates)]
+        pid = uuid5(BENCH_NAMESPACE, f"product-{n}")
+        products.append({
+            "id": pid,
+            "name": f"{t['name']} #{n}",
+            "description": t["description"],
+            "category": t["category"],
+            "price": round(float(t["price"]) * rng.uniform(0.5, 1.5), 2),
+            "rating": t["rating"],
+            "images": [t["image_url"]],
+            "created_at": now - timedelta(minutes=n),
+        })
+        # effectively unlimited: checkout must never run out mid-benchmark,
+        # while the sum over all products still fits inventory_rollup's
+        # INTEGER total_items
+        global_inventory.append({"product_id": pid, "total_stock": 100_000})
+    data[Product] = products
+    data[GlobalInventory] = global_inventory
+
+    # ----- stores / hours / store inventory -----
+    stores, hours, store_inventory = [], [], []
+    stocked = products[: args.store_products]
+    for n in range(args.stores):
+        city, state, lat, lon = CITIES[n % len(CITIES)]
+        sid = uuid5(BENCH_NAMESPACE, f"store-{n}")
+        stores.append({
+            "id": sid,
+            "name": f"Bench Store {n}",
+            "city": city,
+            "state": state,
+            "location": _point(lat + rng.uniform(-0.2, 0.2), lon + rng.uniform(-0.2, 0.2)),
+        })
+        hours += [
+            {"store_id": sid, "day_of_week": d, "opens_at": dtime(9), "closes_at": dtime(21)}
+            for d in range(7)
+        ]
+        store_inventory += [
+            {"store_id": sid, "product_id": p["id"], "in_hand_stock": 1_000_000}
+            for p in stocked
+        ]
+    data[Store] = stores
+    data[StoreWorkingHour] = hours
+    data[StoreInventory] = store_inventory
+
+    # ----- offers -----
+    data[Offer] = [
+        {
+            "title": "Bench 10% off",
+            "min_cart_value": 1000,
+            "percentage_off": 10,
+            "amount_off": None,
+            "max_discount": 500,
+            "priority": 1,
+            "stackable": True,
+            "starts_at": now - timedelta(days=365),
+            "ends_at": now + timedelta(days=365),
+            "created_by": admin_id(),
+        },
+        {
+            "title": "Bench flat 200",
+            "min_cart_value": 2500,
+            "percentage_off": None,
+            "amount_off": 200,
+            "max_discount": None,
+            "priority": 2,
+            "stackable": False,
+            "starts_at": now - timedelta(days=365),
+            "ends_at": now + timedelta(days=365),
+            "created_by": admin_id(),
+        },
+    ]
+
+    # ----- historical orders (KPIs, recommendations) -----
+    statuses, weights = zip(*ORDER_STATUSES)
+    orders, order_items = [], []
+    for n in range(args.orders):
+        u = rng.randrange(args.users)
+        lines = rng.sample(products, k=rng.randint(1, 4))
+        oid = uuid5(BENCH_NAMESPACE, f"order-{n}")
+        subtotal = 0.0
+        for p in lines:
+            qty = rng.randint(1, 3)
+            subtotal += p["price"] * qty
+            order_items.append({
+                "id": uuid5(BENCH_NAMESPACE, f"order-item-{n}-{p['id']}"),
+                "order_id": oid,
+                "product_id": p["id"],
+                "quantity": qty,
+                "price": p["price"],
+                "fulfillment_source": "global",
+                "fulfillment_ref_id": p["id"],
+            })
+        created = now - timedelta(minutes=rng.randrange(180 * 24 * 60))
+        orders.append({
+            "id": oid,
+            "user_id": user_id(u),
+            "address_id": uuid5(BENCH_NAMESPACE, f"address-{u}"),
+            "status": rng.choices(statuses, weights)[0],
+            "subtotal": round(subtotal, 2),
+            "total": round(subtotal, 2),
+            "created_at": created,
+            "updated_at": created,
+        })
+    data[Order] = orders
+    data[OrderItem] = order_items
+
+    # ----- embeddings -----
+    embeddings = [
+        {
+            "source_type": "product",
+            "source_id": p["id"],
+            "embedding": fake_genai.pseudo_embedding(f"{p['name']} {p['description']}"),
+        }
+        for p in products
+    ]
+    embeddings += [
+        {
+            "source_type": "user",
+            "source_id": user_id(n),
+            "embedding": fake_genai.pseudo_embedding(f"user-{n}"),
+        }
+        # a share of users without history exercises the fallback path
+        for n in range(args.users)
+        if n % 4
+    ]
+    data[Embedding] = embeddings
+
+    return data
+
+
+async def seed(args):
+    rng = random.Random(args.seed)
+
+    t0 = time.perf_counter()
+    await reset_schema()
+    data = build(rng, args)
+
+    async with AsyncSessionLocal() as db:
+        for model, rows in data.items():
+            await _insert(db, model, rows)
+            print(f"{model.__tablename__:<22} {len(rows):>9}")
+        await db.commit()
+
+        await reconcile_kpis(db)
+        await db.commit()
+
+    await engine.dispose()
+    print(f"Seeded in {time.perf_counter() - t0:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--stores", type=int, default=50)
+    parser.add_argument("--store-products", type=int, default=200,
+                        help="products stocked in every store (pickup checkout)")
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(seed(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench/serve.py
+#
+# The app under the benchmark environment (fake Gemini, bench DB/Redis),
+# for `python -m bench.run --base-url http://127.0.0.1:8000`.
+#
+#   cd Backend
+#   python -m bench.serve --workers 4
+import argparse
+import os
+
+from bench import env, fake_genai
+
+env.setup()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--llm-ms", type=float)
+    parser.add_argument("--embed-ms", type=float)
+    args = parser.parse_args()
+
+    # read by fake_genai in every worker process
+    if args.llm_ms is not None:
+        os.environ["BENCH_LLM_MS"] = str(args.llm_ms)
+    if args.embed_ms is not None:
+        os.environ["BENCH_EMBED_MS"] = str(args.embed_ms)
+
+    import uvicorn
+
+    uvicorn.run(
+        "bench.serve:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level="warning",
+    )
+
+
+def __getattr__(name):
+    # uvicorn imports "bench.serve:app" in each worker
+    if name == "app":
+        fake_genai.install()
+        fake_genai.configure(
+            llm_ms=float(os.environ.get("BENCH_LLM_MS", 800)),
+            embed_ms=float(os.environ.get("BENCH_EMBED_MS", 60)),
+        )
+        from app.main import app
+
+        return app
+    raise AttributeError(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,747 @@
+# bench/synth.py
+#
+# Production-volume synthetic data, shaped like Resources/dbms mockdata.
+#
+#   cd Backend
+#   python -m bench.synth --users 1000000 --products 200000 --orders 5000000 --workers 8
+#
+# 1. profile: the mock CSVs are read once and turned into sampling
+#    distributions (names, cities, category mix, log-normal prices per
+#    category, ratings, order status / payment mix, items per order,
+#    quantities, chat turns per user, complaint / return texts).
+# 2. shards: every table family is cut into fixed-size shards; a shard's
+#    RNG is seeded from (seed, family, shard number), so the output is
+#    identical for any --workers.
+# 3. load: each shard is rendered to CSV in memory and streamed with
+#    COPY (asyncpg copy_to_table) on its own connection, in one
+#    transaction per shard. Families run in dependency phases; shards
+#    inside a phase run in parallel processes.
+#
+# Cross-shard references use uuid5 ids derived from the row number
+# (user-<n>, product-<n>, store-<n>, address-<n>, order-<n>), the same
+# scheme as bench.seed, so bench.run works against either dataset.
+# Child rows (items, messages, ...) get ids from the shard's RNG.
+from bench import env
+
+env.setup()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import csv  # noqa: E402
+import io  # noqa: E402
+import json  # noqa: E402
+import math  # noqa: E402
+import os  # noqa: E402
+import re  # noqa: E402
+import time  # noqa: E402
+from collections import Counter, defaultdict  # noqa: E402
+from concurrent.futures import ProcessPoolExecutor  # noqa: E402
+from dataclasses import dataclass  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+from uuid import UUID, uuid5  # noqa: E402
+
+import asyncpg  # noqa: E402
+import numpy as np  # noqa: E402
+
+from bench.seed import BENCH_NAMESPACE, MOCKDATA, admin_id, user_id  # noqa: E402
+
+SHARD_SIZE = 25_000
+EMBEDDING_DIM = 768
+
+# mock CSVs have no coordinates
+CITY_COORDS = {
+    "Mumbai": (19.076, 72.877),
+    "Pune": (18.520, 73.856),
+    "Nagpur": (21.146, 79.088),
+    "Nashik": (19.997, 73.789),
+    "Aurangabad": (19.876, 75.343),
+    "Surat": (21.170, 72.831),
+    "Ahmedabad": (23.023, 72.571),
+    "Delhi": (28.704, 77.102),
+    "Bengaluru": (12.972, 77.594),
+    "Hyderabad": (17.385, 78.487),
+}
+
+ORDER_STATUS_MAP = {
+    "pending": "pending",
+    "shipped": "shipped",
+    "delivered": "delivered",
+    "cancelled": "cancelled",
+    "returned": "delivered",  # + refund row
+}
+COMPLAINT_STATUS_MAP = {"open": "open", "closed": "resolved", "in progress": "in_progress"}
+REFUND_STATUS_MAP = {
+    "requested": "initiated",
+    "approved": "approved",
+    "rejected": "rejected",
+    "completed": "completed",
+}
+
+# browsing events are not in the mock data
+BROWSE_EVENTS = (
+    ("view_product", 0.60),
+    ("click_product", 0.20),
+    ("search", 0.10),
+    ("add_to_cart", 0.08),
+    ("remove_from_cart", 0.02),
+)
+
+
+def _id(kind: str, n: int) -> UUID:
+    return uuid5(BENCH_NAMESPACE, f"{kind}-{n}")
+
+
+def _read(name: str) -> list[dict]:
+    with open(MOCKDATA / name, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def _weights(values) -> tuple[list, np.ndarray]:
+    counts = Counter(values)
+    keys = sorted(counts)
+    p = np.array([counts[k] for k in keys], dtype=float)
+    return keys, p / p.sum()
+
+
+def _ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.split(".")[0])
+
+
+# =====================================================
+# PROFILE (learned from the mock CSVs)
+# =====================================================
+
+@dataclass(slots=True)
+class Profile:
+    first_names: list
+    last_names: list
+    cities: list
+    city_p: np.ndarray
+
+    categories: list
+    category_p: np.ndarray
+    log_price_mu: dict
+    log_price_sigma: float
+    rating_mu: float
+    rating_sigma: float
+    description_templates: list
+    image_urls: list
+
+    order_statuses: list
+    order_status_p: np.ndarray
+    payment_methods: list
+    payment_method_p: np.ndarray
+    order_age_days: int
+    items_per_order: list
+    items_per_order_p: np.ndarray
+    quantities: list
+    quantity_p: np.ndarray
+
+    chat_turns: list
+    turns_per_user: list
+    turns_per_user_p: np.ndarray
+
+    complaint_texts: list
+    complaint_statuses: list
+    complaint_status_p: np.ndarray
+
+    return_reasons: list
+    refund_statuses: list
+    refund_status_p: np.ndarray
+
+
+def learn_profile() -> Profile:
+    users = _read("users.csv")
+    products = _read("products.csv")
+    orders = _read("orders.csv")
+    items = _read("order_items.csv")
+    chats = _read("chat_logs_updated.csv")
+    complaints = _read("complaints_updated.csv")
+    returns = _read("returns.csv")
+
+    names = [u["name"].split() for u in users]
+    cities, city_p = _weights(
+        (u["city"], u["state"]) for u in users if u["city"] in CITY_COORDS
+    )
+
+    categories, category_p = _weights(p["category"] for p in products)
+    log_prices = defaultdict(list)
+    for p in products:
+        log_prices[p["category"]].append(math.log(float(p["price"])))
+    all_logs = [x for xs in log_prices.values() for x in xs]
+    ratings = [float(p["rating"]) for p in products]
+
+    # "High quality product number 7" → "High quality product number {n}"
+    templates = sorted({re.sub(r"\d+", "{n}", p["description"]) for p in products})
+
+    order_statuses, order_status_p = _weights(o["status"].lower() for o in orders)
+    payment_methods, payment_method_p = _weights(o["payment_method"] for o in orders)
+    dates = [_ts(o["order_date"]) for o in orders]
+
+    per_order = Counter(i["order_id"] for i in items)
+    items_per_order, items_per_order_p = _weights(per_order.values())
+    quantities, quantity_p = _weights(int(i["quantity"]) for i in items)
+
+    per_user = Counter(c["user_id"] for c in chats)
+    turns_per_user, turns_per_user_p = _weights(per_user.values())
+
+    complaint_statuses, complaint_status_p = _weights(
+        COMPLAINT_STATUS_MAP.get(c["status"].lower(), "open") for c in complaints
+    )
+    refund_statuses, refund_status_p = _weights(
+        REFUND_STATUS_MAP.get(r["status"].lower(), "initiated") for r in returns
+    )
+
+    return Profile(
+        first_names=sorted({n[0] for n in names}),
+        last_names=sorted({n[-1] for n in names if len(n) > 1}),
+        cities=cities,
+        city_p=city_p,
+        categories=categories,
+        category_p=category_p,
+        log_price_mu={c: float(np.mean(v)) for c, v in log_prices.items()},
+        # per-category samples are tiny; use the pooled spread
+        log_price_sigma=float(np.std(all_logs)) or 0.5,
+        rating_mu=float(np.mean(ratings)),
+        rating_sigma=float(np.std(ratings)) or 0.5,
+        description_templates=templates,
+        image_urls=sorted({p["image_url"] for p in products}),
+        order_statuses=order_statuses,
+        order_status_p=order_status_p,
+        payment_methods=payment_methods,
+        payment_method_p=payment_method_p,
+        order_age_days=max((max(dates) - min(dates)).days, 30),
+        items_per_order=items_per_order,
+        items_per_order_p=items_per_order_p,
+        quantities=quantities,
+        quantity_p=quantity_p,
+        chat_turns=[
+            (c["user_message"], c["bot_response"], c["intent_detected"]) for c in chats
+        ],
+        turns_per_user=turns_per_user,
+        turns_per_user_p=turns_per_user_p,
+        complaint_texts=sorted({c["description"] for c in complaints}),
+        complaint_statuses=complaint_statuses,
+        complaint_status_p=complaint_status_p,
+        return_reasons=sorted({r["reason"] for r in returns}),
+        refund_statuses=refund_statuses,
+        refund_status_p=refund_status_p,
+    )
+
+
+# =====================================================
+# SHARD GENERATORS
+# =====================================================
+# Each returns {table: (columns, rows)} in FK-safe insertion order.
+
+class Tables(dict):
+    # one column list per table per shard
+    def add(self, table: str, columns: tuple, row: tuple):
+        self.setdefault(table, (columns, []))[1].append(row)
+
+
+def _uuid(rng) -> UUID:
+    return UUID(bytes=rng.bytes(16), version=4)
+
+
+def _point(lat: float, lon: float) -> str:
+    return f"SRID=4326;POINT({lon:.6f} {lat:.6f})"
+
+
+def _vector(v) -> str:
+    return "[" + ",".join(f"{x:.5f}" for x in v) + "]"
+
+
+def _unit_vectors(rng, n: int) -> np.ndarray:
+    m = rng.standard_normal((n, EMBEDDING_DIM)).astype(np.float32)
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+def catalog(profile: Profile, cfg: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (category index, list price) for every product, from one RNG stream,
+    so order shards price lines exactly like the product shards do.
+    """
+    key = (cfg["seed"], cfg["products"])
+    if key not in _CATALOG:
+        rng = np.random.default_rng([cfg["seed"], 0])
+        n = cfg["products"]
+        cat_idx = rng.choice(len(profile.categories), n, p=profile.category_p)
+        mu = np.array([profile.log_price_mu[c] for c in profile.categories])
+        prices = np.exp(mu[cat_idx] + profile.log_price_sigma * rng.standard_normal(n))
+        _CATALOG[key] = (cat_idx, np.round(prices, 2))
+    return _CATALOG[key]
+
+
+_CATALOG: dict = {}
+
+
+def gen_users(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    out = Tables()
+    n = end - start
+    first = rng.choice(profile.first_names, n)
+    last = rng.choice(profile.last_names, n)
+    city_idx = rng.choice(len(profile.cities), n, p=profile.city_p)
+    jitter = rng.uniform(-0.15, 0.15, (n, 2))
+    vectors = _unit_vectors(rng, n) if cfg["embeddings"] else None
+
+    if start == 0:
+        out.add(
+            "users",
+            ("id", "name", "role", "location"),
+            (admin_id(), "Bench Admin", "admin", None),
+        )
+
+    for i in range(n):
+        k = start + i
+        city, state = profile.cities[city_idx[i]]
+        lat, lon = CITY_COORDS[city]
+        out.add(
+            "users",
+            ("id", "name", "role", "location"),
+            (user_id(k), f"{first[i]} {last[i]}", "customer",
+             _point(lat + jitter[i, 0], lon + jitter[i, 1])),
+        )
+        out.add(
+            "addresses",
+            ("id", "user_id", "label", "address_line1", "city", "state", "pincode", "is_default"),
+            (_id("address", k), user_id(k), "Home", f"{k % 999 + 1} Main Road",
+             city, state, str(400000 + k % 99999), True),
+        )
+        # a quarter of users have no history yet (recommendation fallback)
+        if vectors is not None and k % 4:
+            out.add(
+                "embeddings",
+                ("id", "source_type", "source_id", "embedding"),
+                (_uuid(rng), "user", user_id(k), _vector(vectors[i])),
+            )
+    return out
+
+
+def gen_products(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    out = Tables()
+    n = end - start
+    cat_idx, prices = catalog(profile, cfg)
+    ratings = np.clip(rng.normal(profile.rating_mu, profile.rating_sigma, n), 1, 5)
+    stock = rng.integers(50, 500, n) * cfg["stock_multiplier"]
+    vectors = _unit_vectors(rng, n) if cfg["embeddings"] else None
+    now = cfg["now"]
+
+    for i in range(n):
+        k = start + i
+        category = profile.categories[cat_idx[k]]
+        pid = _id("product", k)
+        template = profile.description_templates[k % len(profile.description_templates)]
+        image = profile.image_urls[k % len(profile.image_urls)]
+        out.add(
+            "products",
+            ("id", "name", "description", "category", "price", "rating", "images", "created_at"),
+            (pid, f"{category} item {k}", template.format(n=k), category,
+             f"{prices[k]:.2f}", f"{ratings[i]:.1f}", '{"%s"}' % image,
+             now - timedelta(minutes=k)),
+        )
+        out.add(
+            "global_inventory",
+            ("product_id", "total_stock"),
+            (pid, int(stock[i])),
+        )
+        if vectors is not None:
+            out.add(
+                "embeddings",
+                ("id", "source_type", "source_id", "embedding"),
+                (_uuid(rng), "product", pid, _vector(vectors[i])),
+            )
+    return out
+
+
+def gen_stores(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    out = Tables()
+    for k in range(start, end):
+        city, state = profile.cities[rng.choice(len(profile.cities), p=profile.city_p)]
+        lat, lon = CITY_COORDS[city]
+        sid = _id("store", k)
+        out.add(
+            "stores",
+            ("id", "name", "city", "state", "location"),
+            (sid, f"{city} Store {k}", city, state,
+             _point(lat + rng.uniform(-0.25, 0.25), lon + rng.uniform(-0.25, 0.25))),
+        )
+        for day in range(7):
+            out.add(
+                "store_working_hours",
+                ("id", "store_id", "day_of_week", "opens_at", "closes_at", "is_closed"),
+                (_uuid(rng), sid, day, "09:00", "21:00", day == 6 and k % 5 == 0),
+            )
+    return out
+
+
+def gen_store_inventory(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    # every store stocks the first --store-products products (bench.run
+    # pickup checkouts rely on it) plus a random slice of the catalog
+    out = Tables()
+    extra = min(cfg["store_extra_products"], max(cfg["products"] - cfg["store_products"], 0))
+    for k in range(start, end):
+        sid = _id("store", k)
+        stocked = set(range(min(cfg["store_products"], cfg["products"])))
+        if extra:
+            stocked.update(
+                rng.choice(
+                    np.arange(cfg["store_products"], cfg["products"]), extra, replace=False
+                ).tolist()
+            )
+        qty = rng.integers(5, 200, len(stocked)) * cfg["stock_multiplier"]
+        for p, q in zip(sorted(stocked), qty):
+            out.add(
+                "store_inventory",
+                ("store_id", "product_id", "in_hand_stock"),
+                (sid, _id("product", p), int(q)),
+            )
+    return out
+
+
+def gen_orders(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    out = Tables()
+    n = end - start
+    now = cfg["now"]
+    _, list_prices = catalog(profile, cfg)
+    users = rng.integers(0, cfg["users"], n)
+    status_idx = rng.choice(len(profile.order_statuses), n, p=profile.order_status_p)
+    method_idx = rng.choice(len(profile.payment_methods), n, p=profile.payment_method_p)
+    n_items = rng.choice(profile.items_per_order, n, p=profile.items_per_order_p)
+    ages = rng.uniform(0, profile.order_age_days * 86400, n)
+    # popularity is skewed: a few products sell most
+    popular = np.minimum(
+        rng.zipf(1.3, int(n_items.sum())) - 1, cfg["products"] - 1
+    )
+    line = 0
+
+    for i in range(n):
+        k = start + i
+        u = int(users[i])
+        oid = _id("order", k)
+        raw_status = profile.order_statuses[status_idx[i]]
+        status = ORDER_STATUS_MAP.get(raw_status, "pending")
+        created = now - timedelta(seconds=float(ages[i]))
+
+        products = dict.fromkeys(int(p) for p in popular[line:line + n_items[i]])
+        line += n_items[i]
+        subtotal = 0.0
+        rows = []
+        for p in products:
+            qty = int(rng.choice(profile.quantities, p=profile.quantity_p))
+            # price at order time: list price ± 10% (sales, repricing)
+            price = round(float(list_prices[p]) * rng.uniform(0.9, 1.1), 2)
+            subtotal += price * qty
+            rows.append((_uuid(rng), oid, _id("product", p), qty, f"{price:.2f}",
+                         "global", _id("product", p)))
+
+        out.add(
+            "orders",
+            ("id", "user_id", "address_id", "fulfillment_type", "status",
+             "subtotal", "discount_total", "total", "created_at", "updated_at"),
+            (oid, user_id(u), _id("address", u), "delivery", status,
+             f"{subtotal:.2f}", "0", f"{subtotal:.2f}", created, created),
+        )
+        for row in rows:
+            out.add(
+                "order_items",
+                ("id", "order_id", "product_id", "quantity", "price",
+                 "fulfillment_source", "fulfillment_ref_id"),
+                row,
+            )
+        out.add(
+            "user_events",
+            ("id", "user_id", "event_type", "order_id", "created_at"),
+            (_uuid(rng), user_id(u), "order_created", oid, created),
+        )
+
+        if status != "pending" and status != "cancelled":
+            method = profile.payment_methods[method_idx[i]]
+            out.add(
+                "payments",
+                ("id", "order_id", "provider", "amount", "status", "created_at"),
+                (_uuid(rng), oid, method, f"{subtotal:.2f}", "success", created),
+            )
+
+        if raw_status == "returned":
+            refund_status = profile.refund_statuses[
+                rng.choice(len(profile.refund_statuses), p=profile.refund_status_p)
+            ]
+            out.add(
+                "refunds",
+                ("id", "order_id", "reason", "status", "created_at"),
+                (_uuid(rng), oid, rng.choice(profile.return_reasons), refund_status,
+                 created + timedelta(days=3)),
+            )
+
+        if rng.random() < cfg["complaint_rate"]:
+            complaint_status = profile.complaint_statuses[
+                rng.choice(len(profile.complaint_statuses), p=profile.complaint_status_p)
+            ]
+            out.add(
+                "complaints",
+                ("id", "user_id", "order_id", "description", "status", "created_at"),
+                (_uuid(rng), user_id(u), oid, rng.choice(profile.complaint_texts),
+                 complaint_status, created + timedelta(days=2)),
+            )
+    return out
+
+
+def gen_events(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    """
+    Browsing events for users [start, end).
+    """
+    out = Tables()
+    types, p = zip(*BROWSE_EVENTS)
+    now = cfg["now"]
+    span = profile.order_age_days * 86400
+    counts = rng.poisson(cfg["events_per_user"], end - start)
+
+    for i, count in enumerate(counts):
+        uid = user_id(start + i)
+        kinds = rng.choice(len(types), count, p=p)
+        products = np.minimum(rng.zipf(1.3, count) - 1, cfg["products"] - 1)
+        ages = rng.uniform(0, span, count)
+        for kind, product, age in zip(kinds, products, ages):
+            event = types[kind]
+            out.add(
+                "user_events",
+                ("id", "user_id", "event_type", "product_id", "metadata", "created_at"),
+                (_uuid(rng), uid, event,
+                 None if event == "search" else _id("product", int(product)),
+                 json.dumps({"source": "synth"}),
+                 now - timedelta(seconds=float(age))),
+            )
+    return out
+
+
+def gen_chats(rng, profile: Profile, start: int, end: int, cfg: dict) -> Tables:
+    """
+    One chat session + conversation per chatting user in [start, end).
+    """
+    out = Tables()
+    now = cfg["now"]
+    span = profile.order_age_days * 86400
+
+    for k in range(start, end):
+        if rng.random() >= cfg["chat_share"]:
+            continue
+        uid = user_id(k)
+        session_id, convo_id = _uuid(rng), _uuid(rng)
+        at = now - timedelta(seconds=float(rng.uniform(0, span)))
+        turns = int(rng.choice(profile.turns_per_user, p=profile.turns_per_user_p))
+
+        out.add(
+            "chat_sessions",
+            ("id", "user_id", "is_active", "created_at", "last_activity_at"),
+            (session_id, uid, False, at, at + timedelta(minutes=turns)),
+        )
+        out.add(
+            "conversations",
+            ("id", "chat_session_id", "user_id", "status", "handled_by",
+             "created_at", "last_message_at"),
+            (convo_id, session_id, uid, "closed", "llm", at, at + timedelta(minutes=turns)),
+        )
+        for t in range(turns):
+            user_msg, bot_msg, intent = profile.chat_turns[
+                rng.integers(len(profile.chat_turns))
+            ]
+            sent = at + timedelta(minutes=t)
+            for role, content, offset in (("user", user_msg, 0), ("assistant", bot_msg, 2)):
+                out.add(
+                    "messages",
+                    ("id", "conversation_id", "chat_session_id", "role", "content", "created_at"),
+                    (_uuid(rng), convo_id, session_id, role, content,
+                     sent + timedelta(seconds=offset)),
+                )
+            out.add(
+                "user_events",
+                ("id", "user_id", "event_type", "metadata", "created_at"),
+                (_uuid(rng), uid, "chat_message", json.dumps({"intent": intent}), sent),
+            )
+    return out
+
+
+# family → (generator, row count key, phase)
+FAMILIES = {
+    "users": (gen_users, "users", 1),
+    "products": (gen_products, "products", 1),
+    "stores": (gen_stores, "stores", 1),
+    "store_inventory": (gen_store_inventory, "stores", 2),
+    "orders": (gen_orders, "orders", 2),
+    "events": (gen_events, "users", 2),
+    "chats": (gen_chats, "users", 2),
+}
+FAMILY_CODES = {name: i for i, name in enumerate(FAMILIES, start=1)}
+
+
+# =====================================================
+# COPY
+# =====================================================
+
+def _cell(value):
+    if value is None:
+        return None  # unquoted empty → NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _csv_bytes(rows: list[tuple]) -> io.BytesIO:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    for row in rows:
+        writer.writerow([_cell(v) for v in row])
+    return io.BytesIO(buf.getvalue().encode())
+
+
+async def _copy(tables: Tables) -> dict[str, int]:
+    conn = await asyncpg.connect(
+        os.environ["DATABASE_URL"], ssl=os.environ.get("DATABASE_SSL") or None
+    )
+    try:
+        async with conn.transaction():
+            # rows inside a shard already respect FK order
+            await conn.execute("SET LOCAL synchronous_commit = off")
+            for table, (columns, rows) in tables.items():
+                await conn.copy_to_table(
+                    table, source=_csv_bytes(rows), columns=list(columns), format="csv"
+                )
+    finally:
+        await conn.close()
+    return {table: len(rows) for table, (_, rows) in tables.items()}
+
+
+def run_shard(family: str, shard: int, start: int, end: int, cfg: dict) -> dict[str, int]:
+    # runs in a worker process
+    generator = FAMILIES[family][0]
+    rng = np.random.default_rng([cfg["seed"], FAMILY_CODES[family], shard])
+    tables = generator(rng, _profile(), start, end, cfg)
+    return asyncio.run(_copy(tables))
+
+
+_PROFILE: Profile | None = None
+
+
+def _profile() -> Profile:
+    global _PROFILE
+    if _PROFILE is None:
+        _PROFILE = learn_profile()
+    return _PROFILE
+
+
+# =====================================================
+# DRIVER
+# =====================================================
+
+async def _prepare(args):
+    from bench.seed import reset_schema
+    from app.core.database import engine
+
+    if not args.append:
+        await reset_schema()
+    await engine.dispose()
+
+
+async def _finish(args):
+    from sqlalchemy import insert, text
+    from app.core.database import AsyncSessionLocal, engine
+    from app.models.models import Offer
+    from app.services.kpi_service import reconcile_kpis
+
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        if not args.append:
+            await db.execute(
+                insert(Offer),
+                [
+                    {"title": "Festive 10% off", "min_cart_value": 1000, "percentage_off": 10,
+                     "amount_off": None, "max_discount": 500, "priority": 1, "stackable": True,
+                     "starts_at": now - timedelta(days=365), "ends_at": now + timedelta(days=365),
+                     "created_by": admin_id()},
+                    {"title": "Flat 200", "min_cart_value": 2500, "percentage_off": None,
+                     "amount_off": 200, "max_discount": None, "priority": 2, "stackable": False,
+                     "starts_at": now - timedelta(days=365), "ends_at": now + timedelta(days=365),
+                     "created_by": admin_id()},
+                ],
+            )
+        await reconcile_kpis(db)
+        await db.commit()
+
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE"))
+    await engine.dispose()
+
+
+def shards(count: int) -> list[tuple[int, int, int]]:
+    return [
+        (i, start, min(start + SHARD_SIZE, count))
+        for i, start in enumerate(range(0, count, SHARD_SIZE))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--stores", type=int, default=500)
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--store-products", type=int, default=200,
+                        help="products stocked in every store (bench.run pickups)")
+    parser.add_argument("--store-extra-products", type=int, default=300,
+                        help="random extra products per store")
+    parser.add_argument("--events-per-user", type=float, default=20)
+    parser.add_argument("--chat-share", type=float, default=0.3,
+                        help="fraction of users with a chat transcript")
+    # every mock table has 10 rows, so 1 complaint per order is an
+    # artifact of the sample, not a rate worth learning
+    parser.add_argument("--complaint-rate", type=float, default=0.02)
+    parser.add_argument("--stock-multiplier", type=int, default=1000)
+    parser.add_argument("--embeddings", action="store_true",
+                        help="user/product vectors (slow: 768 floats per row)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--append", action="store_true",
+                        help="keep the existing schema/data (ids must not collide)")
+    args = parser.parse_args()
+
+    cfg = {
+        **{k: getattr(args, k) for k in (
+            "users", "products", "stores", "orders", "store_products",
+            "store_extra_products", "events_per_user", "chat_share",
+            "complaint_rate", "stock_multiplier", "embeddings", "seed",
+        )},
+        # fixed per seed so reruns produce identical timestamps
+        "now": datetime(2026, 1, 1) + timedelta(days=args.seed % 365),
+    }
+
+    t0 = time.perf_counter()
+    asyncio.run(_prepare(args))
+
+    totals: Counter = Counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for phase in (1, 2):
+            tasks = [
+                pool.submit(run_shard, family, shard, start, end, cfg)
+                for family, (_, count_key, family_phase) in FAMILIES.items()
+                if family_phase == phase
+                for shard, start, end in shards(cfg[count_key])
+            ]
+            for task in tasks:
+                totals.update(task.result())
+            print(f"phase {phase} done in {time.perf_counter() - t0:.1f}s")
+
+    asyncio.run(_finish(args))
+
+    for table, n in sorted(totals.items()):
+        print(f"{table:<22} {n:>12,}")
+    elapsed = time.perf_counter() - t0
+    print(f"{sum(totals.values()):,} rows in {elapsed:.1f}s "
+          f"({sum(totals.values()) / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
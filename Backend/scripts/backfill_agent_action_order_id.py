@@ -0,0 +1,96 @@
+# scripts/backfill_agent_action_order_id.py
+#
+# One-off backfill of agent_actions.order_id from payload->>'order_id'.
+#
+#   cd Backend
+#   python -m scripts.backfill_agent_action_order_id
+#   python -m scripts.backfill_agent_action_order_id --batch 5000 --dry-run
+#
+# Batched by primary key so each UPDATE holds row locks briefly; safe to
+# re-run (only touches rows where order_id IS NULL). Payload values that
+# are not UUIDs, point at deleted orders, or point at an order that is
+# not the conversation owner's (agent_action_service.owned_order_id's
+# rule) are left NULL.
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, engine
+
+UUID_RE = "^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+
+CANDIDATES = """
+    FROM agent_actions a
+    WHERE a.order_id IS NULL
+      AND a.payload ? 'order_id'
+      AND a.payload->>'order_id' ~ :uuid_re
+"""
+
+BATCH_UPDATE = text(f"""
+    WITH batch AS (
+        SELECT a.id, a.conversation_id, (a.payload->>'order_id')::uuid AS order_id
+        {CANDIDATES}
+          AND a.id > :after
+        ORDER BY a.id
+        LIMIT :batch
+    ),
+    updated AS (
+        UPDATE agent_actions t
+        SET order_id = b.order_id
+        FROM batch b
+        JOIN orders o ON o.id = b.order_id
+        JOIN conversations c ON c.id = b.conversation_id
+        WHERE t.id = b.id
+          AND o.user_id = c.user_id
+        RETURNING t.id
+    )
+    SELECT
+        (SELECT max(id::text) FROM batch) AS last_id,
+        (SELECT count(*) FROM updated) AS updated
+""")
+
+
+async def main(batch: int, dry_run: bool):
+    async with AsyncSessionLocal() as db:
+        pending = (
+            await db.execute(text(f"SELECT count(*) {CANDIDATES}"), {"uuid_re": UUID_RE})
+        ).scalar()
+    print(f"{pending} agent_actions with a payload order_id and no order_id column")
+
+    if dry_run or not pending:
+        await engine.dispose()
+        return
+
+    after = "00000000-0000-0000-0000-000000000000"
+    total = 0
+    t0 = time.perf_counter()
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            row = (
+                await db.execute(
+                    BATCH_UPDATE,
+                    {"uuid_re": UUID_RE, "after": after, "batch": batch},
+                )
+            ).one()
+            await db.commit()
+
+        if row.last_id is None:
+            break
+
+        after = row.last_id
+        total += row.updated
+        print(f"  updated {total} (through id {after})")
+
+    print(f"done: {total} rows in {time.perf_counter() - t0:.1f}s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=2000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch, args.dry_run))
@@ -0,0 +1,128 @@
+# scripts/eval_intent_router.py
+#
+# Offline evaluation of app.llm.intent_router over a labelled chat log.
+#
+#   cd Backend
+#   python -m scripts.eval_intent_router
+#   python -m scripts.eval_intent_router --csv my_log.csv --embeddings
+#
+# Reports precision of locally dispatched intents (a wrong dispatch is
+# worse than an LLM call) and the latency saved versus a full LLM turn.
+import argparse
+import asyncio
+import csv
+import json
+import re
+import time
+from pathlib import Path
+
+from app.llm import intent_router
+from app.llm.response_cache import embed
+
+DEFAULT_CSV = (
+    Path(__file__).resolve().parents[2]
+    / "Resources"
+    / "dbms mockdata"
+    / "chat_logs_updated.csv"
+)
+
+def _normalized(text: str) -> str:
+    return re.sub(r"[^a-z0-9 ]", "", text.lower()).strip()
+
+
+def held_out(rows):
+    """
+    Drops rows that are also centroid training examples: scoring the
+    router on its own training data inflates accuracy.
+    """
+    training = {
+        _normalized(e)
+        for examples in intent_router.LABELLED_EXAMPLES.values()
+        for e in examples
+    }
+    return [(text, label) for text, label in rows if _normalized(text) not in training]
+
+
+# chat log label → router intent. Unmapped labels must fall back to the LLM.
+LABEL_MAP = {
+    "ViewOrder": "track_order",
+    "DeliveryIssue": "delivery_status",
+    "BrowseProducts": "browse_products",
+    "ViewCart": "view_cart",
+    "ListAddresses": "list_addresses",
+    "Recommend": "recommendations",
+}
+
+
+async def evaluate(rows, *, use_embeddings: bool, llm_ms: float) -> dict:
+    dispatched = correct = intent_hits = 0
+    router_ms: list[float] = []
+    mistakes = []
+
+    for text, label in rows:
+        expected = LABEL_MAP.get(label)
+
+        vector = await embed(text) if use_embeddings else None
+
+        t0 = time.perf_counter()
+        match = await intent_router.route(text, vector)
+        router_ms.append((time.perf_counter() - t0) * 1000)
+
+        if match.intent == expected:
+            intent_hits += 1
+
+        if match.dispatchable:
+            dispatched += 1
+            if match.intent == expected:
+                correct += 1
+            else:
+                mistakes.append(
+                    {"message": text, "label": label, "routed_to": match.intent}
+                )
+
+    total = len(rows)
+    mean_router_ms = sum(router_ms) / total if total else 0.0
+
+    return {
+        "rows": total,
+        "dispatched": dispatched,
+        "coverage": round(dispatched / total, 4) if total else 0.0,
+        "dispatch_precision": round(correct / dispatched, 4) if dispatched else None,
+        "intent_accuracy": round(intent_hits / total, 4) if total else 0.0,
+        "mean_router_ms": round(mean_router_ms, 4),
+        "assumed_llm_ms": llm_ms,
+        "latency_saved_ms_total": round(correct * (llm_ms - mean_router_ms), 1),
+        "latency_saved_ms_per_turn": round(
+            correct * (llm_ms - mean_router_ms) / total, 1
+        ) if total else 0.0,
+        "wrong_dispatches": mistakes,
+    }
+
+
+def load_rows(path: Path, text_column: str, label_column: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(r[text_column], r[label_column]) for r in csv.DictReader(f)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV)
+    parser.add_argument("--text-column", default="user_message")
+    parser.add_argument("--label-column", default="intent_detected")
+    parser.add_argument("--llm-ms", type=float, default=1800.0,
+                        help="average full LLM turn latency to compare against")
+    parser.add_argument("--embeddings", action="store_true",
+                        help="also use nearest-centroid (calls the embedding API)")
+    args = parser.parse_args()
+
+    rows = load_rows(args.csv, args.text_column, args.label_column)
+    eval_rows = held_out(rows)
+    report = asyncio.run(
+        evaluate(eval_rows, use_embeddings=args.embeddings, llm_ms=args.llm_ms)
+    )
+    report["excluded_training_overlap"] = len(rows) - len(eval_rows)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# scripts/import_products.py
+#
+# Bulk catalog import from the command line (same path as
+# POST /admin/products/import).
+#
+#   cd Backend
+#   python -m scripts.import_products "../Resources/dbms mockdata/products.csv"
+#   python -m scripts.import_products catalog.ndjson --format ndjson
+#
+# Embedding jobs are only queued; run the worker to process them.
+import argparse
+import asyncio
+import json
+
+from app.core.database import AsyncSessionLocal, engine
+from app.services.product_import_service import import_products, detect_format
+
+
+async def main(path: str, fmt: str | None):
+    async with AsyncSessionLocal() as db:
+        with open(path, "rb") as f:
+            result = await import_products(
+                db,
+                fileobj=f,
+                fmt=detect_format(path, fmt),
+            )
+    await engine.dispose()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    args = parser.parse_args()
+    asyncio.run(main(args.path, args.format))
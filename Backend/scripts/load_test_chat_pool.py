@@ -0,0 +1,111 @@
+# scripts/load_test_chat_pool.py
+#
+# Pool occupancy vs concurrent chats, before/after splitting the chat
+# path into short DB phases around the LLM call.
+#
+#   cd Backend
+#   python -m scripts.load_test_chat_pool --concurrency 5 20 50 --llm-ms 2000
+#
+# "held"   = old shape: one session open across the whole LLM wait
+# "phased" = new shape: short session → LLM wait (no session) → short session
+#
+# While chats run, a probe repeatedly runs SELECT 1 on its own session,
+# standing in for an unrelated endpoint; its latency shows pool starvation.
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+
+from app.core.database import engine, AsyncSessionLocal
+
+
+async def _query(db):
+    await db.execute(text("SELECT 1"))
+
+
+async def chat_held(llm_s: float):
+    async with AsyncSessionLocal() as db:
+        await _query(db)          # user message
+        await asyncio.sleep(llm_s)  # LLM round-trip
+        await _query(db)          # assistant message
+        await db.commit()
+
+
+async def chat_phased(llm_s: float):
+    async with AsyncSessionLocal() as db:
+        await _query(db)
+        await db.commit()
+    await asyncio.sleep(llm_s)
+    async with AsyncSessionLocal() as db:
+        await _query(db)
+        await db.commit()
+
+
+async def _sample_pool(samples: list[int], stop: asyncio.Event):
+    while not stop.is_set():
+        samples.append(engine.pool.checkedout())
+        await asyncio.sleep(0.01)
+
+
+async def _probe(latencies: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                await _query(db)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        except Exception:
+            latencies.append(float("inf"))
+        await asyncio.sleep(0.05)
+
+
+async def run(mode: str, concurrency: int, llm_s: float) -> dict:
+    chat = chat_held if mode == "held" else chat_phased
+    samples: list[int] = []
+    probe_ms: list[float] = []
+    stop = asyncio.Event()
+
+    sampler = asyncio.create_task(_sample_pool(samples, stop))
+    probe = asyncio.create_task(_probe(probe_ms, stop))
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(
+        *(chat(llm_s) for _ in range(concurrency)), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - t0
+
+    stop.set()
+    await asyncio.gather(sampler, probe)
+
+    finite = sorted(p for p in probe_ms if p != float("inf"))
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "failed_chats": sum(isinstance(r, Exception) for r in results),
+        "pool_checked_out_max": max(samples, default=0),
+        "pool_checked_out_mean": round(sum(samples) / len(samples), 2) if samples else 0,
+        "probe_p50_ms": round(finite[len(finite) // 2], 1) if finite else None,
+        "probe_max_ms": round(finite[-1], 1) if finite else None,
+        "probe_failures": len(probe_ms) - len(finite),
+    }
+
+
+async def main(concurrency: list[int], llm_ms: float):
+    report = []
+    for c in concurrency:
+        for mode in ("held", "phased"):
+            report.append(await run(mode, c, llm_ms / 1000))
+            print(json.dumps(report[-1]))
+    await engine.dispose()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--llm-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.llm_ms))
@@ -0,0 +1,40 @@
+-- sql/033_jobs.sql
+--
+-- Postgres job queue (app/services/job_service.py, python -m app.worker)
+-- and the ChatContext -> summary embedding link.
+--
+--   psql "$DATABASE_URL" -f sql/033_jobs.sql
+--
+-- Idempotent: safe to re-run.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id UUID PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    payload JSONB DEFAULT '{}'::jsonb,
+    -- lower runs first
+    priority INTEGER NOT NULL DEFAULT 5,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+    dedupe_key TEXT,
+    locked_at TIMESTAMP WITHOUT TIME ZONE,
+    last_error TEXT,
+    created_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+    finished_at TIMESTAMP WITHOUT TIME ZONE
+);
+
+-- at most one *pending* job per key; a running one may be re-queued
+CREATE UNIQUE INDEX IF NOT EXISTS one_queued_job_per_dedupe_key
+    ON jobs (dedupe_key) WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS ix_jobs_claim
+    ON jobs (job_type, status, priority, run_at);
+
+ALTER TABLE chat_contexts
+    ADD COLUMN IF NOT EXISTS embedding_id UUID
+    REFERENCES embeddings (id) ON DELETE SET NULL;
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- sql/034_chat_context_summarized_until.sql
+--
+-- Incremental session summaries (app/services/chat_context_service.py):
+-- a resumed session only summarizes messages after this timestamp.
+--
+--   psql "$DATABASE_URL" -f sql/034_chat_context_summarized_until.sql
+--
+-- Idempotent: safe to re-run.
+
+ALTER TABLE chat_contexts
+    ADD COLUMN IF NOT EXISTS summarized_until TIMESTAMP WITHOUT TIME ZONE;
@@ -0,0 +1,66 @@
+-- sql/035_kpi_rollups.sql
+--
+-- KPI and inventory rollups (app/services/kpi_service.py), plus
+-- orders.status, which the services write.
+--
+--   psql "$DATABASE_URL" -f sql/035_kpi_rollups.sql
+--
+-- Idempotent: safe to re-run. The tables start empty; fill them from
+-- the source tables with POST /admin/kpis/reconcile (or wait for the
+-- nightly reconcile_kpis job).
+
+BEGIN;
+
+ALTER TABLE orders
+    ADD COLUMN IF NOT EXISTS status order_status_enum DEFAULT 'pending';
+
+CREATE TABLE IF NOT EXISTS kpi_global (
+    -- single row: 'all'
+    scope TEXT PRIMARY KEY DEFAULT 'all',
+    orders_count INTEGER NOT NULL DEFAULT 0,
+    gross_revenue NUMERIC NOT NULL DEFAULT 0,
+    paid_orders INTEGER NOT NULL DEFAULT 0,
+    paid_revenue NUMERIC NOT NULL DEFAULT 0,
+    cancelled_orders INTEGER NOT NULL DEFAULT 0,
+    cancelled_revenue NUMERIC NOT NULL DEFAULT 0,
+    refunded_orders INTEGER NOT NULL DEFAULT 0,
+    refunded_revenue NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS kpi_daily (
+    -- UTC date the order was placed
+    day DATE PRIMARY KEY,
+    orders_count INTEGER NOT NULL DEFAULT 0,
+    gross_revenue NUMERIC NOT NULL DEFAULT 0,
+    paid_orders INTEGER NOT NULL DEFAULT 0,
+    paid_revenue NUMERIC NOT NULL DEFAULT 0,
+    cancelled_orders INTEGER NOT NULL DEFAULT 0,
+    cancelled_revenue NUMERIC NOT NULL DEFAULT 0,
+    refunded_orders INTEGER NOT NULL DEFAULT 0,
+    refunded_revenue NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS kpi_store (
+    store_id UUID PRIMARY KEY REFERENCES stores (id) ON DELETE CASCADE,
+    orders_count INTEGER NOT NULL DEFAULT 0,
+    gross_revenue NUMERIC NOT NULL DEFAULT 0,
+    paid_orders INTEGER NOT NULL DEFAULT 0,
+    paid_revenue NUMERIC NOT NULL DEFAULT 0,
+    cancelled_orders INTEGER NOT NULL DEFAULT 0,
+    cancelled_revenue NUMERIC NOT NULL DEFAULT 0,
+    refunded_orders INTEGER NOT NULL DEFAULT 0,
+    refunded_revenue NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS inventory_rollup (
+    scope TEXT PRIMARY KEY DEFAULT 'all',
+    total_items INTEGER NOT NULL DEFAULT 0,
+    total_value NUMERIC NOT NULL DEFAULT 0,
+    low_stock_products INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now()
+);
+
+COMMIT;
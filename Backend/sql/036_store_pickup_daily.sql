@@ -0,0 +1,35 @@
+-- sql/036_store_pickup_daily.sql
+--
+-- Per-store daily pickup rollup keyed by store-local date
+-- (app/services/store_dashboard_service.py), the store timezone it is
+-- keyed by, and the pickups (store_id, created_at) index.
+--
+--   psql "$DATABASE_URL" -f sql/036_store_pickup_daily.sql
+--
+-- Idempotent: safe to re-run. Fill the rollup with
+-- POST /admin/kpis/reconcile (it also rebuilds pickup rollups).
+
+BEGIN;
+
+-- IANA name; "today" on the store dashboard is this zone's date
+ALTER TABLE stores
+    ADD COLUMN IF NOT EXISTS timezone TEXT NOT NULL DEFAULT 'Asia/Kolkata';
+
+CREATE TABLE IF NOT EXISTS store_pickup_daily (
+    store_id UUID NOT NULL REFERENCES stores (id) ON DELETE CASCADE,
+    -- store-local date the pickup was created
+    day DATE NOT NULL,
+    total_pickups INTEGER NOT NULL DEFAULT 0,
+    pending INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0,
+    cancelled INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT now(),
+    PRIMARY KEY (store_id, day)
+);
+
+COMMIT;
+
+-- store pickup lists / dashboards: range on created_at per store
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pickups_store_created
+    ON pickups (store_id, created_at);
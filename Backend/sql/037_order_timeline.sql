@@ -0,0 +1,31 @@
+-- sql/037_order_timeline.sql
+--
+-- Order timeline (app/services/order_service.get_order_timeline):
+-- agent_actions.order_id and the order_id indexes every part is read by.
+--
+--   psql "$DATABASE_URL" -f sql/037_order_timeline.sql
+--   python -m scripts.backfill_agent_action_order_id
+--
+-- Idempotent: safe to re-run. Indexes are built CONCURRENTLY, so this
+-- file runs outside a transaction block (no BEGIN/COMMIT, no -1).
+
+-- order the action was about (was only inside payload->>'order_id')
+ALTER TABLE agent_actions
+    ADD COLUMN IF NOT EXISTS order_id UUID
+    REFERENCES orders (id) ON DELETE SET NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agent_actions_order_created
+    ON agent_actions (order_id, created_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_order_status_history_order_id
+    ON order_status_history (order_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_payments_order_id
+    ON payments (order_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_deliveries_order_id
+    ON deliveries (order_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_pickups_order_id
+    ON pickups (order_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_complaints_order_id
+    ON complaints (order_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_refunds_order_id
+    ON refunds (order_id);
@@ -0,0 +1,11 @@
+-- sql/040_cart_version.sql
+--
+-- Hot cart write-behind (app/services/hot_cart_service.py): version of
+-- the last flushed Redis snapshot; older snapshots never overwrite it.
+--
+--   psql "$DATABASE_URL" -f sql/040_cart_version.sql
+--
+-- Idempotent: safe to re-run.
+
+ALTER TABLE carts
+    ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 0;
@@ -0,0 +1,39 @@
+-- sql/044_order_item_fulfillment.sql
+--
+-- Where each order line is fulfilled from, as checkout
+-- (app/services/cart_service.py) writes it: 'store' + the store id for
+-- pickup orders, 'global' + the product id otherwise.
+--
+--   psql "$DATABASE_URL" -f sql/044_order_item_fulfillment.sql
+--
+-- Idempotent: safe to re-run. Existing lines are backfilled from their
+-- order's fulfillment_type.
+
+BEGIN;
+
+DO $$
+BEGIN
+    CREATE TYPE fulfillment_source_enum AS ENUM ('global', 'store');
+EXCEPTION
+    WHEN duplicate_object THEN NULL;
+END
+$$;
+
+ALTER TABLE order_items
+    ADD COLUMN IF NOT EXISTS fulfillment_source fulfillment_source_enum DEFAULT 'global',
+    ADD COLUMN IF NOT EXISTS fulfillment_ref_id UUID;
+
+UPDATE order_items oi
+SET fulfillment_source = 'store',
+    fulfillment_ref_id = o.store_id
+FROM orders o
+WHERE o.id = oi.order_id
+  AND o.fulfillment_type = 'pickup'
+  AND oi.fulfillment_ref_id IS NULL;
+
+UPDATE order_items
+SET fulfillment_ref_id = product_id
+WHERE fulfillment_ref_id IS NULL
+  AND fulfillment_source = 'global';
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- sql/046_product_external_id.sql
+--
+-- Bulk catalog import (app/services/product_import_service.py):
+-- products.external_id, the file's product_id, and the unique index its
+-- ON CONFLICT (external_id) upsert needs.
+--
+--   psql "$DATABASE_URL" -f sql/046_product_external_id.sql
+--
+-- Idempotent: safe to re-run. The index is built CONCURRENTLY, so this
+-- file runs outside a transaction block (no BEGIN/COMMIT, no -1).
+-- Existing products keep a NULL external_id; NULLs never conflict.
+
+ALTER TABLE products
+    ADD COLUMN IF NOT EXISTS external_id TEXT;
+
+-- same name as the ORM's unique=True constraint
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS products_external_id_key
+    ON products (external_id);
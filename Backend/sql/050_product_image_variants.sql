@@ -0,0 +1,30 @@
+-- sql/050_product_image_variants.sql
+--
+-- Product image uploads (app/services/product_image_service.py): WebP
+-- rendition URLs, the content hash identical uploads are deduped on,
+-- and the original's type / size / dimensions.
+--
+--   psql "$DATABASE_URL" -f sql/050_product_image_variants.sql
+--
+-- Idempotent: safe to re-run. Indexes are built CONCURRENTLY, so this
+-- file runs outside a transaction block (no BEGIN/COMMIT, no -1).
+-- Existing rows keep NULLs: lists fall back to image_url, and they are
+-- never matched as duplicates.
+
+ALTER TABLE product_images
+    ADD COLUMN IF NOT EXISTS thumb_url TEXT,
+    ADD COLUMN IF NOT EXISTS small_url TEXT,
+    ADD COLUMN IF NOT EXISTS large_url TEXT,
+    ADD COLUMN IF NOT EXISTS content_hash TEXT,
+    ADD COLUMN IF NOT EXISTS content_type TEXT,
+    ADD COLUMN IF NOT EXISTS byte_size INTEGER,
+    ADD COLUMN IF NOT EXISTS width INTEGER,
+    ADD COLUMN IF NOT EXISTS height INTEGER;
+
+-- dedupe lookup
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_product_images_content_hash
+    ON product_images (content_hash);
+
+-- a product's images (card image subquery, primary demotion)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_product_images_product_id
+    ON product_images (product_id);
@@ -0,0 +1,67 @@
+# tests/conftest.py
+#
+# Tests drive the app in-process, offline:
+#   - settings from bench.env (BENCH_DATABASE_URL / BENCH_REDIS_URL,
+#     defaults to local Postgres db "bench" and Redis db 15)
+#   - google.genai replaced by bench.fake_genai, with no added latency
+#
+# Fixtures that need Postgres or Redis skip the test when the service
+# isn't reachable.
+from bench import env, fake_genai
+
+env.setup()
+fake_genai.install()
+fake_genai.configure(llm_ms=0, embed_ms=0)
+
+import asyncpg  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy.engine import make_url  # noqa: E402
+
+from app.core.database import DATABASE_URL  # noqa: E402
+from app.core.redis import redis_client  # noqa: E402
+
+pytest_plugins = ["app.core.pytest_query_budget"]
+
+
+@pytest.fixture(scope="session")
+async def redis():
+    try:
+        await redis_client.ping()
+    except Exception as e:
+        pytest.skip(f"Redis not reachable: {e}")
+    return redis_client
+
+
+@pytest.fixture(scope="session")
+async def postgres_admin():
+    """
+    A raw asyncpg connection to the bench database, for setup the ORM
+    can't do (CREATE DATABASE, catalog checks).
+    """
+    url = make_url(DATABASE_URL)
+    try:
+        conn = await asyncpg.connect(
+            host=url.host, port=url.port, user=url.username,
+            password=url.password, database=url.database,
+        )
+    except Exception as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+    yield conn
+    await conn.close()
+
+
+@pytest.fixture(scope="session")
+def scratch_database(postgres_admin):
+    """
+    `await scratch_database(name)` creates database `name` on the bench
+    server if it's missing and returns its URL (password included).
+    """
+    async def create(name: str) -> str:
+        exists = await postgres_admin.fetchval(
+            "SELECT 1 FROM pg_database WHERE datname = $1", name
+        )
+        if not exists:
+            await postgres_admin.execute(f"CREATE DATABASE {name}")
+        return make_url(DATABASE_URL).set(database=name).render_as_string(hide_password=False)
+
+    return create
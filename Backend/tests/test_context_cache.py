@@ -0,0 +1,163 @@
+# tests/test_context_cache.py
+#
+# Provider-side context cache for the static prefix (app/llm/llm.py),
+# against the fake provider.
+import pytest
+from google.genai import errors
+
+from app.core.config import settings
+from app.core.gemini import get_gemini_client
+from app.llm import llm
+
+
+def _api_error(code: int, status: str, message: str) -> errors.ClientError:
+    return errors.ClientError(
+        code, {"error": {"code": code, "status": status, "message": message}}
+    )
+
+
+async def _clear(redis):
+    llm.invalidate_context_cache()
+    llm._context_cache["disabled_until"] = 0.0
+    await redis.delete(f"llm:ctxcache:{llm.prefix_hash()}")
+
+
+@pytest.fixture(autouse=True)
+async def fresh_cache(redis, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CONTEXT_CACHE_ENABLED", True)
+    await _clear(redis)
+    yield
+    await _clear(redis)
+
+
+@pytest.fixture
+def creates(monkeypatch):
+    caches = get_gemini_client().aio.caches
+    original = caches.create
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        return await original(**kwargs)
+
+    monkeypatch.setattr(caches, "create", create)
+    return calls
+
+
+@pytest.fixture
+def generate(monkeypatch):
+    """
+    Records every generate_content config; `fail_cached` makes calls
+    that use cached_content raise it.
+    """
+    models = get_gemini_client().aio.models
+    original = models.generate_content
+    state = {"configs": [], "fail_cached": None}
+
+    async def generate_content(*, model, contents, config=None):
+        state["configs"].append(config)
+        if state["fail_cached"] and config.cached_content:
+            raise state["fail_cached"]
+        return await original(model=model, contents=contents, config=config)
+
+    monkeypatch.setattr(models, "generate_content", generate_content)
+    return state
+
+
+def _contents():
+    return llm.build_contents([], "hello")
+
+
+async def test_handle_created_once_and_reused(redis, creates):
+    first = await llm.get_context_cache()
+    second = await llm.get_context_cache()
+
+    assert first and first == second
+    assert len(creates) == 1
+    assert await redis.get(f"llm:ctxcache:{llm.prefix_hash()}") == first
+
+
+async def test_handle_from_another_worker_is_reused(redis, creates):
+    await redis.set(f"llm:ctxcache:{llm.prefix_hash()}", "cachedContents/other", ex=600)
+
+    assert await llm.get_context_cache() == "cachedContents/other"
+    assert creates == []
+
+
+async def test_prefix_change_creates_new_handle(creates, monkeypatch):
+    await llm.get_context_cache()
+    monkeypatch.setattr(llm, "prefix_hash", lambda: "schema-v2")
+
+    await llm.get_context_cache()
+
+    assert len(creates) == 2
+    assert "schema-v2" in creates[1]["config"].display_name
+
+
+async def test_disabled_sends_prefix_inline(creates, generate, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CONTEXT_CACHE_ENABLED", False)
+
+    await llm.call_llm_with_tools(_contents())
+
+    assert creates == []
+    config = generate["configs"][0]
+    assert config.cached_content is None
+    assert config.system_instruction == llm.SYSTEM_PROMPT
+
+
+async def test_create_failure_falls_back_inline_and_backs_off(generate, monkeypatch):
+    caches = get_gemini_client().aio.caches
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        raise _api_error(400, "INVALID_ARGUMENT", "Cached content is too small")
+
+    monkeypatch.setattr(caches, "create", create)
+
+    await llm.call_llm_with_tools(_contents())
+    await llm.call_llm_with_tools(_contents())
+
+    assert len(calls) == 1  # no retry inside CONTEXT_CACHE_RETRY_SECONDS
+    assert all(c.cached_content is None for c in generate["configs"])
+
+
+async def test_expired_handle_is_dropped_and_retried_inline(redis, creates, generate):
+    name = await llm.get_context_cache()
+    generate["fail_cached"] = _api_error(404, "NOT_FOUND", "CachedContent not found")
+
+    content = await llm.call_llm_with_tools(_contents())
+
+    assert content is not None
+    assert [c.cached_content for c in generate["configs"]] == [name, None]
+    assert await redis.get(f"llm:ctxcache:{llm.prefix_hash()}") is None
+
+    # next turn creates a fresh handle
+    generate["fail_cached"] = None
+    await llm.call_llm_with_tools(_contents())
+    assert len(creates) == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        _api_error(429, "RESOURCE_EXHAUSTED", "Quota exceeded"),
+        _api_error(400, "INVALID_ARGUMENT", "Request contains an invalid argument"),
+    ],
+)
+async def test_other_errors_keep_the_handle(redis, creates, generate, error):
+    name = await llm.get_context_cache()
+    generate["fail_cached"] = error
+
+    with pytest.raises(errors.ClientError):
+        await llm.call_llm_with_tools(_contents())
+
+    assert len(generate["configs"]) == 1  # no inline retry
+    assert await redis.get(f"llm:ctxcache:{llm.prefix_hash()}") == name
+    assert await llm.get_context_cache() == name
+    assert len(creates) == 1
+
+
+async def test_server_error_is_not_a_stale_handle():
+    error = errors.ServerError(503, {"error": {"code": 503, "status": "UNAVAILABLE", "message": "overloaded"}})
+    assert not llm.is_stale_cache_error(error)
@@ -0,0 +1,186 @@
+# tests/test_product_images.py
+#
+# Image upload (app/services/product_image_service.py) end to end on
+# LocalStorage: streaming, Pillow variants in the process pool,
+# dedupe, and primary demotion. The tables live in their own database
+# ("bench_images") on the bench server.
+import io
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.datastructures import Headers
+
+from app.core import database
+from app.core.config import settings
+from app.core.storage import LocalStorage, get_storage
+from app.models.models import Job, Product, ProductImage, product_variants
+from app.services import product_image_service
+from app.services.product_image_service import upload_product_image
+
+IMAGES_DB = "bench_images"
+TABLES = [Product.__table__, product_variants, ProductImage.__table__, Job.__table__]
+
+
+@pytest.fixture(scope="module")
+async def images_engine(scratch_database):
+    images_engine = database._make_engine(
+        await scratch_database(IMAGES_DB),
+        name="images",
+        pool_size=2,
+        max_overflow=0,
+    )
+    async with images_engine.begin() as c:
+        await c.run_sync(database.Base.metadata.drop_all, tables=TABLES)
+        await c.run_sync(database.Base.metadata.create_all, tables=TABLES)
+
+    yield images_engine
+
+    product_image_service.shutdown_image_pool()
+    await images_engine.dispose()
+
+
+@pytest.fixture
+async def db(images_engine):
+    Session = async_sessionmaker(bind=images_engine, class_=AsyncSession, expire_on_commit=False)
+    async with Session() as session:
+        yield session
+
+
+@pytest.fixture(autouse=True)
+def local_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "STORAGE_BACKEND", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_URL", "/media/")
+    get_storage.cache_clear()
+    yield tmp_path
+    get_storage.cache_clear()
+
+
+async def _product(db) -> Product:
+    product = Product(id=uuid4(), name="Lamp", price=100)
+    db.add(product)
+    await db.commit()
+    return product
+
+
+def _png(size=(800, 600), color="red") -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+def _upload(data: bytes, content_type="image/png") -> UploadFile:
+    return UploadFile(
+        io.BytesIO(data),
+        size=len(data),
+        filename="upload",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def _stored_files(root) -> list[str]:
+    return sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file())
+
+
+# =====================================================
+# LOCAL STORAGE
+# =====================================================
+
+async def test_local_storage_put(local_storage, tmp_path_factory):
+    src = tmp_path_factory.mktemp("src") / "a.txt"
+    src.write_text("hello")
+
+    storage = get_storage("bucket")
+    url = await storage.put("ab/abc/a.txt", src, content_type="text/plain")
+
+    assert isinstance(storage, LocalStorage)
+    assert url == "/media/bucket/ab/abc/a.txt"
+    assert (local_storage / "bucket" / "ab" / "abc" / "a.txt").read_text() == "hello"
+    assert _stored_files(local_storage) == ["bucket/ab/abc/a.txt"]  # no .part left
+
+
+# =====================================================
+# UPLOAD
+# =====================================================
+
+async def test_upload_stores_original_and_variants(db, local_storage):
+    product = await _product(db)
+
+    image = await upload_product_image(db, product_id=product.id, file=_upload(_png()))
+
+    assert (image.content_type, image.width, image.height) == ("image/png", 800, 600)
+    prefix = f"product_image/{image.content_hash[:2]}/{image.content_hash}"
+    assert _stored_files(local_storage) == [
+        f"{prefix}/{name}" for name in ("large.webp", "original.png", "small.webp", "thumb.webp")
+    ]
+    assert image.small_url == f"/media/{prefix}/small.webp"
+    with Image.open(local_storage / prefix / "thumb.webp") as thumb:
+        assert max(thumb.size) == 160
+
+    await db.refresh(product)
+    assert product.images == [image.image_url]
+    job = (await db.execute(
+        select(Job).where(Job.dedupe_key == f"embed_product:{product.id}")
+    )).scalar_one()
+    assert job.payload == {"product_id": str(product.id)}
+
+
+async def test_same_bytes_are_deduped(db, local_storage):
+    first = await _product(db)
+    second = await _product(db)
+    data = _png(color="blue")
+
+    original = await upload_product_image(db, product_id=first.id, file=_upload(data))
+    files = _stored_files(local_storage)
+
+    again = await upload_product_image(db, product_id=first.id, file=_upload(data))
+    linked = await upload_product_image(db, product_id=second.id, file=_upload(data))
+
+    assert again.id == original.id
+    assert linked.id != original.id
+    assert (linked.image_url, linked.small_url) == (original.image_url, original.small_url)
+    assert _stored_files(local_storage) == files  # nothing uploaded twice
+
+
+async def test_primary_demotes_the_previous_primary(db):
+    product = await _product(db)
+
+    old = await upload_product_image(
+        db, product_id=product.id, file=_upload(_png(color="green")), is_primary=True
+    )
+    new = await upload_product_image(
+        db, product_id=product.id, file=_upload(_png(color="white")), is_primary=True
+    )
+
+    res = await db.execute(
+        select(ProductImage.id).where(
+            ProductImage.product_id == product.id, ProductImage.is_primary.is_(True)
+        )
+    )
+    assert res.scalars().all() == [new.id]
+
+    # re-uploading the old image as primary promotes it back
+    await upload_product_image(
+        db, product_id=product.id, file=_upload(_png(color="green")), is_primary=True
+    )
+    res = await db.execute(
+        select(ProductImage.id).where(
+            ProductImage.product_id == product.id, ProductImage.is_primary.is_(True)
+        )
+    )
+    assert res.scalars().all() == [old.id]
+
+
+async def test_non_image_is_rejected(db):
+    product = await _product(db)
+
+    with pytest.raises(HTTPException) as e:
+        await upload_product_image(
+            db, product_id=product.id, file=_upload(b"not an image")
+        )
+    assert e.value.status_code == 400
+    assert e.value.detail.startswith("Unreadable image")
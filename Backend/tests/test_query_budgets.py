@@ -0,0 +1,150 @@
+# tests/test_query_budgets.py
+#
+# SQL query budgets (app/core/pytest_query_budget.py) for the hot
+# endpoints, driven in-process against a small bench.seed database:
+#   - GET   /cart/pickup/stores       list_stores_that_can_fulfill_cart
+#   - POST  /cart/checkout
+#   - PATCH /orders/{id}/cancel       release_inventory_for_order
+#   - GET   /orders/{id}/timeline     get_order_timeline
+#
+# bench.seed needs PostGIS; without it these are skipped. A budget
+# that fails after a change lists the top statements: either the
+# change added a round trip per row (fix it), or it added a fixed
+# one on purpose (raise the budget in the same commit). Every count
+# includes get_current_user's users upsert.
+from argparse import Namespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.exc import DBAPIError
+
+from app.core import query_counter
+from app.core.database import engine
+from app.core.query_counter import QueryStats, count_queries
+from bench import env
+from bench.run import address_id, product_id, store_id
+from bench.seed import seed, user_id
+
+SEED = Namespace(users=10, products=50, stores=5, store_products=20, orders=50, seed=42)
+
+
+@pytest.fixture(scope="module")
+async def seeded(postgres_admin, redis):
+    if not await postgres_admin.fetchval(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'"
+    ):
+        pytest.skip("bench.seed needs PostGIS")
+    await seed(SEED)
+
+
+@pytest.fixture(scope="module")
+async def client(seeded):
+    from app.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+async def customer(client):
+    n = 1
+    headers = {"Authorization": f"Bearer {env.token(user_id(n))}"}
+    await client.delete("/cart/", headers=headers)
+    for p in range(3):
+        res = await client.post(
+            "/cart/items", json={"product_id": str(product_id(p)), "quantity": 1}, headers=headers
+        )
+        assert res.status_code == 200, res.text
+    return n, headers
+
+
+@pytest.fixture(scope="module")
+def state():
+    return {}
+
+
+# =====================================================
+# ENDPOINT BUDGETS (in order: one cart, one order)
+# =====================================================
+
+async def test_pickup_stores_budget(client, customer, query_budget):
+    _, headers = customer
+    with query_budget(3):
+        res = await client.get("/cart/pickup/stores", headers=headers)
+    assert res.status_code == 200, res.text
+    assert str(store_id(0)) in {s["store_id"] for s in res.json()}
+
+
+async def test_checkout_budget(client, customer, state, query_budget):
+    n, headers = customer
+    with query_budget(14):
+        res = await client.post(
+            "/cart/checkout",
+            json={"fulfillment_type": "delivery", "address_id": str(address_id(n))},
+            headers=headers,
+        )
+    assert res.status_code == 200, res.text
+    state["order_id"] = res.json()["order_id"]
+
+
+async def test_timeline_budget(client, customer, state, query_budget):
+    _, headers = customer
+    with query_budget(2):
+        res = await client.get(f"/orders/{state['order_id']}/timeline", headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json()["order"]["id"] == state["order_id"]
+
+
+async def test_cancel_budget(client, customer, state, query_budget):
+    _, headers = customer
+    with query_budget(9):
+        res = await client.patch(f"/orders/{state['order_id']}/cancel", headers=headers)
+    assert res.status_code == 200, res.text
+
+    # the cached timeline from test_timeline_budget must not outlive the cancel
+    res = await client.get(f"/orders/{state['order_id']}/timeline", headers=headers)
+    assert res.status_code == 200, res.text
+    assert res.json()["order"]["status"] == "cancelled"
+
+
+# =====================================================
+# QUERY COUNTER
+# =====================================================
+
+async def test_failed_statement_does_not_skew_timings(postgres_admin):
+    """
+    A statement that raises never reaches after_cursor_execute; its
+    start time must not be picked up by a later statement, including
+    one whose stats were opened between the two hooks.
+    """
+    stats = QueryStats()
+    tokens = []
+
+    def open_stats(*args):
+        tokens.append(query_counter._current.set(stats))
+
+    def close_stats(*args):
+        query_counter._current.reset(tokens.pop())
+
+    async with engine.connect() as conn:
+        with count_queries() as failed:
+            with pytest.raises(DBAPIError):
+                await conn.execute(text(
+                    "DO $$ BEGIN PERFORM pg_sleep(0.2); RAISE EXCEPTION 'boom'; END $$"
+                ))
+        await conn.rollback()
+        assert failed.count == 0
+
+        # registered after instrument_engine's hooks: stats open
+        # after _before and close after _after
+        event.listen(engine.sync_engine, "before_cursor_execute", open_stats)
+        event.listen(engine.sync_engine, "after_cursor_execute", close_stats)
+        try:
+            await conn.execute(text("SELECT 1"))
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", open_stats)
+            event.remove(engine.sync_engine, "after_cursor_execute", close_stats)
+
+    assert stats.count == 1
+    assert stats.db_time < 0.2
@@ -0,0 +1,155 @@
+# tests/test_read_replica.py
+#
+# get_db / get_read_db routing (app/core/database.py) against two
+# databases: the bench database as primary and "bench_replica" on the
+# same server standing in for the replica. A read reports which one
+# served it.
+from uuid import uuid4
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.engine import make_url
+
+from app.core import database
+from app.core.config import settings
+
+REPLICA_DB = "bench_replica"
+
+
+@pytest.fixture(scope="module")
+async def primary_db_name(postgres_admin):
+    await postgres_admin.execute("CREATE TABLE IF NOT EXISTS rw_probe (id uuid PRIMARY KEY)")
+
+    yield make_url(database.DATABASE_URL).database
+
+    async with database.engine.begin() as c:
+        await c.execute(text("DROP TABLE IF EXISTS rw_probe"))
+
+
+@pytest.fixture
+async def replica(primary_db_name, scratch_database, redis, monkeypatch):
+    replica_engine = database._make_engine(
+        await scratch_database(REPLICA_DB),
+        name="replica",
+        pool_size=2,
+        max_overflow=0,
+    )
+    monkeypatch.setattr(database, "read_engine", replica_engine)
+    monkeypatch.setattr(
+        database,
+        "ReadSessionLocal",
+        async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False),
+    )
+    yield REPLICA_DB
+    await replica_engine.dispose()
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/write")
+    async def write(db: AsyncSession = Depends(database.get_db)):
+        await db.execute(text("INSERT INTO rw_probe VALUES (:id)"), {"id": uuid4()})
+        await db.commit()
+        # already marked when the handler gets control back
+        user_id = db.info["user_id"]
+        return {"marked": bool(await database.redis_client.exists(database._sticky_key(user_id)))}
+
+    @app.post("/write-rollback")
+    async def write_rollback(db: AsyncSession = Depends(database.get_db)):
+        await db.execute(text("INSERT INTO rw_probe VALUES (:id)"), {"id": uuid4()})
+        await db.rollback()
+        return {}
+
+    @app.post("/read-commit")
+    async def read_commit(db: AsyncSession = Depends(database.get_db)):
+        await db.execute(text("SELECT 1"))
+        await db.commit()
+        return {}
+
+    @app.get("/read")
+    async def read(db: AsyncSession = Depends(database.get_read_db)):
+        return {"db": (await db.execute(text("SELECT current_database()"))).scalar()}
+
+    return app
+
+
+@pytest.fixture
+async def client(replica):
+    async with AsyncClient(transport=ASGITransport(app=_app()), base_url="http://test") as c:
+        yield c
+
+
+def _headers(user_id: str) -> dict:
+    # routing only reads "sub"; the signature isn't checked
+    return {"Authorization": f"Bearer {jwt.encode({'sub': user_id}, 'x', algorithm='HS256')}"}
+
+
+@pytest.fixture
+async def user(redis):
+    user_id = str(uuid4())
+    yield user_id, _headers(user_id)
+    await redis.delete(database._sticky_key(user_id))
+
+
+async def _served_by(client, headers) -> str:
+    res = await client.get("/read", headers=headers)
+    assert res.status_code == 200
+    return res.json()["db"]
+
+
+async def test_reads_go_to_replica(client, user, replica):
+    _, headers = user
+    assert await _served_by(client, headers) == replica
+    assert await _served_by(client, {}) == replica
+
+
+async def test_write_marks_at_commit_and_pins_reads_to_primary(
+    client, user, replica, primary_db_name, redis
+):
+    user_id, headers = user
+
+    res = await client.post("/write", headers=headers)
+    assert res.json() == {"marked": True}
+
+    ttl = await redis.ttl(database._sticky_key(user_id))
+    assert 0 < ttl <= settings.DB_READ_YOUR_WRITES_SECONDS
+
+    assert await _served_by(client, headers) == primary_db_name
+
+    # other users still read from the replica
+    assert await _served_by(client, _headers(str(uuid4()))) == replica
+
+
+async def test_no_mark_without_a_committed_write(client, user, replica, redis):
+    user_id, headers = user
+
+    await client.post("/write-rollback", headers=headers)
+    await client.post("/read-commit", headers=headers)
+
+    assert not await redis.exists(database._sticky_key(user_id))
+    assert await _served_by(client, headers) == replica
+
+
+async def test_unknown_redis_state_reads_primary(client, user, primary_db_name, monkeypatch):
+    _, headers = user
+
+    async def down(*args):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(database.redis_client, "exists", down)
+
+    assert await _served_by(client, headers) == primary_db_name
+
+
+async def test_no_replica_configured_is_a_no_op(user, redis, monkeypatch):
+    user_id, _ = user
+    monkeypatch.setattr(database, "read_engine", database.engine)
+
+    await database.mark_read_your_writes(user_id)
+
+    assert not await redis.exists(database._sticky_key(user_id))
@@ -0,0 +1,60 @@
+# tests/test_warmup.py
+#
+# Readiness (app/warmup.py): the pool steps gate /ready, the rest are
+# best-effort.
+import pytest
+
+from app import warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(warmup, "state", {
+        "ready": False,
+        "draining": False,
+        "steps": {},
+        "started_at": None,
+        "finished_at": None,
+    })
+    monkeypatch.setattr(warmup, "REQUIRED_RETRY_SECONDS", 0)
+
+
+def _steps(monkeypatch, **overrides):
+    async def ok():
+        return 1
+
+    steps = tuple((name, overrides.get(name, ok)) for name, _ in warmup.STEPS)
+    monkeypatch.setattr(warmup, "STEPS", steps)
+
+
+async def test_optional_step_failure_is_still_ready(monkeypatch):
+    async def down():
+        raise RuntimeError("provider down")
+
+    _steps(monkeypatch, llm_prefix=down)
+
+    await warmup.warm_up()
+
+    ready, body = warmup.readiness()
+    assert ready
+    assert body["steps"]["llm_prefix"]["ok"] is False
+
+
+async def test_not_ready_until_db_pool_succeeds(monkeypatch):
+    attempts = []
+
+    async def db_pool():
+        attempts.append(warmup.readiness()[0])
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("postgres down")
+        return 1
+
+    _steps(monkeypatch, db_pool=db_pool)
+
+    await warmup.warm_up()
+
+    # never ready while the pool step was failing
+    assert attempts == [False, False, False]
+    ready, body = warmup.readiness()
+    assert ready
+    assert body["steps"]["db_pool"]["ok"] is True
@@ -8,7 +8,8 @@ import { toast } from "sonner"
 
 const ProductCard = ({ product, onOpen, onAdd }) => {
   const [isAdding, setIsAdding] = useState(false);
-  const mainImage = product.images?.find(img => img.is_primary)?.image_url || product.images?.[0]?.image_url || "https://ui.shadcn.com/placeholder.svg";
+  // image_url from /products/ is the small (480px WebP) variant
+  const mainImage = product.image_url || product.images?.find(img => img.is_primary)?.image_url || product.images?.[0]?.image_url || "https://ui.shadcn.com/placeholder.svg";
 
   const handleAdd = async (e) => {
       e.stopPropagation();